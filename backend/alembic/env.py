@@ -21,6 +21,7 @@ from app.models import (
     Reminder,
     Briefing,
     SyncState,
+    SenderProfile,
 )
 
 # Alembic Config object
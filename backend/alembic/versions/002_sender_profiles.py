@@ -0,0 +1,41 @@
+"""Sender classification memo
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "002"
+down_revision: Union[str, None] = "001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "sender_profiles",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), index=True, nullable=False),
+        sa.Column("sender_key", sa.String(255), nullable=False),
+        sa.Column("category_counts", sa.Text(), nullable=True),
+        sa.Column("action_counts", sa.Text(), nullable=True),
+        sa.Column("priority_band_counts", sa.Text(), nullable=True),
+        sa.Column("priority_total", sa.Integer(), default=0, nullable=False),
+        sa.Column("sample_count", sa.Integer(), default=0, nullable=False),
+        sa.Column("override_category", sa.Enum("work", "personal", "school", "promotional", "social", "finance", "other", name="category", create_type=False), nullable=True),
+        sa.Column("override_action_type", sa.Enum("reply_needed", "review_needed", "meeting_request", "fyi_only", "task_assigned", "none", name="actiontype", create_type=False), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), onupdate=sa.func.now()),
+        sa.UniqueConstraint("user_id", "sender_key"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("sender_profiles")
@@ -0,0 +1,27 @@
+"""Item AI batch job ID
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "004"
+down_revision: Union[str, None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("items", sa.Column("ai_batch_id", sa.String(255), nullable=True))
+    op.create_index("ix_items_ai_batch_id", "items", ["ai_batch_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_items_ai_batch_id", table_name="items")
+    op.drop_column("items", "ai_batch_id")
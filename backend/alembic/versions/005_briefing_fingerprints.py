@@ -0,0 +1,27 @@
+"""Briefing input fingerprints
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("briefings", sa.Column("input_fingerprint", sa.String(64), nullable=True))
+    op.add_column("briefings", sa.Column("section_fingerprints", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("briefings", "section_fingerprints")
+    op.drop_column("briefings", "input_fingerprint")
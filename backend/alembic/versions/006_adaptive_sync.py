@@ -0,0 +1,33 @@
+"""Adaptive sync scheduling
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("sync_states", sa.Column("next_sync_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("sync_states", sa.Column("sync_interval_seconds", sa.Integer(), nullable=True))
+    op.add_column("sync_states", sa.Column("idle_streak", sa.Integer(), server_default="0", nullable=False))
+    op.add_column("sync_states", sa.Column("last_activity_at", sa.DateTime(timezone=True), nullable=True))
+    op.create_index("ix_sync_states_next_sync_at", "sync_states", ["next_sync_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_sync_states_next_sync_at", table_name="sync_states")
+    op.drop_column("sync_states", "last_activity_at")
+    op.drop_column("sync_states", "idle_streak")
+    op.drop_column("sync_states", "sync_interval_seconds")
+    op.drop_column("sync_states", "next_sync_at")
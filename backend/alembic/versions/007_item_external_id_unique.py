@@ -0,0 +1,47 @@
+"""Unique external ID per user and platform
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Per (user_id, platform, external_id), keep the AI-processed or else oldest row
+DUPLICATES = """
+    SELECT id, first_value(id) OVER (
+        PARTITION BY user_id, platform, external_id
+        ORDER BY ai_processed_at IS NULL, created_at, id
+    ) AS keep_id
+    FROM items
+"""
+
+
+def upgrade() -> None:
+    # Point deadlines and tasks at the kept row, then drop the duplicates
+    for table in ("deadlines", "tasks"):
+        op.execute(f"""
+            UPDATE {table} SET item_id = duplicates.keep_id
+            FROM ({DUPLICATES}) AS duplicates
+            WHERE {table}.item_id = duplicates.id AND duplicates.id <> duplicates.keep_id
+        """)
+    op.execute(f"""
+        DELETE FROM items
+        USING ({DUPLICATES}) AS duplicates
+        WHERE items.id = duplicates.id AND duplicates.id <> duplicates.keep_id
+    """)
+    op.create_unique_constraint(
+        "uq_items_user_platform_external_id", "items", ["user_id", "platform", "external_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_items_user_platform_external_id", "items", type_="unique")
@@ -0,0 +1,24 @@
+"""Index items by channel ID
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "009"
+down_revision: Union[str, None] = "008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_items_channel_id", "items", ["channel_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_items_channel_id", table_name="items")
@@ -1,7 +1,4 @@
-from langchain_core.output_parsers import StrOutputParser
-
-from app.ai.provider import get_llm
-from app.ai.prompts import ACTION_CLASSIFIER_PROMPT
+from app.ai.chains import run_chain
 from app.models.item import ActionType, Item
 
 
@@ -11,34 +8,37 @@ async def classify_action(item: Item) -> tuple[bool, ActionType]:
     Returns:
         Tuple of (action_required: bool, action_type: ActionType)
     """
-    llm = get_llm()
-    chain = ACTION_CLASSIFIER_PROMPT | llm | StrOutputParser()
-
     # Truncate body if too long
     body = item.body or item.snippet or ""
     if len(body) > 2000:
         body = body[:2000] + "..."
 
-    result = await chain.ainvoke({
+    result = await run_chain("action_classifier", {
         "sender": item.sender_name or item.sender_email or "Unknown",
         "subject": item.subject or "(No subject)",
         "body": body,
-    })
+    }, validate=lambda result: parse_action_type(result) is not None)
+
+    action_type = parse_action_type(result) or ActionType.NONE
+    return is_action_required(action_type), action_type
+
+
+ACTION_TYPE_MAP = {
+    "reply_needed": ActionType.REPLY_NEEDED,
+    "review_needed": ActionType.REVIEW_NEEDED,
+    "meeting_request": ActionType.MEETING_REQUEST,
+    "task_assigned": ActionType.TASK_ASSIGNED,
+    "fyi_only": ActionType.FYI_ONLY,
+    "none": ActionType.NONE,
+}
 
-    # Parse response
-    action_str = result.strip().lower().replace(" ", "_")
 
-    # Map to ActionType
-    action_map = {
-        "reply_needed": ActionType.REPLY_NEEDED,
-        "review_needed": ActionType.REVIEW_NEEDED,
-        "meeting_request": ActionType.MEETING_REQUEST,
-        "task_assigned": ActionType.TASK_ASSIGNED,
-        "fyi_only": ActionType.FYI_ONLY,
-        "none": ActionType.NONE,
-    }
+def parse_action_type(value: str) -> ActionType | None:
+    """Map an LLM action label to an ActionType, or None if unrecognized."""
+    action_str = value.strip().lower().replace(" ", "_")
+    return ACTION_TYPE_MAP.get(action_str)
 
-    action_type = action_map.get(action_str, ActionType.NONE)
-    action_required = action_type not in (ActionType.FYI_ONLY, ActionType.NONE)
 
-    return action_required, action_type
+def is_action_required(action_type: ActionType) -> bool:
+    """Whether an action type requires something from the recipient."""
+    return action_type not in (ActionType.FYI_ONLY, ActionType.NONE)
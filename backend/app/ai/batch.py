@@ -0,0 +1,276 @@
+import asyncio
+import json
+import uuid
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+import httpx
+from langchain_core.messages import BaseMessage, SystemMessage
+
+ANTHROPIC_API_BASE = "https://api.anthropic.com/v1"
+ANTHROPIC_VERSION = "2023-06-01"
+OPENAI_API_BASE = "https://api.openai.com/v1"
+
+
+@dataclass
+class BatchRequest:
+    """One prompt in a provider batch job."""
+
+    custom_id: str
+    messages: list[BaseMessage]
+
+
+class BatchStatus:
+    """Normalized batch job states."""
+
+    IN_PROGRESS = "in_progress"
+    ENDED = "ended"  # Results (possibly partial) are available
+    FAILED = "failed"  # No results will ever be available
+
+
+class BaseBatchProvider(ABC):
+    """Base class for provider batch APIs."""
+
+    max_tokens = 1024
+
+    @abstractmethod
+    async def submit(self, requests: list[BatchRequest]) -> str:
+        """Submit a batch job. Returns the provider's batch ID."""
+        pass
+
+    @abstractmethod
+    async def get_status(self, batch_id: str) -> str:
+        """Get the normalized BatchStatus of a batch job."""
+        pass
+
+    @abstractmethod
+    async def get_results(self, batch_id: str) -> dict[str, str]:
+        """Get the response text of every succeeded request, by custom_id."""
+        pass
+
+
+def _split_system(messages: list[BaseMessage]) -> tuple[str, list[dict]]:
+    system = "\n\n".join(m.content for m in messages if isinstance(m, SystemMessage))
+    chat = [
+        {"role": "assistant" if m.type == "ai" else "user", "content": m.content}
+        for m in messages
+        if not isinstance(m, SystemMessage)
+    ]
+    return system, chat
+
+
+class AnthropicBatchProvider(BaseBatchProvider):
+    """Anthropic Message Batches API."""
+
+    def __init__(self, model: str, api_key: str):
+        self.model = model
+        self.headers = {
+            "x-api-key": api_key,
+            "anthropic-version": ANTHROPIC_VERSION,
+        }
+
+    async def submit(self, requests: list[BatchRequest]) -> str:
+        payload = []
+        for request in requests:
+            system, messages = _split_system(request.messages)
+            payload.append({
+                "custom_id": request.custom_id,
+                "params": {
+                    "model": self.model,
+                    "max_tokens": self.max_tokens,
+                    "temperature": 0,
+                    "system": system,
+                    "messages": messages,
+                },
+            })
+
+        async with httpx.AsyncClient(timeout=60) as client:
+            response = await client.post(
+                f"{ANTHROPIC_API_BASE}/messages/batches",
+                headers=self.headers,
+                json={"requests": payload},
+            )
+            response.raise_for_status()
+            return response.json()["id"]
+
+    async def get_status(self, batch_id: str) -> str:
+        async with httpx.AsyncClient(timeout=30) as client:
+            response = await client.get(
+                f"{ANTHROPIC_API_BASE}/messages/batches/{batch_id}",
+                headers=self.headers,
+            )
+            response.raise_for_status()
+            data = response.json()
+
+        if data.get("processing_status") == "ended":
+            return BatchStatus.ENDED
+        return BatchStatus.IN_PROGRESS
+
+    async def get_results(self, batch_id: str) -> dict[str, str]:
+        results: dict[str, str] = {}
+        async with httpx.AsyncClient(timeout=120) as client:
+            response = await client.get(
+                f"{ANTHROPIC_API_BASE}/messages/batches/{batch_id}/results",
+                headers=self.headers,
+                follow_redirects=True,
+            )
+            response.raise_for_status()
+
+            for line in response.text.splitlines():
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                result = entry.get("result", {})
+                if result.get("type") != "succeeded":
+                    continue
+                content = result.get("message", {}).get("content", [])
+                results[entry["custom_id"]] = "".join(
+                    block.get("text", "") for block in content if block.get("type") == "text"
+                )
+
+        return results
+
+
+class OpenAIBatchProvider(BaseBatchProvider):
+    """OpenAI Batch API over /v1/chat/completions."""
+
+    def __init__(self, model: str, api_key: str):
+        self.model = model
+        self.headers = {"Authorization": f"Bearer {api_key}"}
+
+    async def submit(self, requests: list[BatchRequest]) -> str:
+        lines = []
+        for request in requests:
+            system, messages = _split_system(request.messages)
+            lines.append(json.dumps({
+                "custom_id": request.custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.model,
+                    "max_tokens": self.max_tokens,
+                    "temperature": 0,
+                    "messages": [{"role": "system", "content": system}, *messages],
+                },
+            }))
+
+        async with httpx.AsyncClient(timeout=60) as client:
+            upload = await client.post(
+                f"{OPENAI_API_BASE}/files",
+                headers=self.headers,
+                data={"purpose": "batch"},
+                files={"file": ("batch.jsonl", "\n".join(lines).encode("utf-8"))},
+            )
+            upload.raise_for_status()
+
+            response = await client.post(
+                f"{OPENAI_API_BASE}/batches",
+                headers=self.headers,
+                json={
+                    "input_file_id": upload.json()["id"],
+                    "endpoint": "/v1/chat/completions",
+                    "completion_window": "24h",
+                },
+            )
+            response.raise_for_status()
+            return response.json()["id"]
+
+    async def _get_batch(self, client: httpx.AsyncClient, batch_id: str) -> dict:
+        response = await client.get(
+            f"{OPENAI_API_BASE}/batches/{batch_id}", headers=self.headers
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def get_status(self, batch_id: str) -> str:
+        async with httpx.AsyncClient(timeout=30) as client:
+            data = await self._get_batch(client, batch_id)
+
+        status = data.get("status")
+        if status in ("completed", "expired", "cancelled"):
+            # Expired/cancelled batches keep the results of finished requests
+            return BatchStatus.ENDED if data.get("output_file_id") else BatchStatus.FAILED
+        if status == "failed":
+            return BatchStatus.FAILED
+        return BatchStatus.IN_PROGRESS
+
+    async def get_results(self, batch_id: str) -> dict[str, str]:
+        results: dict[str, str] = {}
+        async with httpx.AsyncClient(timeout=120) as client:
+            data = await self._get_batch(client, batch_id)
+            if not data.get("output_file_id"):
+                return results
+
+            response = await client.get(
+                f"{OPENAI_API_BASE}/files/{data['output_file_id']}/content",
+                headers=self.headers,
+            )
+            response.raise_for_status()
+
+            for line in response.text.splitlines():
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                reply = entry.get("response") or {}
+                if reply.get("status_code") != 200:
+                    continue
+                choices = reply.get("body", {}).get("choices", [])
+                if choices:
+                    results[entry["custom_id"]] = choices[0]["message"]["content"] or ""
+
+        return results
+
+
+class LocalBatchProvider(BaseBatchProvider):
+    """In-process stand-in for a batch API.
+
+    Requests are answered at submit time by `responder` (by default the
+    configured real-time LLM), so the batch is complete as soon as it has
+    been submitted. A stub for tests only: results live in process memory,
+    so a batch can't be polled from another worker.
+    """
+
+    _batches: dict[str, dict[str, str]] = {}
+
+    def __init__(
+        self,
+        responder: Callable[[list[BaseMessage]], Awaitable[str]] | None = None,
+        concurrency: int = 10,
+    ):
+        self.responder = responder or self._invoke_llm
+        self.concurrency = concurrency
+
+    @staticmethod
+    async def _invoke_llm(messages: list[BaseMessage]) -> str:
+        from app.ai.provider import get_llm
+        from app.ai.rate_limit import get_rate_limiter
+        from app.config import settings
+
+        await get_rate_limiter(settings.llm_provider).acquire()
+        response = await get_llm().ainvoke(messages)
+        return response.content
+
+    async def submit(self, requests: list[BatchRequest]) -> str:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def answer(request: BatchRequest) -> tuple[str, str | None]:
+            async with semaphore:
+                try:
+                    return request.custom_id, await self.responder(request.messages)
+                except Exception as e:
+                    print(f"Local batch request {request.custom_id} failed: {e}")
+                    return request.custom_id, None
+
+        answers = await asyncio.gather(*(answer(request) for request in requests))
+        batch_id = f"local_{uuid.uuid4().hex}"
+        self._batches[batch_id] = {
+            custom_id: text for custom_id, text in answers if text is not None
+        }
+        return batch_id
+
+    async def get_status(self, batch_id: str) -> str:
+        return BatchStatus.ENDED if batch_id in self._batches else BatchStatus.FAILED
+
+    async def get_results(self, batch_id: str) -> dict[str, str]:
+        return self._batches.pop(batch_id, {})
@@ -1,16 +1,49 @@
-from datetime import date, datetime
+import asyncio
+import hashlib
+import json
+import re
+from collections.abc import AsyncIterator
+from datetime import date
 from uuid import UUID
+from zoneinfo import ZoneInfo
 
-from langchain_core.output_parsers import StrOutputParser
-from sqlalchemy import select, and_
+from sqlalchemy import Select, select, and_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.ai.provider import get_llm_for_briefing
-from app.ai.prompts import BRIEFING_GENERATOR_PROMPT
+from app.ai.chains import run_chain, stream_chain
+from app.database import AsyncSessionLocal
 from app.models.briefing import Briefing, BriefingType
 from app.models.deadline import Deadline, DeadlineStatus
 from app.models.item import Item
 from app.models.task import Task, TaskStatus
+from app.schemas.briefing import (
+    BriefingSnapshot,
+    SnapshotDeadline,
+    SnapshotEvent,
+    SnapshotItem,
+    SnapshotTask,
+)
+from app.services.briefing_schedule import get_user_zone, get_zone, local_day_bounds, local_today
+
+SNAPSHOT_SECTIONS = ("unread_items", "deadlines", "events", "tasks")
+
+# Snapshot section -> (briefing heading, prompt label, count/summary input keys).
+# Tasks only feed the cross-cutting sections.
+BRIEFING_SECTIONS = {
+    "unread_items": ("Inbox Highlights", "UNREAD MESSAGES", "unread_count", "unread_summary"),
+    "deadlines": ("Upcoming Deadlines", "UPCOMING DEADLINES", "deadline_count", "deadlines_summary"),
+    "events": ("Today's Events", "TODAY'S EVENTS", "event_count", "events_summary"),
+    "tasks": (None, "PENDING TASKS", "task_count", "tasks_summary"),
+}
+
+# Sections drawn from every snapshot section, rewritten on any change:
+# heading -> what the section holds.
+CROSS_CUTTING_SECTIONS = {
+    "Today's Focus": "1-2 most important items requiring attention",
+    "Suggested Actions": "2-3 concrete actions to take today",
+}
+
+_HEADING_RE = re.compile(r"^## ", re.MULTILINE)
 
 
 async def generate_daily_briefing(
@@ -18,16 +51,51 @@ async def generate_daily_briefing(
     user_id: UUID,
     briefing_date: date | None = None,
 ) -> Briefing:
-    """Generate a daily briefing for a user."""
+    """Generate a daily briefing for a user (by default for their local today)."""
+    zone = await get_user_zone(db, user_id)
     if briefing_date is None:
-        briefing_date = date.today()
+        briefing_date = local_today(zone)
+
+    snapshot = await gather_briefing_snapshot(user_id, briefing_date, zone)
+
+    previous = await get_latest_briefing(db, user_id, briefing_date)
+    if previous is not None:
+        refreshed = await refresh_briefing(db, previous, snapshot)
+        if refreshed is not None:
+            return refreshed
+
+    content = await run_chain("briefing_generator", build_briefing_inputs(snapshot))
+    return await save_briefing(db, user_id, snapshot, content)
+
+
+async def stream_daily_briefing(snapshot: BriefingSnapshot) -> AsyncIterator[str]:
+    """Generate a daily briefing, yielding content chunks as the LLM produces them.
+
+    The caller persists the joined chunks with save_briefing().
+    """
+    async for chunk in stream_chain("briefing_generator", build_briefing_inputs(snapshot)):
+        yield chunk
+
 
-    llm = get_llm_for_briefing()
-    chain = BRIEFING_GENERATOR_PROMPT | llm | StrOutputParser()
+async def _fetch_all(query: Select) -> list:
+    # Each query gets its own pooled connection so they run concurrently
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(query)
+        return list(result.scalars().all())
+
+
+async def gather_briefing_snapshot(
+    user_id: UUID, briefing_date: date, zone: ZoneInfo
+) -> BriefingSnapshot:
+    """Load a user's unread items, deadlines, events and tasks for a briefing.
+
+    Events are those of `briefing_date` in the user's timezone `zone`. The
+    four queries run in parallel, so gathering takes a single round trip.
+    """
+    day_start, day_end = local_day_bounds(zone, briefing_date)
 
-    # Gather data for briefing
     # Unread messages
-    unread_result = await db.execute(
+    unread_query = (
         select(Item)
         .where(
             and_(
@@ -39,16 +107,9 @@ async def generate_daily_briefing(
         .order_by(Item.priority_score.desc())
         .limit(10)
     )
-    unread_items = list(unread_result.scalars().all())
-
-    unread_summary = ""
-    for item in unread_items:
-        priority_label = "🔴" if item.priority_score >= 70 else "🟡" if item.priority_score >= 50 else "⚪"
-        summary = item.ai_summary or item.snippet or item.subject or "No preview"
-        unread_summary += f"- {priority_label} [{item.platform.value}] {item.sender_name or item.sender_email}: {summary[:100]}\n"
 
     # Upcoming deadlines
-    deadline_result = await db.execute(
+    deadlines_query = (
         select(Deadline)
         .where(
             and_(
@@ -59,36 +120,23 @@ async def generate_daily_briefing(
         .order_by(Deadline.due_at.asc())
         .limit(5)
     )
-    deadlines = list(deadline_result.scalars().all())
-
-    deadlines_summary = ""
-    for deadline in deadlines:
-        days_until = (deadline.due_at.date() - briefing_date).days
-        urgency = "🔴 TODAY" if days_until == 0 else f"🟡 {days_until}d" if days_until <= 3 else f"⚪ {days_until}d"
-        deadlines_summary += f"- {urgency} {deadline.title} (due {deadline.due_at.strftime('%b %d')})\n"
 
     # Today's events
-    events_result = await db.execute(
+    events_query = (
         select(Item)
         .where(
             and_(
                 Item.user_id == user_id,
                 Item.item_type.in_(["calendar_event", "calendar_invite"]),
-                Item.event_start >= datetime.combine(briefing_date, datetime.min.time()),
-                Item.event_start < datetime.combine(briefing_date, datetime.max.time()),
+                Item.event_start >= day_start,
+                Item.event_start < day_end,
             )
         )
         .order_by(Item.event_start.asc())
     )
-    events = list(events_result.scalars().all())
-
-    events_summary = ""
-    for event in events:
-        time_str = event.event_start.strftime("%H:%M") if event.event_start else "All day"
-        events_summary += f"- {time_str} {event.subject}\n"
 
     # Pending tasks
-    tasks_result = await db.execute(
+    tasks_query = (
         select(Task)
         .where(
             and_(
@@ -99,36 +147,210 @@ async def generate_daily_briefing(
         .order_by(Task.priority.desc(), Task.due_at.asc())
         .limit(5)
     )
-    tasks = list(tasks_result.scalars().all())
+
+    unread_items, deadlines, events, tasks = await asyncio.gather(
+        _fetch_all(unread_query),
+        _fetch_all(deadlines_query),
+        _fetch_all(events_query),
+        _fetch_all(tasks_query),
+    )
+
+    return BriefingSnapshot(
+        briefing_date=briefing_date,
+        timezone=zone.key,
+        unread_items=[SnapshotItem.model_validate(item) for item in unread_items],
+        deadlines=[SnapshotDeadline.model_validate(deadline) for deadline in deadlines],
+        events=[SnapshotEvent.model_validate(event) for event in events],
+        tasks=[SnapshotTask.model_validate(task) for task in tasks],
+    )
+
+
+def build_briefing_inputs(snapshot: BriefingSnapshot) -> dict:
+    """Format a briefing snapshot into prompt variables."""
+    briefing_date = snapshot.briefing_date
+    zone = get_zone(snapshot.timezone)
+
+    unread_summary = ""
+    for item in snapshot.unread_items:
+        priority_label = "🔴" if item.priority_score >= 70 else "🟡" if item.priority_score >= 50 else "⚪"
+        summary = item.ai_summary or item.snippet or item.subject or "No preview"
+        unread_summary += f"- {priority_label} [{item.platform.value}] {item.sender_name or item.sender_email}: {summary[:100]}\n"
+
+    deadlines_summary = ""
+    for deadline in snapshot.deadlines:
+        days_until = (deadline.due_at.astimezone(zone).date() - briefing_date).days
+        urgency = "🔴 TODAY" if days_until == 0 else f"🟡 {days_until}d" if days_until <= 3 else f"⚪ {days_until}d"
+        deadlines_summary += f"- {urgency} {deadline.title} (due {deadline.due_at.strftime('%b %d')})\n"
+
+    events_summary = ""
+    for event in snapshot.events:
+        time_str = event.event_start.astimezone(zone).strftime("%H:%M") if event.event_start else "All day"
+        events_summary += f"- {time_str} {event.subject}\n"
 
     tasks_summary = ""
-    for task in tasks:
+    for task in snapshot.tasks:
         status_icon = "🔄" if task.status == TaskStatus.IN_PROGRESS else "⬜"
         due_str = f" (due {task.due_at.strftime('%b %d')})" if task.due_at else ""
         tasks_summary += f"- {status_icon} {task.title}{due_str}\n"
 
-    # Generate briefing
-    content = await chain.ainvoke({
+    return {
         "date": briefing_date.strftime("%A, %B %d, %Y"),
-        "unread_count": len(unread_items),
+        "unread_count": len(snapshot.unread_items),
         "unread_summary": unread_summary or "No unread messages",
-        "deadline_count": len(deadlines),
+        "deadline_count": len(snapshot.deadlines),
         "deadlines_summary": deadlines_summary or "No upcoming deadlines",
-        "event_count": len(events),
+        "event_count": len(snapshot.events),
         "events_summary": events_summary or "No events scheduled",
-        "task_count": len(tasks),
+        "task_count": len(snapshot.tasks),
         "tasks_summary": tasks_summary or "No pending tasks",
-    })
+    }
 
-    # Create briefing record
+
+async def save_briefing(
+    db: AsyncSession,
+    user_id: UUID,
+    snapshot: BriefingSnapshot,
+    content: str,
+) -> Briefing:
+    """Create the briefing record for generated content."""
+    sections = section_fingerprints(snapshot)
     briefing = Briefing(
         user_id=user_id,
-        briefing_date=briefing_date,
+        briefing_date=snapshot.briefing_date,
         briefing_type=BriefingType.DAILY_MORNING,
         content=content,
+        data_snapshot=snapshot.model_dump_json(),
+        input_fingerprint=input_fingerprint(sections),
+        section_fingerprints=json.dumps(sections),
     )
     db.add(briefing)
     await db.flush()
     await db.refresh(briefing)
 
     return briefing
+
+
+def section_fingerprints(snapshot: BriefingSnapshot) -> dict[str, str]:
+    """Hash each section of a snapshot (IDs, priorities, dates, ...)."""
+    fingerprints = {}
+    for section in SNAPSHOT_SECTIONS:
+        payload = json.dumps(
+            {
+                "briefing_date": snapshot.briefing_date.isoformat(),
+                "rows": [row.model_dump(mode="json") for row in getattr(snapshot, section)],
+            },
+            sort_keys=True,
+        )
+        fingerprints[section] = hashlib.sha256(payload.encode()).hexdigest()
+    return fingerprints
+
+
+def input_fingerprint(sections: dict[str, str]) -> str:
+    """Hash of a whole snapshot, from its section fingerprints."""
+    payload = json.dumps(sections, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+async def get_latest_briefing(
+    db: AsyncSession, user_id: UUID, briefing_date: date
+) -> Briefing | None:
+    """Get the most recently generated morning briefing of a user for a date."""
+    result = await db.execute(
+        select(Briefing)
+        .where(
+            and_(
+                Briefing.user_id == user_id,
+                Briefing.briefing_date == briefing_date,
+                Briefing.briefing_type == BriefingType.DAILY_MORNING,
+            )
+        )
+        .order_by(Briefing.generated_at.desc())
+        .limit(1)
+    )
+    return result.scalar_one_or_none()
+
+
+async def refresh_briefing(
+    db: AsyncSession, briefing: Briefing, snapshot: BriefingSnapshot
+) -> Briefing | None:
+    """Bring an existing briefing up to date with a new snapshot, cheaply.
+
+    Returns the briefing unchanged if its inputs are identical, or with
+    the changed sections rewritten along with the cross-cutting ones
+    (focus, suggested actions), which draw on all of them. Returns None
+    when it has to be regenerated in full: every section changed, or the
+    briefing predates fingerprints or lacks a section heading.
+    """
+    sections = section_fingerprints(snapshot)
+    if briefing.input_fingerprint == input_fingerprint(sections):
+        return briefing
+    if not briefing.section_fingerprints:
+        return None
+
+    previous = json.loads(briefing.section_fingerprints)
+    changed = [name for name in SNAPSHOT_SECTIONS if previous.get(name) != sections[name]]
+    if len(changed) == len(SNAPSHOT_SECTIONS):
+        return None
+
+    inputs = build_briefing_inputs(snapshot)
+    rewritten = [name for name in changed if BRIEFING_SECTIONS[name][0]]
+    bodies = await asyncio.gather(
+        *(_generate_section(name, inputs) for name in rewritten),
+        *(_generate_cross_cutting_section(heading, inputs) for heading in CROSS_CUTTING_SECTIONS),
+    )
+
+    headings = [BRIEFING_SECTIONS[name][0] for name in rewritten] + list(CROSS_CUTTING_SECTIONS)
+    content = briefing.content
+    for heading, body in zip(headings, bodies):
+        content = replace_section(content, heading, body)
+        if content is None:
+            return None
+
+    briefing.content = content
+    briefing.data_snapshot = snapshot.model_dump_json()
+    briefing.input_fingerprint = input_fingerprint(sections)
+    briefing.section_fingerprints = json.dumps(sections)
+    briefing.generated_at = func.now()
+    await db.flush()
+    await db.refresh(briefing)
+
+    return briefing
+
+
+async def _generate_section(name: str, inputs: dict) -> str:
+    heading, label, count_key, summary_key = BRIEFING_SECTIONS[name]
+    return await run_chain("briefing_section", {
+        "section": heading,
+        "date": inputs["date"],
+        "section_data": f"{label} ({inputs[count_key]}):\n{inputs[summary_key]}",
+    })
+
+
+async def _generate_cross_cutting_section(heading: str, inputs: dict) -> str:
+    section_data = "\n\n".join(
+        f"{label} ({inputs[count_key]}):\n{inputs[summary_key]}"
+        for _, label, count_key, summary_key in BRIEFING_SECTIONS.values()
+    )
+    return await run_chain("briefing_section", {
+        "section": f"{heading} ({CROSS_CUTTING_SECTIONS[heading]})",
+        "date": inputs["date"],
+        "section_data": section_data,
+    })
+
+
+def replace_section(content: str, heading: str, body: str) -> str | None:
+    """Replace the body of the `## ...heading` section of a markdown briefing.
+
+    Returns None if the briefing has no such section.
+    """
+    starts = [match.start() for match in _HEADING_RE.finditer(content)]
+    for i, start in enumerate(starts):
+        line_end = content.find("\n", start)
+        if line_end == -1:
+            line_end = len(content)
+        if heading.lower() not in content[start:line_end].lower():
+            continue
+
+        end = starts[i + 1] if i + 1 < len(starts) else len(content)
+        return f"{content[:line_end]}\n{body.strip()}\n\n{content[end:].lstrip()}".rstrip() + "\n"
+    return None
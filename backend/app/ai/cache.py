@@ -0,0 +1,195 @@
+import asyncio
+import hashlib
+import json
+import re
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+
+import redis.asyncio as redis
+from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import Runnable
+
+from app.ai.provider import ainvoke_chain
+from app.config import settings
+
+CACHE_KEY_PREFIX = "llm_cache:"
+STATS_KEY = "llm_cache:stats"
+# Hit/miss counts are added to the shared Redis stats at most this often
+STATS_FLUSH_SECONDS = 10.0
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _normalize(value):
+    """Normalize an input value so near-identical content hashes the same."""
+    if isinstance(value, str):
+        return _WHITESPACE_RE.sub(" ", value).strip().lower()
+    return value
+
+
+def make_cache_key(prompt_name: str, model: str, inputs: dict) -> str:
+    """Content-addressed key for a prompt invocation."""
+    payload = json.dumps(
+        {
+            "prompt": prompt_name,
+            "model": model,
+            "inputs": {k: _normalize(v) for k, v in sorted(inputs.items())},
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return CACHE_KEY_PREFIX + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get_model_name(llm: BaseChatModel) -> str:
+    """Best-effort model identifier for a chat model instance."""
+    return getattr(llm, "model_name", None) or getattr(llm, "model", None) or llm._llm_type
+
+
+class LRUCache:
+    """In-process LRU cache with per-entry TTL and a maximum entry count."""
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    def get(self, key: str) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class LLMCache:
+    """Two-tier LLM result cache: in-process LRU in front of Redis.
+
+    Redis errors are treated as misses so a Redis outage only costs LLM
+    calls, never correctness.
+    """
+
+    def __init__(self):
+        self.local = LRUCache(settings.llm_cache_max_entries, settings.llm_cache_ttl_seconds)
+        self.stats = {"memory_hits": 0, "redis_hits": 0, "misses": 0}
+        self._unflushed_stats = dict.fromkeys(self.stats, 0)
+        self._stats_flushed_at = time.monotonic()
+        self._redis: redis.Redis | None = None
+        self._redis_loop: asyncio.AbstractEventLoop | None = None
+
+    def _get_redis(self) -> redis.Redis:
+        # redis.asyncio connections are bound to the loop that created them
+        loop = asyncio.get_running_loop()
+        if self._redis is None or self._redis_loop is not loop:
+            self._redis = redis.from_url(
+                settings.redis_url, decode_responses=True, socket_connect_timeout=1
+            )
+            self._redis_loop = loop
+        return self._redis
+
+    async def _record(self, stat: str) -> None:
+        self.stats[stat] += 1
+        self._unflushed_stats[stat] += 1
+        if time.monotonic() - self._stats_flushed_at >= STATS_FLUSH_SECONDS:
+            await self.flush_stats()
+
+    async def flush_stats(self) -> None:
+        """Add the counts recorded since the last flush to the shared Redis stats."""
+        counts = {stat: count for stat, count in self._unflushed_stats.items() if count}
+        self._unflushed_stats = dict.fromkeys(self.stats, 0)
+        self._stats_flushed_at = time.monotonic()
+        if not counts:
+            return
+
+        try:
+            async with self._get_redis().pipeline(transaction=False) as pipe:
+                for stat, count in counts.items():
+                    pipe.hincrby(STATS_KEY, stat, count)
+                await pipe.execute()
+        except redis.RedisError:
+            # Keep the counts for the next flush
+            for stat, count in counts.items():
+                self._unflushed_stats[stat] += count
+
+    async def get(self, key: str) -> str | None:
+        value = self.local.get(key)
+        if value is not None:
+            await self._record("memory_hits")
+            return value
+
+        try:
+            value = await self._get_redis().get(key)
+        except redis.RedisError:
+            value = None
+
+        if value is not None:
+            self.local.set(key, value)
+            await self._record("redis_hits")
+            return value
+
+        await self._record("misses")
+        return None
+
+    async def set(self, key: str, value: str) -> None:
+        self.local.set(key, value)
+        try:
+            await self._get_redis().set(key, value, ex=settings.llm_cache_ttl_seconds)
+        except redis.RedisError:
+            pass
+
+    async def get_global_stats(self) -> dict[str, int]:
+        """Hit/miss counters aggregated across all processes via Redis.
+
+        Other processes' counts lag by up to STATS_FLUSH_SECONDS.
+        """
+        await self.flush_stats()
+        try:
+            raw = await self._get_redis().hgetall(STATS_KEY)
+        except redis.RedisError:
+            return {}
+        return {k: int(v) for k, v in raw.items()}
+
+
+llm_cache = LLMCache()
+
+
+async def cached_ainvoke(
+    prompt_name: str,
+    llm: BaseChatModel,
+    chain: Runnable,
+    inputs: dict,
+    validate: Callable[[str], bool] | None = None,
+    timeout: float | None = None,
+) -> str:
+    """Invoke a chain, reusing a cached result for identical prompt inputs.
+
+    If `validate` is given, only results it accepts are cached, so a
+    response that fails to parse is retried on the next call instead of
+    being served from the cache.
+    """
+    if not settings.llm_cache_enabled:
+        return await ainvoke_chain(chain, inputs, timeout)
+
+    key = make_cache_key(prompt_name, get_model_name(llm), inputs)
+    cached = await llm_cache.get(key)
+    if cached is not None:
+        return cached
+
+    result = await ainvoke_chain(chain, inputs, timeout)
+    if validate is None or validate(result):
+        await llm_cache.set(key, result)
+    return result
@@ -0,0 +1,75 @@
+from collections.abc import AsyncIterator, Callable
+from functools import lru_cache
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable
+
+from app.ai.cache import cached_ainvoke
+from app.ai.provider import ainvoke_chain, astream_chain, get_llm, get_llm_for_briefing
+from app.ai import prompts
+from app.ai.rate_limit import get_token_rate_limiter
+from app.config import settings
+
+# Chain name -> prompt. The name doubles as the LLM cache namespace.
+CHAIN_PROMPTS: dict[str, ChatPromptTemplate] = {
+    "summarizer": prompts.SUMMARIZER_PROMPT,
+    "deadline_extractor": prompts.DEADLINE_EXTRACTOR_PROMPT,
+    "action_classifier": prompts.ACTION_CLASSIFIER_PROMPT,
+    "priority_scorer": prompts.PRIORITY_SCORER_PROMPT,
+    "categorizer": prompts.CATEGORIZER_PROMPT,
+    "item_analyzer": prompts.ITEM_ANALYZER_PROMPT,
+    "packed_classifier": prompts.PACKED_CLASSIFIER_PROMPT,
+    "packed_analyzer": prompts.PACKED_ANALYZER_PROMPT,
+    "briefing_generator": prompts.BRIEFING_GENERATOR_PROMPT,
+    "briefing_section": prompts.BRIEFING_SECTION_PROMPT,
+}
+
+# Chains that run on the briefing LLM and are never cached
+BRIEFING_CHAINS = frozenset({"briefing_generator", "briefing_section"})
+
+
+def get_chain_llm(name: str) -> BaseChatModel:
+    """Get the LLM a named chain runs on."""
+    return get_llm_for_briefing() if name in BRIEFING_CHAINS else get_llm()
+
+
+@lru_cache(maxsize=None)
+def get_chain(name: str) -> Runnable:
+    """Get the `prompt | llm | parser` runnable for a chain, built once per process."""
+    return CHAIN_PROMPTS[name] | get_chain_llm(name) | StrOutputParser()
+
+
+def estimate_tokens(name: str, inputs: dict) -> int:
+    """Rough upper bound of the tokens one call of a chain uses (~4 chars/token)."""
+    prompt_chars = sum(len(m.content) for m in CHAIN_PROMPTS[name].format_messages(**inputs))
+    return prompt_chars // 4 + (getattr(get_chain_llm(name), "max_tokens", None) or 0)
+
+
+async def run_chain(
+    name: str, inputs: dict, validate: Callable[[str], bool] | None = None
+) -> str:
+    """Invoke a named chain, through the LLM cache unless it is a briefing chain.
+
+    Only results `validate` accepts are cached, and each LLM call is bounded
+    by AI_STAGE_TIMEOUT_SECONDS. Briefing chains also draw from the
+    provider's shared token budget.
+    """
+    chain = get_chain(name)
+    if name in BRIEFING_CHAINS:
+        limiter = get_token_rate_limiter(settings.llm_provider)
+        await limiter.acquire(estimate_tokens(name, inputs))
+        return await ainvoke_chain(chain, inputs)
+    return await cached_ainvoke(
+        name, get_chain_llm(name), chain, inputs, validate, settings.ai_stage_timeout_seconds
+    )
+
+
+async def stream_chain(name: str, inputs: dict) -> AsyncIterator[str]:
+    """Stream a named chain's output as it is generated. Bypasses the LLM cache."""
+    if name in BRIEFING_CHAINS:
+        limiter = get_token_rate_limiter(settings.llm_provider)
+        await limiter.acquire(estimate_tokens(name, inputs))
+    async for chunk in astream_chain(get_chain(name), inputs):
+        yield chunk
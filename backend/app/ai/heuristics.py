@@ -0,0 +1,120 @@
+import re
+
+from app.ai.item_analyzer import ItemAnalysis
+from app.models.item import ActionType, Category, Item, ItemType
+
+# Any date, time or relative time reference. Deliberately broad: it only
+# decides when deadline extraction can be skipped, so false positives just
+# cost an LLM call while false negatives would drop deadlines.
+TEMPORAL_RE = re.compile(
+    r"""
+    \b(?:
+        today|tonight|tomorrow|tmrw|yesterday|weekend|
+        mon(?:day)?|tue(?:s|sday)?|wed(?:nesday)?|thu(?:r|rs|rsday)?|fri(?:day)?|sat(?:urday)?|sun(?:day)?|
+        jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|
+        sep(?:t|tember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?|
+        next\s+(?:week|month|year|quarter)|this\s+(?:week|month|quarter)|
+        end\s+of\s+(?:day|the\s+day|week|the\s+week|month|the\s+month|quarter)|
+        eod|eow|eom|cob|asap|
+        deadline|due|expires?|expiring|
+        q[1-4]|
+        in\s+\d+\s+(?:minutes?|hours?|days?|weeks?|months?)|
+        within\s+\d+\s+(?:hours?|days?|weeks?)
+    )\b
+    | \b\d{1,2}[/.-]\d{1,2}(?:[/.-]\d{2,4})?\b
+    | \b\d{4}-\d{2}-\d{2}\b
+    | \b\d{1,2}(?::\d{2})?\s*(?:am|pm)\b
+    | \b\d{1,2}:\d{2}\b
+    | \b\d{1,2}(?:st|nd|rd|th)\b
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+URGENT_KEYWORDS = (
+    "urgent", "asap", "immediately", "action required", "action needed",
+    "overdue", "final notice", "past due", "time sensitive", "critical",
+)
+MARKETING_KEYWORDS = (
+    "unsubscribe", "% off", "sale", "deal", "offer", "discount", "coupon",
+    "newsletter", "promo", "limited time", "shop now", "free shipping",
+    "webinar", "subscribe", "exclusive",
+)
+SOCIAL_DOMAINS = (
+    "facebookmail.com", "linkedin.com", "twitter.com", "x.com",
+    "instagram.com", "pinterest.com", "reddit.com", "meetup.com",
+)
+AUTOMATED_LOCAL_PARTS = (
+    "noreply", "no-reply", "donotreply", "do-not-reply", "notifications",
+    "notification", "mailer-daemon", "alerts", "newsletter", "news",
+)
+# An automated local part as a whole token: "news" matches news@ and
+# team.news@, not newsroom@ or renews@
+AUTOMATED_LOCAL_RE = re.compile(
+    r"(?<![a-z0-9])(?:" + "|".join(map(re.escape, AUTOMATED_LOCAL_PARTS)) + r")(?![a-z0-9])"
+)
+
+
+def has_temporal_expression(text: str) -> bool:
+    """Whether text contains anything that could be a date or time."""
+    return TEMPORAL_RE.search(text) is not None
+
+
+def keyword_score(text: str, keywords: tuple[str, ...]) -> int:
+    """Number of distinct keywords that appear in text."""
+    lowered = text.lower()
+    return sum(1 for keyword in keywords if keyword in lowered)
+
+
+def _sender_parts(item: Item) -> tuple[str, str]:
+    email = (item.sender_email or "").lower()
+    local, _, domain = email.partition("@")
+    return local, domain
+
+
+def is_automated_sender(item: Item) -> bool:
+    """Whether an item comes from a no-reply or notification address."""
+    local, _ = _sender_parts(item)
+    return AUTOMATED_LOCAL_RE.search(local) is not None
+
+
+def is_social_domain(domain: str) -> bool:
+    """Whether a domain is, or is a subdomain of, a social network's domain."""
+    return any(domain == social or domain.endswith("." + social) for social in SOCIAL_DOMAINS)
+
+
+def pre_classify(item: Item) -> ItemAnalysis:
+    """Cheap local rules that fill analysis fields when they are confident.
+
+    Every field set here is marked as prefilled, so its LLM stage is
+    skipped. Fields the rules are unsure about are left as None.
+    """
+    analysis = ItemAnalysis()
+    text = f"{item.subject or ''}\n{item.body or item.snippet or ''}"
+    _, domain = _sender_parts(item)
+    urgent = keyword_score(text, URGENT_KEYWORDS)
+
+    # No date or time reference at all: nothing for the deadline extractor
+    if not has_temporal_expression(text):
+        analysis.deadlines = []
+
+    if item.item_type == ItemType.CALENDAR_INVITE:
+        analysis.action_type = ActionType.MEETING_REQUEST
+
+    elif is_social_domain(domain) and is_automated_sender(item):
+        analysis.category = Category.SOCIAL
+        analysis.action_type = ActionType.FYI_ONLY
+        if not urgent:
+            analysis.priority_score = 20
+
+    elif item.is_bulk and keyword_score(text, MARKETING_KEYWORDS) >= 2:
+        analysis.category = Category.PROMOTIONAL
+        analysis.action_type = ActionType.FYI_ONLY
+        if not urgent:
+            analysis.priority_score = 15
+
+    analysis.prefilled = {
+        name
+        for name in ("deadlines", "action_type", "priority_score", "category")
+        if getattr(analysis, name) is not None
+    }
+    return analysis
@@ -0,0 +1,114 @@
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from app.ai.action_classifier import is_action_required, parse_action_type
+from app.ai.categorizer import parse_category
+from app.ai.deadline_extractor import parse_deadlines
+from app.ai.parsing import is_json_response, load_json_response
+from app.ai.priority_scorer import parse_priority
+from app.ai.chains import run_chain
+from app.ai.summarizer import ITEM_TYPE_LABELS
+from app.models.item import ActionType, Category, Item
+from app.schemas.deadline import DeadlineCreate
+
+
+@dataclass
+class ItemAnalysis:
+    """AI analysis results for an item.
+
+    Fields left as None were not produced (or failed validation) and are
+    filled in by the dedicated per-stage calls.
+    """
+
+    summary: str | None = None
+    deadlines: list[DeadlineCreate] | None = None
+    action_type: ActionType | None = None
+    priority_score: int | None = None
+    category: Category | None = None
+
+    # Fields filled without asking the LLM (e.g. from the sender memo)
+    prefilled: set[str] = field(default_factory=set)
+
+    @property
+    def action_required(self) -> bool:
+        return self.action_type is not None and is_action_required(self.action_type)
+
+    def merge(self, other: "ItemAnalysis") -> None:
+        """Take fields from another analysis for any that are still missing."""
+        for name in self.missing_fields():
+            value = getattr(other, name)
+            setattr(self, name, value)
+            if value is not None and name in other.prefilled:
+                self.prefilled.add(name)
+
+    def missing_fields(self) -> list[str]:
+        """Names of fields that still need to be produced."""
+        return [
+            name
+            for name in ("summary", "deadlines", "action_type", "priority_score", "category")
+            if getattr(self, name) is None
+        ]
+
+
+async def analyze_item(item: Item) -> ItemAnalysis:
+    """Produce summary, deadlines, action, priority and category in one LLM call."""
+    result = await run_chain(
+        "item_analyzer",
+        build_analyzer_inputs(item),
+        validate=lambda result: is_json_response(result, dict),
+    )
+
+    return parse_analysis(result, item)
+
+
+def build_analyzer_inputs(item: Item) -> dict:
+    """Prompt variables for ITEM_ANALYZER_PROMPT."""
+    # Truncate body if too long
+    body = item.body or item.snippet or ""
+    if len(body) > 2000:
+        body = body[:2000] + "..."
+
+    return {
+        "today": datetime.utcnow().strftime("%Y-%m-%d"),
+        "item_type": ITEM_TYPE_LABELS.get(item.item_type.value, "message"),
+        "sender": item.sender_name or item.sender_email or "Unknown",
+        "subject": item.subject or "(No subject)",
+        "body": body,
+    }
+
+
+def parse_analysis(result: str, item: Item) -> ItemAnalysis:
+    """Parse a fused analysis response, leaving invalid fields as None."""
+    try:
+        data = load_json_response(result)
+    except json.JSONDecodeError:
+        return ItemAnalysis()
+
+    if not isinstance(data, dict):
+        return ItemAnalysis()
+
+    return analysis_from_dict(data, item)
+
+
+def analysis_from_dict(data: dict, item: Item) -> ItemAnalysis:
+    """Validate the fields of one decoded analysis object."""
+    analysis = ItemAnalysis()
+
+    summary = data.get("summary")
+    if isinstance(summary, str) and summary.strip():
+        analysis.summary = summary.strip()
+
+    if isinstance(data.get("deadlines"), list):
+        analysis.deadlines = parse_deadlines(data["deadlines"], item)
+
+    if isinstance(data.get("action_type"), str):
+        analysis.action_type = parse_action_type(data["action_type"])
+
+    if data.get("priority") is not None:
+        analysis.priority_score = parse_priority(data["priority"])
+
+    if isinstance(data.get("category"), str):
+        analysis.category = parse_category(data["category"])
+
+    return analysis
@@ -0,0 +1,89 @@
+from datetime import datetime
+
+from app.ai.chains import run_chain
+from app.ai.item_analyzer import ItemAnalysis, analysis_from_dict
+from app.ai.parsing import is_json_response, load_json_response
+from app.ai.summarizer import ITEM_TYPE_LABELS
+from app.config import settings
+from app.models.item import Item, ItemType
+
+# Short items where the system prompt dominates the request
+PACKABLE_ITEM_TYPES = (
+    ItemType.SLACK_MESSAGE,
+    ItemType.SLACK_DM,
+    ItemType.CALENDAR_EVENT,
+    ItemType.CALENDAR_INVITE,
+)
+
+# Fields produced by the packed prompt for each pipeline mode
+PACKED_FIELDS = {
+    "fused": ("summary", "deadlines", "action_type", "priority_score", "category"),
+    "staged": ("action_type", "category"),
+}
+
+
+def is_packable(item: Item) -> bool:
+    """Whether an item is short enough to share an LLM request with others."""
+    body = item.body or item.snippet or ""
+    return (
+        item.item_type in PACKABLE_ITEM_TYPES
+        and len(body) <= settings.ai_pack_max_chars
+    )
+
+
+def format_packed_items(items: list[Item]) -> str:
+    """Render items as an indexed list for the packed prompts."""
+    blocks = []
+    for index, item in enumerate(items):
+        blocks.append(
+            f"[{index}] {ITEM_TYPE_LABELS.get(item.item_type.value, 'message')}\n"
+            f"From: {item.sender_name or item.sender_email or 'Unknown'}\n"
+            f"Subject: {item.subject or '(No subject)'}\n"
+            f"{item.body or item.snippet or ''}"
+        )
+    return "\n\n".join(blocks)
+
+
+async def analyze_packed(items: list[Item], mode: str) -> list[ItemAnalysis]:
+    """Analyze several short items in a single LLM request.
+
+    Returns one analysis per item, in order. Fields that are missing or
+    fail validation are left as None so the caller can retry those items
+    individually.
+    """
+    if mode == "fused":
+        result = await run_chain("packed_analyzer", {
+            "today": datetime.utcnow().strftime("%Y-%m-%d"),
+            "items": format_packed_items(items),
+        }, validate=lambda result: is_json_response(result, list))
+    else:
+        result = await run_chain("packed_classifier", {
+            "items": format_packed_items(items),
+        }, validate=lambda result: is_json_response(result, list))
+
+    return parse_packed(result, items, PACKED_FIELDS[mode])
+
+
+def parse_packed(result: str, items: list[Item], fields: tuple[str, ...]) -> list[ItemAnalysis]:
+    """Parse a packed response into one analysis per item, keyed by index."""
+    analyses = [ItemAnalysis() for _ in items]
+    try:
+        data = load_json_response(result)
+    except ValueError:
+        return analyses
+
+    if not isinstance(data, list):
+        return analyses
+
+    for entry in data:
+        if not isinstance(entry, dict):
+            continue
+        index = entry.get("index")
+        if not isinstance(index, int) or not 0 <= index < len(items):
+            continue
+
+        parsed = analysis_from_dict(entry, items[index])
+        for name in fields:
+            setattr(analyses[index], name, getattr(parsed, name))
+
+    return analyses
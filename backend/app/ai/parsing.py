@@ -0,0 +1,24 @@
+import json
+
+
+def load_json_response(result: str):
+    """Parse a JSON LLM response, tolerating markdown code fences.
+
+    Raises json.JSONDecodeError if no valid JSON can be recovered.
+    """
+    # Clean up response (sometimes LLMs add extra text)
+    json_str = result.strip()
+    if "```json" in json_str:
+        json_str = json_str.split("```json")[1].split("```")[0]
+    elif "```" in json_str:
+        json_str = json_str.split("```")[1].split("```")[0]
+
+    return json.loads(json_str)
+
+
+def is_json_response(result: str, kind: type) -> bool:
+    """Whether an LLM response decodes to a JSON value of the given type."""
+    try:
+        return isinstance(load_json_response(result), kind)
+    except json.JSONDecodeError:
+        return False
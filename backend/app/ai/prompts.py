@@ -106,6 +106,82 @@ Subject: {subject}
 {body}"""),
 ])
 
+ITEM_ANALYZER_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You analyze an email/message and return every field below in a single JSON object.
+
+1. summary: A 1-2 sentence summary of the main point, any action items or deadlines, and the sender's intent. No greetings or sign-offs.
+2. deadlines: Deadlines or due dates mentioned. Today's date is {today}; use it to interpret relative dates like "tomorrow", "next week", "Friday". Use ISO format (YYYY-MM-DDTHH:MM:SS) for due_at.
+3. action_type: One of reply_needed, review_needed, meeting_request, task_assigned, fyi_only, none.
+4. priority: An integer from 1-100 (90-100 immediate action from an important sender, 70-89 action needed today, 50-69 this week, 30-49 informational, 1-29 newsletters and automated notifications).
+5. category: One of work, personal, school, promotional, social, finance, other.
+
+Respond with only JSON in this format:
+{{
+  "summary": "summary text",
+  "deadlines": [
+    {{
+      "title": "deadline description",
+      "due_at": "ISO date string",
+      "source_text": "original text mentioning deadline",
+      "confidence": 0.9
+    }}
+  ],
+  "action_type": "reply_needed",
+  "priority": 50,
+  "category": "work"
+}}
+
+If no deadlines are found, use an empty list."""),
+    ("human", """Analyze this {item_type}:
+
+From: {sender}
+Subject: {subject}
+
+{body}"""),
+])
+
+PACKED_CLASSIFIER_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You classify several short messages at once. For each message return:
+- action_type: One of reply_needed, review_needed, meeting_request, task_assigned, fyi_only, none.
+- category: One of work, personal, school, promotional, social, finance, other.
+
+Respond with only a JSON array containing one object per message, using the message's index:
+[
+  {{"index": 0, "action_type": "reply_needed", "category": "work"}}
+]"""),
+    ("human", """Classify these messages:
+
+{items}"""),
+])
+
+PACKED_ANALYZER_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You analyze several short messages at once. For each message return:
+- summary: A 1 sentence summary of the main point and any action items.
+- deadlines: Deadlines or due dates mentioned. Today's date is {today}; use it to interpret relative dates. Use ISO format (YYYY-MM-DDTHH:MM:SS) for due_at.
+- action_type: One of reply_needed, review_needed, meeting_request, task_assigned, fyi_only, none.
+- priority: An integer from 1-100 (90-100 immediate action from an important sender, 70-89 action needed today, 50-69 this week, 30-49 informational, 1-29 newsletters and automated notifications).
+- category: One of work, personal, school, promotional, social, finance, other.
+
+Respond with only a JSON array containing one object per message, using the message's index:
+[
+  {{
+    "index": 0,
+    "summary": "summary text",
+    "deadlines": [
+      {{"title": "deadline description", "due_at": "ISO date string", "source_text": "original text", "confidence": 0.9}}
+    ],
+    "action_type": "reply_needed",
+    "priority": 50,
+    "category": "work"
+  }}
+]
+
+If a message has no deadlines, use an empty list."""),
+    ("human", """Analyze these messages:
+
+{items}"""),
+])
+
 BRIEFING_GENERATOR_PROMPT = ChatPromptTemplate.from_messages([
     ("system", """You are a personal productivity assistant creating a morning briefing. The briefing should be:
 1. Concise but comprehensive
@@ -145,3 +221,12 @@ TODAY'S EVENTS ({event_count}):
 PENDING TASKS ({task_count}):
 {tasks_summary}"""),
 ])
+
+BRIEFING_SECTION_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You are a personal productivity assistant updating one section of a morning briefing because its data changed.
+
+Write only the body of the section: markdown bullet points, no heading. Keep it brief, prioritized by importance, direct and helpful."""),
+    ("human", """Rewrite the "{section}" section for {date} based on this data:
+
+{section_data}"""),
+])
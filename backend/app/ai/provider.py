@@ -1,9 +1,35 @@
+import asyncio
+from collections.abc import AsyncIterator
 from functools import lru_cache
 
+import httpx
 from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import Runnable
 
+from app.ai.rate_limit import get_rate_limiter
 from app.config import settings
 
+ANTHROPIC_MODEL = "claude-3-haiku-20240307"
+OPENAI_MODEL = "gpt-4o-mini"
+
+# Keep-alive pool shared by every LLM instance of a provider
+HTTP_LIMITS = httpx.Limits(
+    max_connections=100, max_keepalive_connections=20, keepalive_expiry=30
+)
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+
+@lru_cache
+def get_http_client(provider: str) -> httpx.Client:
+    """Get the shared pooled sync HTTP client for a provider."""
+    return httpx.Client(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+
+
+@lru_cache
+def get_async_http_client(provider: str) -> httpx.AsyncClient:
+    """Get the shared pooled async HTTP client for a provider."""
+    return httpx.AsyncClient(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+
 
 @lru_cache
 def get_llm() -> BaseChatModel:
@@ -11,8 +37,10 @@ def get_llm() -> BaseChatModel:
     if settings.llm_provider == "anthropic":
         from langchain_anthropic import ChatAnthropic
 
+        # ChatAnthropic takes no HTTP client; instances share langchain's
+        # pooled client per base URL
         return ChatAnthropic(
-            model="claude-3-haiku-20240307",
+            model=ANTHROPIC_MODEL,
             api_key=settings.anthropic_api_key,
             temperature=0,
             max_tokens=1024,
@@ -21,10 +49,12 @@ def get_llm() -> BaseChatModel:
         from langchain_openai import ChatOpenAI
 
         return ChatOpenAI(
-            model="gpt-4o-mini",
+            model=OPENAI_MODEL,
             api_key=settings.openai_api_key,
             temperature=0,
             max_tokens=1024,
+            http_client=get_http_client("openai"),
+            http_async_client=get_async_http_client("openai"),
         )
     elif settings.llm_provider == "ollama":
         from langchain_community.chat_models import ChatOllama
@@ -38,6 +68,7 @@ def get_llm() -> BaseChatModel:
         raise ValueError(f"Unknown LLM provider: {settings.llm_provider}")
 
 
+@lru_cache
 def get_llm_for_briefing() -> BaseChatModel:
     """Get a higher-capacity LLM for briefing generation."""
     if settings.llm_provider == "anthropic":
@@ -57,6 +88,48 @@ def get_llm_for_briefing() -> BaseChatModel:
             api_key=settings.openai_api_key,
             temperature=0.3,
             max_tokens=2048,
+            http_client=get_http_client("openai"),
+            http_async_client=get_async_http_client("openai"),
         )
     else:
         return get_llm()
+
+
+async def ainvoke_chain(chain: Runnable, inputs: dict, timeout: float | None = None) -> str:
+    """Invoke an LLM chain under the configured provider's rate limit.
+
+    `timeout` bounds the call itself, not the wait for a rate limit slot,
+    so a long queue never times out calls that haven't been sent yet.
+    """
+    await get_rate_limiter(settings.llm_provider).acquire()
+    return await asyncio.wait_for(chain.ainvoke(inputs), timeout)
+
+
+async def astream_chain(chain: Runnable, inputs: dict) -> AsyncIterator[str]:
+    """Stream an LLM chain's output under the configured provider's rate limit."""
+    await get_rate_limiter(settings.llm_provider).acquire()
+    async for chunk in chain.astream(inputs):
+        yield chunk
+
+
+def batch_api_available() -> bool:
+    """Whether bulk backlogs can be handed to the provider's batch API.
+
+    Ollama has no batch API, and AI_BATCH_API=local opts out; their
+    backlogs drain through the real-time pipeline instead.
+    """
+    return settings.ai_batch_api == "native" and settings.llm_provider in ("anthropic", "openai")
+
+
+def get_batch_provider():
+    """Get the batch API provider for offline bulk processing.
+
+    Raises ValueError if no batch API is available (see batch_api_available).
+    """
+    from app.ai.batch import AnthropicBatchProvider, OpenAIBatchProvider
+
+    if not batch_api_available():
+        raise ValueError(f"No batch API for LLM provider {settings.llm_provider}")
+    if settings.llm_provider == "anthropic":
+        return AnthropicBatchProvider(ANTHROPIC_MODEL, settings.anthropic_api_key)
+    return OpenAIBatchProvider(OPENAI_MODEL, settings.openai_api_key)
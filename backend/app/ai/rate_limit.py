@@ -0,0 +1,130 @@
+import asyncio
+import random
+import time
+from functools import lru_cache
+
+import redis.asyncio as redis
+
+from app.config import settings
+
+TOKEN_WINDOW_KEY_PREFIX = "llm_tokens:"
+REQUEST_SLOT_KEY_PREFIX = "llm_next_slot:"
+
+# Reserves the next free request slot: returns the seconds until it, by the
+# Redis clock, and moves the provider's next slot one interval past it
+RESERVE_SLOT_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local slot = math.max(now, tonumber(redis.call('GET', KEYS[1]) or '0'))
+local next_slot = slot + tonumber(ARGV[1])
+redis.call('SET', KEYS[1], tostring(next_slot), 'PX', math.ceil((next_slot - now) * 1000) + 60000)
+return tostring(slot - now)
+"""
+
+
+class _RedisClient:
+    """Lazily created async Redis client for the running event loop."""
+
+    _redis: redis.Redis | None = None
+    _redis_loop: asyncio.AbstractEventLoop | None = None
+
+    def _get_redis(self) -> redis.Redis:
+        # redis.asyncio connections are bound to the loop that created them
+        loop = asyncio.get_running_loop()
+        if self._redis is None or self._redis_loop is not loop:
+            self._redis = redis.from_url(settings.redis_url, socket_connect_timeout=1)
+            self._redis_loop = loop
+        return self._redis
+
+
+class AsyncRateLimiter(_RedisClient):
+    """Spaces out requests to a provider so all workers stay under a per-minute rate.
+
+    The provider's next free slot is kept in Redis; each acquire() reserves
+    a slot atomically and sleeps until it arrives. If Redis is unavailable
+    the limiter falls back to spacing this process's requests on its own.
+    """
+
+    def __init__(self, provider: str, requests_per_minute: int):
+        self.provider = provider
+        self.interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        self._next_slot = 0.0
+
+    async def acquire(self) -> None:
+        """Wait until the caller may send its next request."""
+        if not self.interval:
+            return
+
+        try:
+            delay = float(await self._get_redis().eval(
+                RESERVE_SLOT_SCRIPT, 1, f"{REQUEST_SLOT_KEY_PREFIX}{self.provider}", self.interval
+            ))
+        except redis.RedisError:
+            delay = self._reserve_local_slot()
+
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _reserve_local_slot(self) -> float:
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self.interval
+        return slot - now
+
+
+@lru_cache
+def get_rate_limiter(provider: str) -> AsyncRateLimiter:
+    """Get the shared request rate limiter for an LLM provider."""
+    limits = {
+        "anthropic": settings.anthropic_requests_per_minute,
+        "openai": settings.openai_requests_per_minute,
+        "ollama": settings.ollama_requests_per_minute,
+    }
+    return AsyncRateLimiter(provider, limits.get(provider, 0))
+
+
+class TokenRateLimiter(_RedisClient):
+    """Caps LLM tokens per minute for a provider across all workers.
+
+    Usage is counted in a fixed one-minute window in Redis. A caller whose
+    tokens do not fit the current window waits for the next one. If Redis
+    is unavailable the limiter lets requests through.
+    """
+
+    def __init__(self, provider: str, tokens_per_minute: int):
+        self.provider = provider
+        self.tokens_per_minute = tokens_per_minute
+
+    async def acquire(self, tokens: int) -> None:
+        """Wait until `tokens` fit within the provider's per-minute budget."""
+        if self.tokens_per_minute <= 0:
+            return
+
+        # A single oversized request may use a whole window on its own
+        tokens = min(tokens, self.tokens_per_minute)
+        while True:
+            now = time.time()
+            key = f"{TOKEN_WINDOW_KEY_PREFIX}{self.provider}:{int(now // 60)}"
+            try:
+                client = self._get_redis()
+                used = await client.incrby(key, tokens)
+                await client.expire(key, 120)
+                if used <= self.tokens_per_minute:
+                    return
+                await client.decrby(key, tokens)
+            except redis.RedisError:
+                return
+
+            # Jitter so waiting workers don't all retry at the window boundary
+            await asyncio.sleep(60 - now % 60 + random.uniform(0, 2))
+
+
+@lru_cache
+def get_token_rate_limiter(provider: str) -> TokenRateLimiter:
+    """Get the shared token rate limiter for an LLM provider."""
+    limits = {
+        "anthropic": settings.anthropic_tokens_per_minute,
+        "openai": settings.openai_tokens_per_minute,
+        "ollama": settings.ollama_tokens_per_minute,
+    }
+    return TokenRateLimiter(provider, limits.get(provider, 0))
@@ -0,0 +1,106 @@
+import json
+
+from app.config import settings
+from app.models.item import ActionType, Category, Item
+from app.models.sender_profile import SenderProfile
+
+# Priority bands, highest first (matches the priority scorer's guide)
+PRIORITY_BAND_RANGES = {
+    "urgent": (90, 100),
+    "high": (70, 89),
+    "normal": (50, 69),
+    "low": (30, 49),
+    "very_low": (1, 29),
+}
+
+
+def sender_key(item: Item) -> str | None:
+    """Memo key for an item's sender, or None if the sender is unknown."""
+    identifier = item.sender_email or item.sender_id
+    if not identifier:
+        return None
+    return f"{item.platform.value}:{identifier.strip().lower()}"[:255]
+
+
+def priority_band(score: int) -> str:
+    """Name of the priority band a score falls into."""
+    for band, (low, _) in PRIORITY_BAND_RANGES.items():
+        if score >= low:
+            return band
+    return "very_low"
+
+
+def _confident_label(counts_json: str | None) -> str | None:
+    """The majority label if enough samples agree on it, else None."""
+    counts: dict[str, int] = json.loads(counts_json or "{}")
+    total = sum(counts.values())
+    if total < settings.sender_memo_min_samples:
+        return None
+    label, count = max(counts.items(), key=lambda kv: kv[1])
+    if count / total < settings.sender_memo_min_agreement:
+        return None
+    return label
+
+
+def memo_category(profile: SenderProfile | None) -> Category | None:
+    """Category the memo is confident about for this sender."""
+    if profile is None:
+        return None
+    if profile.override_category is not None:
+        return profile.override_category
+    label = _confident_label(profile.category_counts)
+    return Category(label) if label else None
+
+
+def memo_action_type(profile: SenderProfile | None) -> ActionType | None:
+    """Action type the memo is confident about for this sender."""
+    if profile is None:
+        return None
+    if profile.override_action_type is not None:
+        return profile.override_action_type
+    label = _confident_label(profile.action_counts)
+    return ActionType(label) if label else None
+
+
+def memo_priority(profile: SenderProfile | None) -> int | None:
+    """Typical priority score for this sender, if its band is stable."""
+    if profile is None:
+        return None
+    band = _confident_label(profile.priority_band_counts)
+    if band is None:
+        return None
+    scored = sum(json.loads(profile.priority_band_counts).values())
+    low, high = PRIORITY_BAND_RANGES[band]
+    average = round(profile.priority_total / scored)
+    return max(low, min(high, average))
+
+
+def sample_labels(
+    category: Category | None,
+    action_type: ActionType | None,
+    priority_score: int | None,
+) -> dict[str, str]:
+    """Count field -> label of one LLM classification."""
+    labels = {
+        "category_counts": category.value if category else None,
+        "action_counts": action_type.value if action_type else None,
+        "priority_band_counts": priority_band(priority_score) if priority_score else None,
+    }
+    return {field: label for field, label in labels.items() if label is not None}
+
+
+def add_sample(
+    profile: SenderProfile,
+    category: Category | None,
+    action_type: ActionType | None,
+    priority_score: int | None,
+) -> None:
+    """Count one LLM classification towards a sender profile."""
+    for field, label in sample_labels(category, action_type, priority_score).items():
+        data = json.loads(getattr(profile, field) or "{}")
+        data[label] = data.get(label, 0) + 1
+        setattr(profile, field, json.dumps(data))
+
+    if priority_score:
+        profile.priority_total = (profile.priority_total or 0) + priority_score
+    profile.sample_count = (profile.sample_count or 0) + 1
@@ -1,13 +1,18 @@
+import json
+from collections.abc import AsyncIterator
 from datetime import date
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db, get_current_user_id
+from app.database import AsyncSessionLocal
 from app.models.briefing import Briefing, BriefingType
 from app.schemas.briefing import BriefingRead
+from app.services.briefing_schedule import get_user_zone, local_today
 
 router = APIRouter()
 
@@ -17,8 +22,8 @@ async def get_today_briefing(
     user_id: UUID = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ):
-    """Get today's daily briefing."""
-    today = date.today()
+    """Get today's daily briefing, today being the date in the user's timezone."""
+    today = local_today(await get_user_zone(db, user_id))
     result = await db.execute(
         select(Briefing).where(
             and_(
@@ -61,8 +66,75 @@ async def generate_briefing(
     user_id: UUID = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ):
-    """Generate a new on-demand briefing."""
+    """Generate a new on-demand briefing for today in the user's timezone.
+
+    If the underlying data hasn't changed since today's last briefing, that
+    briefing is returned as is; if only some sections changed, just those
+    and the focus and suggested actions are regenerated.
+    """
     from app.ai.briefing_generator import generate_daily_briefing
 
     briefing = await generate_daily_briefing(db, user_id)
     return briefing
+
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post("/generate/stream")
+async def generate_briefing_stream(
+    user_id: UUID = Depends(get_current_user_id),
+):
+    """Generate a new on-demand briefing, streamed as server-sent events.
+
+    Emits `start` immediately, a `token` event per content chunk, and
+    `done` with the saved briefing once generation finishes (or `error`).
+    A briefing reused from unchanged inputs arrives as a single `token`.
+    """
+    from app.ai.briefing_generator import (
+        gather_briefing_snapshot,
+        get_latest_briefing,
+        refresh_briefing,
+        save_briefing,
+        stream_daily_briefing,
+    )
+
+    async def events() -> AsyncIterator[str]:
+        # The request's session is closed once streaming starts, so use our own
+        async with AsyncSessionLocal() as db:
+            zone = await get_user_zone(db, user_id)
+            briefing_date = local_today(zone)
+            yield _sse("start", {"briefing_date": briefing_date.isoformat()})
+
+            try:
+                snapshot = await gather_briefing_snapshot(user_id, briefing_date, zone)
+
+                # Unchanged or partly changed inputs reuse the last briefing
+                briefing = None
+                previous = await get_latest_briefing(db, user_id, briefing_date)
+                if previous is not None:
+                    briefing = await refresh_briefing(db, previous, snapshot)
+
+                if briefing is not None:
+                    yield _sse("token", briefing.content)
+                else:
+                    chunks: list[str] = []
+                    async for chunk in stream_daily_briefing(snapshot):
+                        chunks.append(chunk)
+                        yield _sse("token", chunk)
+
+                    briefing = await save_briefing(db, user_id, snapshot, "".join(chunks))
+                await db.commit()
+            except Exception as e:
+                await db.rollback()
+                yield _sse("error", {"detail": str(e)})
+                return
+
+        yield _sse("done", BriefingRead.model_validate(briefing).model_dump(mode="json"))
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,5 +1,6 @@
 from datetime import datetime, timedelta
 from uuid import UUID
+import json
 import secrets
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
@@ -10,7 +11,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.deps import get_db, get_current_user_id
 from app.config import settings
 from app.models.connection import Connection, ConnectionStatus, Platform
-from app.schemas.connection import ConnectionRead
+from app.models.sync_state import SyncState
+from app.schemas.connection import ConnectionRead, SyncStatusRead
+from app.services.sync_schedule import record_sync, request_sync
 from app.integrations.gmail import GmailIntegration
 from app.integrations.slack import SlackIntegration
 from app.integrations.calendar import CalendarIntegration
@@ -209,6 +212,9 @@ async def oauth_callback(
 
     await db.flush()
 
+    # Sync the new tokens on the next dispatch instead of waiting out a backoff
+    await request_sync(db, connection.id)
+
     # Redirect to frontend
     return RedirectResponse(
         url=f"{settings.frontend_url}/settings/connections?connected={platform.value}",
@@ -216,13 +222,56 @@ async def oauth_callback(
     )
 
 
+@router.get("/{platform}/sync", response_model=SyncStatusRead)
+async def get_sync_status(
+    platform: Platform,
+    user_id: UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """Get the sync status of a platform, with the progress of an initial import."""
+    result = await db.execute(
+        select(Connection).where(
+            and_(
+                Connection.user_id == user_id,
+                Connection.platform == platform,
+            )
+        )
+    )
+    connection = result.scalar_one_or_none()
+    if not connection:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No connection found for {platform.value}",
+        )
+
+    result = await db.execute(
+        select(SyncState).where(SyncState.connection_id == connection.id)
+    )
+    sync_state = result.scalars().first()
+    if not sync_state:
+        return SyncStatusRead()
+
+    metadata = json.loads(sync_state.sync_metadata or "{}")
+    return SyncStatusRead(
+        last_sync_at=sync_state.last_sync_at,
+        last_sync_status=sync_state.last_sync_status,
+        next_sync_at=sync_state.next_sync_at,
+        items_synced=sync_state.items_synced,
+        import_progress=metadata.get("import"),
+    )
+
+
 @router.post("/{platform}/sync")
 async def trigger_sync(
     platform: Platform,
     user_id: UUID = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ):
-    """Manually trigger a sync for a platform."""
+    """Sync a platform right away.
+
+    Also resets the connection's adaptive polling to its most frequent
+    interval when the sync brings new items.
+    """
     result = await db.execute(
         select(Connection).where(
             and_(
@@ -276,6 +325,7 @@ async def trigger_sync(
     # Perform sync
     try:
         items_synced = await integration.sync(db, user_id)
+        await record_sync(db, connection.id, platform, items_synced)
         return {"status": "success", "items_synced": items_synced}
     except Exception as e:
         connection.last_error = str(e)
@@ -5,9 +5,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db, get_current_user_id
 from app.crud.item import item_crud
+from app.crud.sender_profile import sender_profile_crud
 from app.models.connection import Platform
 from app.models.item import ActionType, Category, ItemType
 from app.schemas.item import ItemFilter, ItemRead, ItemUpdate
+from app.services.item_bodies import hydrate_bodies
 
 router = APIRouter()
 
@@ -68,13 +70,18 @@ async def get_item(
     user_id: UUID = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ):
-    """Get a single inbox item."""
+    """Get a single inbox item.
+
+    An email synced without its body has it fetched on this first view.
+    """
     item = await item_crud.get(db, item_id)
     if not item or item.user_id != user_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Item not found",
         )
+    if not item.body_hydrated and await hydrate_bodies(db, [item]):
+        await db.refresh(item)
     return item
 
 
@@ -85,13 +92,20 @@ async def update_item(
     user_id: UUID = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ):
-    """Update an inbox item (mark read, archive, star, snooze)."""
+    """Update an inbox item (mark read, archive, star, snooze, reclassify)."""
     item = await item_crud.get(db, item_id)
     if not item or item.user_id != user_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Item not found",
         )
+
+    # Corrections are pinned on the sender memo so future items follow them
+    if item_in.category is not None or item_in.action_type is not None:
+        await sender_profile_crud.apply_override(
+            db, item, item_in.category, item_in.action_type
+        )
+
     item = await item_crud.update(db, item, item_in)
     return item
 
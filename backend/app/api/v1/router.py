@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.v1 import auth, inbox, deadlines, tasks, briefings, connections
+from app.api.v1 import auth, inbox, deadlines, tasks, briefings, connections, webhooks
 
 api_router = APIRouter()
 
@@ -10,3 +10,4 @@ api_router.include_router(deadlines.router, prefix="/deadlines", tags=["deadline
 api_router.include_router(tasks.router, prefix="/tasks", tags=["tasks"])
 api_router.include_router(briefings.router, prefix="/briefings", tags=["briefings"])
 api_router.include_router(connections.router, prefix="/connections", tags=["connections"])
+api_router.include_router(webhooks.router, prefix="/webhooks", tags=["webhooks"])
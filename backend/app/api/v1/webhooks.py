@@ -0,0 +1,113 @@
+import hmac
+import json
+
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, HTTPException, Query, Request, status
+from sqlalchemy import select, and_, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_db
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.integrations.gmail import decode_push_notification
+from app.integrations.slack import ingest_message_event, verify_signature
+from app.models.connection import Connection, ConnectionStatus, Platform
+from app.models.sync_state import SyncState
+from app.workers.sync_tasks import queue_syncs
+
+router = APIRouter()
+
+
+@router.post("/gmail")
+async def gmail_push(
+    envelope: dict = Body(...),
+    token: str = Query(""),
+    db: AsyncSession = Depends(get_db),
+):
+    """Receive a Gmail watch notification pushed by Pub/Sub.
+
+    Queues an incremental sync of the mailbox's connection, unless it has
+    already synced past the notified historyId. Anything but a 2xx makes
+    Pub/Sub redeliver, so notifications that can't be used are acknowledged
+    and ignored.
+    """
+    if not settings.gmail_push_token or not hmac.compare_digest(
+        token.encode(), settings.gmail_push_token.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid push token",
+        )
+
+    try:
+        email, history_id = decode_push_notification(envelope)
+    except ValueError:
+        return {"status": "ignored", "reason": "malformed notification"}
+
+    result = await db.execute(
+        select(Connection.id, SyncState.sync_token)
+        .outerjoin(SyncState, SyncState.connection_id == Connection.id)
+        .where(
+            and_(
+                Connection.platform == Platform.GMAIL,
+                Connection.status == ConnectionStatus.ACTIVE,
+                func.lower(Connection.external_email) == email.lower(),
+            )
+        )
+    )
+    connection_ids = [
+        str(connection_id)
+        for connection_id, sync_token in result.all()
+        if not (sync_token and sync_token.isdigit() and int(sync_token) >= history_id)
+    ]
+    if not connection_ids:
+        return {"status": "ignored", "reason": "no connection needs syncing"}
+
+    queued, skipped = await queue_syncs(connection_ids, rerun_if_syncing=True)
+    return {"status": "queued", "connections_queued": queued, "connections_skipped": skipped}
+
+
+@router.post("/slack")
+async def slack_events(request: Request, background_tasks: BackgroundTasks):
+    """Receive Slack Events API callbacks.
+
+    Requests must carry a valid signature. The callback is acknowledged at
+    once, within Slack's 3 second deadline, and its `message` event is then
+    stored as items in the background, deduplicated by external_id, so
+    Slack polling only has to reconcile missed events.
+    """
+    body = await request.body()
+    if not verify_signature(
+        body,
+        request.headers.get("X-Slack-Request-Timestamp", ""),
+        request.headers.get("X-Slack-Signature", ""),
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid Slack signature",
+        )
+
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid JSON body",
+        )
+
+    if payload.get("type") == "url_verification":
+        return {"challenge": payload.get("challenge")}
+    if payload.get("type") != "event_callback":
+        return {"status": "ignored"}
+
+    background_tasks.add_task(_ingest_slack_event, payload)
+    return {"status": "ok"}
+
+
+async def _ingest_slack_event(payload: dict) -> None:
+    async with AsyncSessionLocal() as db:
+        try:
+            await ingest_message_event(db, payload)
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            print(f"Slack event ingest failed: {e}")
@@ -26,32 +26,47 @@ celery_app.conf.update(
     task_acks_late=True,
 )
 
+# Network-bound tasks that the asyncio worker (app.workers.aio_worker) can run
+IO_TASKS = (
+    "app.workers.sync_tasks.sync_all_gmail",
+    "app.workers.sync_tasks.sync_all_slack",
+    "app.workers.sync_tasks.sync_all_calendar",
+    "app.workers.sync_tasks.sync_due_connections",
+    "app.workers.sync_tasks.sync_user_connection",
+    "app.workers.sync_tasks.renew_gmail_watches",
+    "app.workers.process_tasks.process_single_item",
+)
+
+celery_app.conf.task_routes = {
+    name: {"queue": settings.celery_io_queue} for name in IO_TASKS
+}
+
 # Periodic task schedule
 celery_app.conf.beat_schedule = {
-    # Sync Gmail every 5 minutes
-    "sync-gmail-every-5-minutes": {
-        "task": "app.workers.sync_tasks.sync_all_gmail",
-        "schedule": 300.0,  # 5 minutes
-    },
-    # Sync Slack every 2 minutes
-    "sync-slack-every-2-minutes": {
-        "task": "app.workers.sync_tasks.sync_all_slack",
-        "schedule": 120.0,  # 2 minutes
+    # Queue connections due for sync (adaptive per-connection polling intervals)
+    "sync-due-connections": {
+        "task": "app.workers.sync_tasks.sync_due_connections",
+        "schedule": float(settings.sync_dispatch_interval_seconds),
     },
-    # Sync Calendar every 15 minutes
-    "sync-calendar-every-15-minutes": {
-        "task": "app.workers.sync_tasks.sync_all_calendar",
-        "schedule": 900.0,  # 15 minutes
+    # Renew Gmail push watches (they expire after 7 days)
+    "renew-gmail-watches": {
+        "task": "app.workers.sync_tasks.renew_gmail_watches",
+        "schedule": crontab(minute=0, hour="*/6"),
     },
     # Process unprocessed items every minute
     "process-items-every-minute": {
         "task": "app.workers.process_tasks.process_unprocessed_items",
         "schedule": 60.0,  # 1 minute
     },
-    # Generate morning briefings at 7 AM UTC
-    "generate-morning-briefings": {
-        "task": "app.workers.briefing_tasks.generate_all_morning_briefings",
-        "schedule": crontab(hour=7, minute=0),
+    # Generate morning briefings ahead of 7 AM in each user's timezone
+    "schedule-morning-briefings": {
+        "task": "app.workers.briefing_tasks.schedule_morning_briefings",
+        "schedule": crontab(minute=f"*/{settings.briefing_schedule_interval_minutes}"),
+    },
+    # Seed sender memo profiles for new senders daily
+    "seed-sender-profiles": {
+        "task": "app.workers.process_tasks.seed_sender_profiles",
+        "schedule": crontab(hour=3, minute=0),
     },
     # Mark overdue deadlines hourly
     "mark-overdue-deadlines": {
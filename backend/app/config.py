@@ -42,6 +42,25 @@ class Settings(BaseSettings):
     # Redis
     redis_url: str = "redis://localhost:6379/0"
 
+    # Workers. Network-bound sync/AI tasks go to CELERY_IO_QUEUE, consumed by
+    # `python -m app.workers.aio_worker` (or a prefork worker with `-Q celery,io`).
+    # Never point it at the main "celery" queue: the asyncio worker can't run other tasks.
+    celery_io_queue: str = "io"
+    aio_worker_concurrency: int = 200
+    aio_worker_db_pool_size: int = 20
+
+    # Adaptive sync polling: each connection is polled every SYNC_<PLATFORM>_INTERVAL_SECONDS
+    # while it has new items; after SYNC_IDLE_GRACE_SYNCS idle syncs it backs off x2 per
+    # idle sync, up to SYNC_MAX_INTERVAL_SECONDS
+    sync_gmail_interval_seconds: int = 120
+    sync_slack_interval_seconds: int = 60
+    sync_calendar_interval_seconds: int = 600
+    sync_idle_grace_syncs: int = 3
+    sync_max_interval_seconds: int = 3600
+    # Polling interval of connections that get push notifications (reconciliation only)
+    sync_push_interval_seconds: int = 3600
+    sync_dispatch_interval_seconds: int = 60
+
     # Security
     secret_key: str = "change-me-in-production"
     access_token_expire_minutes: int = 1440
@@ -53,14 +72,88 @@ class Settings(BaseSettings):
     openai_api_key: str = ""
     ollama_base_url: str = "http://localhost:11434"
 
+    # AI Pipeline
+    # "fused" analyzes an item in one LLM call; "staged" makes one call per field
+    ai_pipeline_mode: Literal["fused", "staged"] = "fused"
+    # Per LLM call, not counting the wait for a rate limit slot
+    ai_stage_timeout_seconds: float = 30.0
+    # Local rules that skip LLM stages when confident (bulk mail, no dates, ...)
+    ai_heuristics_enabled: bool = True
+
+    # AI batch processing
+    ai_batch_concurrency: int = 10
+    ai_batch_min_size: int = 20
+    ai_batch_max_size: int = 200
+    ai_batch_time_budget_seconds: float = 50.0
+    # Items claimed by a run that hasn't finished in this long are picked up again
+    ai_claim_timeout_seconds: int = 900
+    # Short Slack/calendar items analyzed per packed LLM request (0 = off)
+    ai_pack_size: int = 10
+    ai_pack_max_chars: int = 500
+
+    # Bulk backfill through the provider's batch API (cheaper, slower)
+    # "native" uses Anthropic/OpenAI batches; "local" (and Ollama, which has no
+    # batch API) drains every backlog through the real-time pipeline
+    ai_batch_api: Literal["native", "local"] = "native"
+    ai_backfill_threshold: int = 500
+    ai_backfill_max_items: int = 5000
+    ai_backfill_poll_seconds: int = 60
+
+    # LLM request rate limits per provider, shared by all workers (requests per minute, 0 = unlimited)
+    anthropic_requests_per_minute: int = 50
+    openai_requests_per_minute: int = 500
+    ollama_requests_per_minute: int = 0
+    # Briefing LLM token budget per provider, shared by all workers (0 = unlimited)
+    anthropic_tokens_per_minute: int = 80000
+    openai_tokens_per_minute: int = 150000
+    ollama_tokens_per_minute: int = 0
+
+    # LLM result cache (in-process LRU in front of Redis)
+    llm_cache_enabled: bool = True
+    llm_cache_ttl_seconds: int = 7 * 24 * 3600
+    llm_cache_max_entries: int = 2048
+
+    # Sender classification memo
+    sender_memo_enabled: bool = True
+    sender_memo_min_samples: int = 5
+    sender_memo_min_agreement: float = 0.9
+
+    # Morning briefings, generated ahead of BRIEFING_LOCAL_HOUR in each user's timezone
+    briefing_local_hour: int = 7
+    briefing_lead_minutes: int = 30
+    briefing_schedule_interval_minutes: int = 15
+    briefing_shard_size: int = 50
+    briefing_shard_concurrency: int = 5
+
     # Gmail OAuth
     gmail_client_id: str = ""
     gmail_client_secret: str = ""
+    # Gmail push notifications: set the Pub/Sub topic to enable inbox watches, and
+    # point its push subscription at /api/v1/webhooks/gmail?token=<GMAIL_PUSH_TOKEN>
+    gmail_pubsub_topic: str = ""
+    gmail_push_token: str = ""
+    gmail_watch_renew_hours: int = 24
+    # Messages per Gmail batch request (max 100); retries of rate-limited/failed
+    # fetches, backing off exponentially from the base delay (seconds)
+    gmail_batch_size: int = 50
+    gmail_fetch_max_retries: int = 5
+    gmail_fetch_backoff_seconds: float = 1.0
+    # Initial inbox import: messages per list page (max 500), pages per sync run
+    gmail_import_page_size: int = 500
+    gmail_import_pages_per_run: int = 10
+    # Sync only headers and snippets; a message body is fetched when its item is
+    # first opened or analyzed (bulk mail is analyzed from its snippet)
+    gmail_lazy_bodies: bool = True
 
     # Slack OAuth
     slack_client_id: str = ""
     slack_client_secret: str = ""
     slack_signing_secret: str = ""
+    # Slack Events API: point the app's Request URL at /api/v1/webhooks/slack.
+    # The app-level token (xapp-..., authorizations:read) finds every connected
+    # user an event is visible to; only with it is Slack polling relaxed
+    slack_events_enabled: bool = False
+    slack_app_token: str = ""
 
     # Google Calendar
     google_calendar_enabled: bool = True
@@ -2,5 +2,6 @@ from app.crud.user import user_crud
 from app.crud.item import item_crud
 from app.crud.deadline import deadline_crud
 from app.crud.task import task_crud
+from app.crud.sender_profile import sender_profile_crud
 
-__all__ = ["user_crud", "item_crud", "deadline_crud", "task_crud"]
+__all__ = ["user_crud", "item_crud", "deadline_crud", "task_crud", "sender_profile_crud"]
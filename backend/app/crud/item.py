@@ -1,12 +1,27 @@
 from uuid import UUID
 
-from sqlalchemy import select, and_, or_
+from sqlalchemy import String, any_, bindparam, select, and_, or_
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.item import Item
+from app.models.connection import Platform
+from app.models.item import ITEM_EXTERNAL_ID_CONSTRAINT, ActionType, Item
 from app.schemas.item import ItemCreate, ItemUpdate, ItemFilter
 
 
+def _item_row(item: Item) -> dict:
+    """Column values of a new Item, with the defaults a flush would apply."""
+    row = {}
+    for column in Item.__table__.columns:
+        value = getattr(item, column.key)
+        if value is None and column.default is not None:
+            value = column.default.arg(None) if column.default.is_callable else column.default.arg
+        if value is None and column.server_default is not None:
+            continue  # created_at/updated_at, filled in by the database
+        row[column.key] = value
+    return row
+
+
 class ItemCRUD:
     """CRUD operations for Item model."""
 
@@ -26,6 +41,45 @@ class ItemCRUD:
         )
         return result.scalar_one_or_none()
 
+    async def get_existing_external_ids(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        platform: Platform,
+        external_ids: list[str],
+    ) -> set[str]:
+        """Which of a page of external platform IDs a user already has, in one query."""
+        if not external_ids:
+            return set()
+        result = await db.execute(
+            select(Item.external_id).where(
+                and_(
+                    Item.user_id == user_id,
+                    Item.platform == platform,
+                    Item.external_id == any_(bindparam("external_ids", external_ids, type_=ARRAY(String))),
+                )
+            )
+        )
+        return set(result.scalars().all())
+
+    async def insert_new(self, db: AsyncSession, items: list[Item]) -> int:
+        """Insert synced items, skipping any the user already has.
+
+        Uses INSERT ... ON CONFLICT DO NOTHING on (user_id, platform,
+        external_id), so concurrent syncs of the same account can't create
+        duplicates. The items are not added to the session. Returns the
+        number of rows inserted.
+        """
+        if not items:
+            return 0
+        result = await db.execute(
+            insert(Item)
+            .on_conflict_do_nothing(constraint=ITEM_EXTERNAL_ID_CONSTRAINT)
+            .returning(Item.id),
+            [_item_row(item) for item in items],
+        )
+        return len(result.all())
+
     async def get_multi(
         self, db: AsyncSession, user_id: UUID, filters: ItemFilter
     ) -> list[Item]:
@@ -85,6 +139,14 @@ class ItemCRUD:
     ) -> Item:
         """Update an item."""
         update_data = item_in.model_dump(exclude_unset=True)
+
+        # Keep action_required consistent with a corrected action type
+        if update_data.get("action_type") is not None:
+            update_data["action_required"] = update_data["action_type"] not in (
+                ActionType.FYI_ONLY,
+                ActionType.NONE,
+            )
+
         for field, value in update_data.items():
             setattr(item, field, value)
         await db.flush()
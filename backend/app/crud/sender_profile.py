@@ -0,0 +1,167 @@
+import json
+from uuid import UUID
+
+from sqlalchemy import Integer, Text, cast, select, and_, func, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, array, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.ai.sender_memo import add_sample, sample_labels, sender_key
+from app.models.item import ActionType, Category, Item
+from app.models.sender_profile import SenderProfile
+
+
+class SenderProfileCRUD:
+    """CRUD operations for SenderProfile model."""
+
+    async def get_for_items(
+        self, db: AsyncSession, items: list[Item]
+    ) -> dict[tuple[UUID, str], SenderProfile]:
+        """Load the profiles for the senders of a set of items in one query."""
+        keys = {
+            (item.user_id, key)
+            for item in items
+            if (key := sender_key(item)) is not None
+        }
+        if not keys:
+            return {}
+
+        result = await db.execute(
+            select(SenderProfile).where(
+                tuple_(SenderProfile.user_id, SenderProfile.sender_key).in_(list(keys))
+            )
+        )
+        return {
+            (profile.user_id, profile.sender_key): profile
+            for profile in result.scalars().all()
+        }
+
+    async def get_or_create(
+        self, db: AsyncSession, user_id: UUID, key: str
+    ) -> SenderProfile:
+        """Get a sender profile, creating an empty one if needed."""
+        await db.execute(
+            insert(SenderProfile)
+            .values(user_id=user_id, sender_key=key, priority_total=0, sample_count=0)
+            .on_conflict_do_nothing(index_elements=["user_id", "sender_key"])
+        )
+        result = await db.execute(
+            select(SenderProfile).where(
+                and_(SenderProfile.user_id == user_id, SenderProfile.sender_key == key)
+            )
+        )
+        return result.scalar_one()
+
+    async def record(
+        self,
+        db: AsyncSession,
+        item: Item,
+        category: Category | None = None,
+        action_type: ActionType | None = None,
+        priority_score: int | None = None,
+    ) -> None:
+        """Count an LLM classification of an item towards its sender's profile.
+
+        The counts are incremented by a single upsert rather than read and
+        written back, so concurrent workers never lose each other's samples.
+        """
+        key = sender_key(item)
+        if key is None or (category is None and action_type is None and priority_score is None):
+            return
+
+        labels = sample_labels(category, action_type, priority_score)
+        stmt = insert(SenderProfile).values(
+            user_id=item.user_id,
+            sender_key=key,
+            priority_total=priority_score or 0,
+            sample_count=1,
+            **{field: json.dumps({label: 1}) for field, label in labels.items()},
+        )
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["user_id", "sender_key"],
+                set_={
+                    **{
+                        field: _increment_count(getattr(SenderProfile, field), label)
+                        for field, label in labels.items()
+                    },
+                    "priority_total": SenderProfile.priority_total + (priority_score or 0),
+                    "sample_count": SenderProfile.sample_count + 1,
+                    "updated_at": func.now(),
+                },
+            )
+        )
+
+    async def apply_override(
+        self,
+        db: AsyncSession,
+        item: Item,
+        category: Category | None = None,
+        action_type: ActionType | None = None,
+    ) -> None:
+        """Pin a user's correction so future items from the sender follow it."""
+        key = sender_key(item)
+        if key is None:
+            return
+        profile = await self.get_or_create(db, item.user_id, key)
+        if category is not None:
+            profile.override_category = category
+        if action_type is not None:
+            profile.override_action_type = action_type
+        await db.flush()
+
+    async def seed_from_history(self, db: AsyncSession, user_id: UUID) -> int:
+        """Build profiles for senders that have none from already processed items.
+
+        Only senders without a profile are seeded: their items were all
+        classified by the LLM, so the counts cannot be skewed by earlier
+        memo hits. Returns the number of profiles created.
+        """
+        result = await db.execute(
+            select(
+                Item.platform,
+                func.lower(func.coalesce(Item.sender_email, Item.sender_id)),
+                Item.category,
+                Item.action_type,
+                Item.priority_score,
+            ).where(
+                and_(
+                    Item.user_id == user_id,
+                    Item.ai_processed_at.is_not(None),
+                    Item.ai_confidence > 0,
+                    func.coalesce(Item.sender_email, Item.sender_id).is_not(None),
+                )
+            )
+        )
+
+        existing = await db.execute(
+            select(SenderProfile.sender_key).where(SenderProfile.user_id == user_id)
+        )
+        existing_keys = set(existing.scalars().all())
+
+        profiles: dict[str, SenderProfile] = {}
+        for platform, identifier, category, action_type, priority_score in result.all():
+            key = f"{platform.value}:{identifier.strip()}"[:255]
+            if key in existing_keys:
+                continue
+            if key not in profiles:
+                profiles[key] = SenderProfile(
+                    user_id=user_id, sender_key=key, priority_total=0, sample_count=0
+                )
+            add_sample(profiles[key], category, action_type, priority_score)
+
+        db.add_all(profiles.values())
+        await db.flush()
+        return len(profiles)
+
+
+def _increment_count(column, label: str):
+    """SQL for `column` (a JSON object of label -> count) with `label` counted once more."""
+    counts = cast(func.coalesce(column, "{}"), JSONB)
+    current = func.coalesce(cast(counts[label].astext, Integer), 0)
+    return cast(
+        func.jsonb_set(counts, cast(array([label]), ARRAY(Text)), func.to_jsonb(current + 1)),
+        Text,
+    )
+
+
+sender_profile_crud = SenderProfileCRUD()
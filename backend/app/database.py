@@ -1,6 +1,6 @@
 from collections.abc import AsyncGenerator
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
 from app.config import settings
@@ -12,13 +12,21 @@ class Base(DeclarativeBase):
     pass
 
 
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.app_env == "development",
-    pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
-)
+def make_engine(**pool_options) -> AsyncEngine:
+    """Create an async engine with the application's pool settings.
+
+    `pool_options` override the default pool settings (pool_size, ...).
+    """
+    options = {"pool_pre_ping": True, "pool_size": 5, "max_overflow": 10}
+    options.update(pool_options)
+    return create_async_engine(
+        settings.database_url,
+        echo=settings.app_env == "development",
+        **options,
+    )
+
+
+engine = make_engine()
 
 AsyncSessionLocal = async_sessionmaker(
     engine,
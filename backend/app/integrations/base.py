@@ -1,10 +1,10 @@
 from abc import ABC, abstractmethod
-from datetime import datetime
+from datetime import datetime, timedelta
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.connection import Connection, Platform
+from app.models.connection import Connection, ConnectionStatus, Platform
 
 
 class BaseIntegration(ABC):
@@ -46,3 +46,25 @@ class BaseIntegration(ABC):
         if not self.connection.token_expires_at:
             return False
         return datetime.utcnow() >= self.connection.token_expires_at
+
+    async def ensure_fresh_tokens(self) -> bool:
+        """Refresh the connection's tokens if needed; False if that failed.
+
+        On failure the connection is marked as errored.
+        """
+        if not self.is_token_expired():
+            return True
+        try:
+            token_data = await self.refresh_tokens()
+            self.connection.access_token = token_data["access_token"]
+            if token_data.get("refresh_token"):
+                self.connection.refresh_token = token_data["refresh_token"]
+            if token_data.get("expires_in"):
+                self.connection.token_expires_at = datetime.utcnow() + timedelta(
+                    seconds=token_data["expires_in"]
+                )
+            return True
+        except Exception as e:
+            self.connection.status = ConnectionStatus.ERROR
+            self.connection.last_error = str(e)
+            return False
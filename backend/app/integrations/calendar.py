@@ -2,10 +2,11 @@ from datetime import datetime, timedelta
 from uuid import UUID
 
 import httpx
-from sqlalchemy import select, and_
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
+from app.crud.item import item_crud
 from app.integrations.base import BaseIntegration
 from app.models.connection import Connection, Platform
 from app.models.item import Item, ItemType
@@ -155,27 +156,23 @@ class CalendarIntegration(BaseIntegration):
             response.raise_for_status()
             data = response.json()
 
-            for event in data.get("items", []):
-                if event.get("status") == "cancelled":
-                    continue
+            events = [event for event in data.get("items", []) if event.get("status") != "cancelled"]
 
-                # Check if already synced
-                existing = await db.execute(
-                    select(Item).where(
-                        and_(
-                            Item.user_id == user_id,
-                            Item.external_id == event["id"],
-                        )
-                    )
-                )
-                if existing.scalar_one_or_none():
+            # Check which are already synced, one query per page
+            existing = await item_crud.get_existing_external_ids(
+                db, user_id, Platform.CALENDAR, [event["id"] for event in events]
+            )
+
+            items = []
+            for event in events:
+                if event["id"] in existing:
                     continue
 
                 # Parse event
                 item = self._parse_event(event, user_id)
                 if item:
-                    db.add(item)
-                    items_synced += 1
+                    items.append(item)
+            items_synced += await item_crud.insert_new(db, items)
 
             # Store next sync token
             if "nextSyncToken" in data:
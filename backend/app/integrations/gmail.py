@@ -1,27 +1,43 @@
 import base64
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from email.utils import parsedate_to_datetime
 from uuid import UUID
 import json
 
 import httpx
-from sqlalchemy import select, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
+from app.crud.item import item_crud
 from app.integrations.base import BaseIntegration
+from app.integrations.gmail_batch import fetch_messages
+from app.integrations.mime import extract_text
 from app.models.connection import Connection, Platform
 from app.models.item import Item, ItemType
 from app.models.sync_state import SyncState
 from app.schemas.item import ItemCreate
+from app.services.sync_schedule import get_sync_state, push_enabled
 
 GMAIL_AUTH_URL = "https://accounts.google.com/o/oauth2/v2/auth"
 GMAIL_TOKEN_URL = "https://oauth2.googleapis.com/token"
 GMAIL_API_BASE = "https://gmail.googleapis.com/gmail/v1"
+GMAIL_BATCH_URL = "https://gmail.googleapis.com/batch/gmail/v1"
 GMAIL_SCOPES = [
     "https://www.googleapis.com/auth/gmail.readonly",
     "https://www.googleapis.com/auth/userinfo.email",
 ]
+# Headers _parse_message reads, requested with format=metadata
+GMAIL_METADATA_HEADERS = [
+    "Subject",
+    "From",
+    "To",
+    "Cc",
+    "Date",
+    "List-Unsubscribe",
+    "List-Id",
+    "Precedence",
+    "Auto-Submitted",
+]
 
 
 class GmailIntegration(BaseIntegration):
@@ -100,104 +116,237 @@ class GmailIntegration(BaseIntegration):
                 "expires_in": data.get("expires_in", 3600),
             }
 
+    async def watch(self, db: AsyncSession) -> datetime:
+        """Start or renew push notifications for the inbox.
+
+        Gmail publishes to GMAIL_PUBSUB_TOPIC on every inbox change until the
+        watch expires (after 7 days at most). Returns the expiry time.
+        """
+        async with httpx.AsyncClient() as client:
+            response = await client.post(
+                f"{GMAIL_API_BASE}/users/me/watch",
+                headers={"Authorization": f"Bearer {self.connection.access_token}"},
+                json={
+                    "topicName": settings.gmail_pubsub_topic,
+                    "labelIds": ["INBOX"],
+                    "labelFilterBehavior": "include",
+                },
+            )
+            response.raise_for_status()
+            data = response.json()
+
+        sync_state = await get_sync_state(db, self.connection.id)
+        metadata = json.loads(sync_state.sync_metadata or "{}")
+        metadata["watch_expiration"] = int(data["expiration"])  # Epoch milliseconds
+        sync_state.sync_metadata = json.dumps(metadata)
+        await db.flush()
+
+        return datetime.fromtimestamp(int(data["expiration"]) / 1000, tz=timezone.utc)
+
     async def sync(self, db: AsyncSession, user_id: UUID) -> int:
-        """Sync emails from Gmail."""
-        # Get or create sync state
-        result = await db.execute(
-            select(SyncState).where(SyncState.connection_id == self.connection.id)
-        )
-        sync_state = result.scalar_one_or_none()
+        """Sync emails from Gmail.
 
-        if not sync_state:
-            sync_state = SyncState(connection_id=self.connection.id)
-            db.add(sync_state)
+        The first sync imports the inbox page by page, over as many runs as
+        it takes (see _import_pages). Later syncs apply the mailbox history
+        since the previous one.
+        """
+        sync_state = await get_sync_state(db, self.connection.id)
+        metadata = json.loads(sync_state.sync_metadata or "{}")
 
-        # Fetch messages
         async with httpx.AsyncClient() as client:
             headers = {"Authorization": f"Bearer {self.connection.access_token}"}
 
-            # List messages
-            params = {"maxResults": 50, "labelIds": "INBOX"}
-            if sync_state.sync_token:
+            items_synced = None
+            if sync_state.sync_token and "import" not in metadata:
                 # Use history API for incremental sync
-                params = {"startHistoryId": sync_state.sync_token, "historyTypes": "messageAdded"}
-                response = await client.get(
-                    f"{GMAIL_API_BASE}/users/me/history",
-                    headers=headers,
-                    params=params,
-                )
-            else:
-                response = await client.get(
-                    f"{GMAIL_API_BASE}/users/me/messages",
-                    headers=headers,
-                    params=params,
+                items_synced = await self._sync_history(client, headers, db, user_id, sync_state)
+            if items_synced is None:
+                # First sync, an unfinished import, or history ID expired
+                items_synced = await self._import_pages(
+                    client, headers, db, user_id, sync_state, metadata
                 )
 
+        sync_state.last_sync_at = datetime.utcnow()
+        await db.flush()
+
+        # Start push notifications for a new mailbox, or one whose watch
+        # failed or lapsed; until then it keeps its regular polling interval
+        if settings.gmail_pubsub_topic and not push_enabled(Platform.GMAIL, sync_state):
+            try:
+                await self.watch(db)
+            except (httpx.HTTPError, KeyError, ValueError) as e:
+                print(f"Gmail watch failed for connection {self.connection.id}: {e}")
+
+        return items_synced
+
+    async def _sync_history(
+        self,
+        client: httpx.AsyncClient,
+        headers: dict,
+        db: AsyncSession,
+        user_id: UUID,
+        sync_state: SyncState,
+    ) -> int | None:
+        """Store the messages added since sync_state.sync_token, following every page.
+
+        Returns None if the history ID has expired and a full import is needed.
+        """
+        items_synced = 0
+        page_token = None
+        while True:
+            params = {
+                "startHistoryId": sync_state.sync_token,
+                "historyTypes": "messageAdded",
+                "maxResults": settings.gmail_import_page_size,
+            }
+            if page_token:
+                params["pageToken"] = page_token
+            response = await client.get(
+                f"{GMAIL_API_BASE}/users/me/history",
+                headers=headers,
+                params=params,
+            )
             if response.status_code == 404:
-                # History ID expired, do full sync
                 sync_state.sync_token = None
-                params = {"maxResults": 50, "labelIds": "INBOX"}
-                response = await client.get(
-                    f"{GMAIL_API_BASE}/users/me/messages",
-                    headers=headers,
-                    params=params,
-                )
+                return None
+            response.raise_for_status()
+            data = response.json()
 
+            message_ids = [
+                added["message"]["id"]
+                for history in data.get("history", [])
+                for added in history.get("messagesAdded", [])
+                if added.get("message")
+            ]
+            stored = await self._store_messages(client, headers, db, user_id, message_ids)
+            items_synced += stored
+            sync_state.items_synced += stored
+
+            page_token = data.get("nextPageToken")
+            if not page_token:
+                if "historyId" in data:
+                    sync_state.sync_token = data["historyId"]
+                sync_state.last_sync_status = "success"
+                return items_synced
+
+    async def _import_pages(
+        self,
+        client: httpx.AsyncClient,
+        headers: dict,
+        db: AsyncSession,
+        user_id: UUID,
+        sync_state: SyncState,
+        metadata: dict,
+    ) -> int:
+        """Import the inbox, GMAIL_IMPORT_PAGES_PER_RUN pages per call.
+
+        The page token and progress are checkpointed in sync_metadata
+        ("import") and committed with each page's items, so an interrupted
+        import resumes where it stopped. Until it is done, the sync status
+        is "partial". Afterwards history sync continues from the mailbox's
+        history ID at the start of the import, so nothing that arrived
+        meanwhile is missed.
+        """
+        progress = metadata.get("import")
+        if progress is None:
+            response = await client.get(f"{GMAIL_API_BASE}/users/me/profile", headers=headers)
+            response.raise_for_status()
+            progress = {
+                "history_id": response.json()["historyId"],
+                "page_token": None,
+                "pages": 0,
+                "imported": 0,
+                "estimated_total": None,
+                "started_at": datetime.now(timezone.utc).isoformat(),
+            }
+
+        items_synced = 0
+        for _ in range(settings.gmail_import_pages_per_run):
+            params = {"maxResults": settings.gmail_import_page_size, "labelIds": "INBOX"}
+            if progress["page_token"]:
+                params["pageToken"] = progress["page_token"]
+            response = await client.get(
+                f"{GMAIL_API_BASE}/users/me/messages",
+                headers=headers,
+                params=params,
+            )
             response.raise_for_status()
             data = response.json()
 
-            # Process messages
-            messages = data.get("messages", [])
-            if "history" in data:
-                messages = []
-                for history in data.get("history", []):
-                    for msg in history.get("messagesAdded", []):
-                        messages.append(msg.get("message"))
-
-            items_synced = 0
-            for msg in messages:
-                if not msg:
-                    continue
-
-                # Check if already synced
-                existing = await db.execute(
-                    select(Item).where(
-                        and_(
-                            Item.user_id == user_id,
-                            Item.external_id == msg["id"],
-                        )
-                    )
-                )
-                if existing.scalar_one_or_none():
-                    continue
-
-                # Fetch full message
-                msg_response = await client.get(
-                    f"{GMAIL_API_BASE}/users/me/messages/{msg['id']}",
-                    headers=headers,
-                    params={"format": "full"},
-                )
-                msg_response.raise_for_status()
-                msg_data = msg_response.json()
-
-                # Parse message
-                item = await self._parse_message(msg_data, user_id)
-                if item:
-                    db.add(item)
-                    items_synced += 1
-
-            # Update sync state
-            if "historyId" in data:
-                sync_state.sync_token = data["historyId"]
-            sync_state.last_sync_at = datetime.utcnow()
-            sync_state.last_sync_status = "success"
-            sync_state.items_synced += items_synced
-
-            await db.flush()
-            return items_synced
-
-    async def _parse_message(self, msg_data: dict, user_id: UUID) -> Item | None:
-        """Parse Gmail message into Item."""
+            message_ids = [msg["id"] for msg in data.get("messages", [])]
+            stored = await self._store_messages(client, headers, db, user_id, message_ids)
+            items_synced += stored
+            sync_state.items_synced += stored
+
+            if progress["estimated_total"] is None:
+                progress["estimated_total"] = data.get("resultSizeEstimate")
+            progress["pages"] += 1
+            progress["imported"] += stored
+            progress["page_token"] = data.get("nextPageToken")
+
+            if not progress["page_token"]:
+                metadata.pop("import", None)
+                sync_state.sync_metadata = json.dumps(metadata)
+                sync_state.sync_token = progress["history_id"]
+                sync_state.last_sync_status = "success"
+                return items_synced
+
+            metadata["import"] = progress
+            sync_state.sync_metadata = json.dumps(metadata)
+            sync_state.last_sync_status = "partial"
+            await db.commit()
+
+        return items_synced
+
+    async def _store_messages(
+        self,
+        client: httpx.AsyncClient,
+        headers: dict,
+        db: AsyncSession,
+        user_id: UUID,
+        message_ids: list[str],
+    ) -> int:
+        """Fetch and insert the messages of one page that are not synced yet."""
+        # Skip messages that are already synced
+        message_ids = list(dict.fromkeys(message_ids))
+        existing = await item_crud.get_existing_external_ids(
+            db, user_id, Platform.GMAIL, message_ids
+        )
+        new_ids = [message_id for message_id in message_ids if message_id not in existing]
+
+        # Fetch messages, many per request, inserting as they arrive
+        if settings.gmail_lazy_bodies:
+            params = {"format": "metadata", "metadataHeaders": GMAIL_METADATA_HEADERS}
+        else:
+            params = {"format": "full"}
+        items_synced = 0
+        items = []
+        async for msg_data in fetch_messages(
+            client,
+            headers,
+            GMAIL_API_BASE,
+            GMAIL_BATCH_URL,
+            new_ids,
+            params,
+        ):
+            # Parse message
+            item = await self._parse_message(msg_data, user_id, not settings.gmail_lazy_bodies)
+            if item:
+                items.append(item)
+            if len(items) >= settings.gmail_batch_size:
+                items_synced += await item_crud.insert_new(db, items)
+                items = []
+        items_synced += await item_crud.insert_new(db, items)
+        return items_synced
+
+    async def _parse_message(
+        self, msg_data: dict, user_id: UUID, with_body: bool = True
+    ) -> Item | None:
+        """Parse Gmail message into Item.
+
+        Without `with_body` the message was fetched with format=metadata and
+        the item's body is left to be hydrated later.
+        """
         headers = {h["name"].lower(): h["value"] for h in msg_data.get("payload", {}).get("headers", [])}
 
         subject = headers.get("subject", "(No Subject)")
@@ -222,8 +371,8 @@ class GmailIntegration(BaseIntegration):
             except (ValueError, TypeError):
                 pass
 
-        # Extract body
-        body = self._extract_body(msg_data.get("payload", {}))
+        # Extract body, unless only the metadata was fetched
+        body = extract_text(msg_data.get("payload", {})) if with_body else None
         snippet = msg_data.get("snippet", "")
 
         return Item(
@@ -234,28 +383,54 @@ class GmailIntegration(BaseIntegration):
             thread_id=msg_data.get("threadId"),
             subject=subject[:500] if subject else None,
             body=body,
+            body_hydrated=with_body,
             snippet=snippet[:500] if snippet else None,
             sender_name=sender_name[:255] if sender_name else None,
             sender_email=sender_email[:255] if sender_email else None,
             recipients_to=to[:500] if to else None,
             recipients_cc=cc[:500] if cc else None,
+            is_bulk=self._is_bulk(headers),
             received_at=received_at,
         )
 
-    def _extract_body(self, payload: dict) -> str:
-        """Extract body text from Gmail payload."""
-        body = ""
-
-        if "body" in payload and payload["body"].get("data"):
-            body = base64.urlsafe_b64decode(payload["body"]["data"]).decode("utf-8", errors="ignore")
-        elif "parts" in payload:
-            for part in payload["parts"]:
-                if part.get("mimeType") == "text/plain" and part.get("body", {}).get("data"):
-                    body = base64.urlsafe_b64decode(part["body"]["data"]).decode("utf-8", errors="ignore")
-                    break
-                elif part.get("mimeType") == "multipart/alternative":
-                    body = self._extract_body(part)
-                    if body:
-                        break
-
-        return body[:10000] if body else ""
+    async def fetch_bodies(self, message_ids: list[str]) -> dict[str, str]:
+        """Fetch the body text of messages synced with metadata only, by ID.
+
+        Messages that are gone (deleted, or can't be fetched for good) are
+        left out. Raises if Gmail can't be reached or keeps rate limiting.
+        """
+        bodies = {}
+        async with httpx.AsyncClient() as client:
+            headers = {"Authorization": f"Bearer {self.connection.access_token}"}
+            async for msg_data in fetch_messages(
+                client,
+                headers,
+                GMAIL_API_BASE,
+                GMAIL_BATCH_URL,
+                message_ids,
+                {"format": "full"},
+            ):
+                bodies[msg_data["id"]] = extract_text(msg_data.get("payload", {}))
+        return bodies
+
+    def _is_bulk(self, headers: dict) -> bool:
+        """Detect mailing-list and bulk mail from its headers."""
+        if "list-unsubscribe" in headers or "list-id" in headers:
+            return True
+        if headers.get("precedence", "").strip().lower() in ("bulk", "list", "junk"):
+            return True
+        auto_submitted = headers.get("auto-submitted", "").strip().lower()
+        return bool(auto_submitted) and auto_submitted != "no"
+
+
+def decode_push_notification(envelope: dict) -> tuple[str, int]:
+    """Decode a Pub/Sub push request from a Gmail watch.
+
+    Returns the (emailAddress, historyId) of the mailbox change. Raises
+    ValueError if the envelope is not a Gmail notification.
+    """
+    try:
+        notification = json.loads(base64.b64decode(envelope["message"]["data"]))
+        return notification["emailAddress"], int(notification["historyId"])
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Not a Gmail push notification: {e!r}") from e
@@ -0,0 +1,191 @@
+"""Fetch many Gmail messages with few round trips.
+
+Messages are requested through Gmail's multipart batch endpoint,
+GMAIL_BATCH_SIZE per request. The multipart/mixed response is split into
+parts as it streams in, so each message is handed over as soon as its
+part has arrived and at most one part is buffered. A batch of 50 gets
+spends the whole per-user quota for a second, so rate-limited sub-requests
+are expected: they are batched again after an exponential backoff.
+"""
+import asyncio
+import json
+import random
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import aclosing
+from urllib.parse import urlencode, urlsplit
+
+import httpx
+
+from app.config import settings
+
+# Sub-request and request statuses worth retrying after a backoff
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class MultipartReader:
+    """Incrementally splits a multipart body into its parts."""
+
+    def __init__(self, boundary: str):
+        self.delimiter = b"\r\n--" + boundary.encode()
+        # The first delimiter is not preceded by a line break
+        self.buffer = bytearray(b"\r\n")
+        self.scanned = 0
+        self.done = False
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        """Add received bytes; returns the parts they completed."""
+        if self.done:
+            return []
+        self.buffer += chunk
+
+        parts = []
+        while not self.done:
+            start = self.buffer.find(self.delimiter)
+            if start == -1:
+                # Keep enough bytes to match a delimiter split across chunks
+                keep = len(self.delimiter) - 1
+                if len(self.buffer) > keep:
+                    del self.buffer[:-keep]
+                self.scanned = 0
+                break
+            if start > 0:
+                del self.buffer[:start]  # Preamble
+                self.scanned = 0
+
+            body_start = len(self.delimiter)
+            if self.buffer[body_start:body_start + 2] == b"--":
+                self.done = True
+                self.buffer.clear()
+                break
+
+            end = self.buffer.find(self.delimiter, max(body_start, self.scanned))
+            if end == -1:
+                self.scanned = max(body_start, len(self.buffer) - len(self.delimiter) + 1)
+                break
+
+            # Skip transport padding and the line break after the delimiter
+            line_end = self.buffer.find(b"\r\n", body_start, end)
+            parts.append(bytes(self.buffer[line_end + 2:end] if line_end != -1 else b""))
+            del self.buffer[:end]
+            self.scanned = 0
+        return parts
+
+
+def parse_response_part(part: bytes) -> tuple[str | None, int, bytes]:
+    """Split one part of a batch response into (Content-ID, HTTP status, body)."""
+    mime_headers, _, http_response = part.partition(b"\r\n\r\n")
+    content_id = None
+    for line in mime_headers.split(b"\r\n"):
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"content-id":
+            content_id = value.strip().decode().strip("<>").removeprefix("response-")
+
+    head, _, body = http_response.partition(b"\r\n\r\n")
+    status_line = head.split(b"\r\n", 1)[0]  # e.g. HTTP/1.1 200 OK
+    return content_id, int(status_line.split()[1]), body
+
+
+def build_batch_body(paths: dict[str, str], boundary: str) -> bytes:
+    """Multipart batch request with one GET per Content-ID -> path."""
+    lines = []
+    for content_id, path in paths.items():
+        lines += [
+            f"--{boundary}",
+            "Content-Type: application/http",
+            f"Content-ID: <{content_id}>",
+            "",
+            f"GET {path}",
+            "",
+        ]
+    lines.append(f"--{boundary}--")
+    return "\r\n".join(lines).encode()
+
+
+async def _batch_get(
+    client: httpx.AsyncClient,
+    headers: dict,
+    batch_url: str,
+    paths: dict[str, str],
+) -> AsyncIterator[tuple[str | None, int, bytes]]:
+    boundary = f"batch_{uuid.uuid4().hex}"
+    async with client.stream(
+        "POST",
+        batch_url,
+        headers={**headers, "Content-Type": f"multipart/mixed; boundary={boundary}"},
+        content=build_batch_body(paths, boundary),
+    ) as response:
+        response.raise_for_status()
+        content_type = response.headers.get("content-type", "")
+        if "boundary=" not in content_type:
+            raise ValueError(f"Unexpected batch response type: {content_type}")
+        reader = MultipartReader(content_type.split("boundary=", 1)[1].split(";")[0].strip('"'))
+
+        async for chunk in response.aiter_bytes():
+            for part in reader.feed(chunk):
+                yield parse_response_part(part)
+
+
+def _backoff(attempt: int) -> float:
+    """Seconds to wait before retry `attempt` (0-based), with jitter."""
+    return settings.gmail_fetch_backoff_seconds * 2 ** attempt * random.uniform(0.5, 1.0)
+
+
+async def fetch_messages(
+    client: httpx.AsyncClient,
+    headers: dict,
+    api_base: str,
+    batch_url: str,
+    message_ids: list[str],
+    params: dict,
+) -> AsyncIterator[dict]:
+    """Fetch Gmail messages by ID, yielding each message resource as it arrives.
+
+    Order is not preserved. Messages that can't be fetched for good, such
+    as those deleted since they were listed (404), are skipped, so one bad
+    message never fails the rest. Rate-limited (429) and server-failed
+    (5xx) sub-requests, and batch requests, are retried in later batches
+    with exponential backoff, up to GMAIL_FETCH_MAX_RETRIES times. Raises
+    httpx.HTTPStatusError on any other failed batch request, and
+    ValueError once retries run out.
+    """
+    path_prefix = f"{urlsplit(api_base).path}/users/me/messages/"
+    query = urlencode(params, doseq=True)
+    size = settings.gmail_batch_size
+
+    for attempt in range(settings.gmail_fetch_max_retries + 1):
+        if attempt:
+            await asyncio.sleep(_backoff(attempt - 1))
+        failed = []
+        for i in range(0, len(message_ids), size):
+            pending = {f"m{n}": message_id for n, message_id in enumerate(message_ids[i:i + size])}
+            paths = {
+                content_id: f"{path_prefix}{message_id}?{query}"
+                for content_id, message_id in pending.items()
+            }
+            try:
+                async with aclosing(_batch_get(client, headers, batch_url, paths)) as parts:
+                    async for content_id, status, body in parts:
+                        if content_id not in pending:
+                            continue
+                        if status == 200:
+                            del pending[content_id]
+                            yield json.loads(body)
+                        elif status not in RETRY_STATUSES:
+                            # 404: deleted since it was listed
+                            if status != 404:
+                                print(f"Gmail message {pending[content_id]} fetch failed: HTTP {status}")
+                            del pending[content_id]
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code not in RETRY_STATUSES:
+                    raise
+            except httpx.TransportError:
+                pass
+            # Rate limited, failed or missing from the response
+            failed += pending.values()
+
+        if not failed:
+            return
+        message_ids = failed
+
+    raise ValueError(f"{len(message_ids)} Gmail messages still failing after {attempt} retries")
@@ -0,0 +1,127 @@
+"""Extract the readable text of a Gmail message payload.
+
+The payload's MIME tree is walked iteratively, in document order, for the
+first text/plain part, or else the first text/html part; attachments are
+skipped. Only as much of the chosen part is base64-decoded as the budget
+needs: text/plain stops at `max_chars` characters, text/html at
+`max_html_bytes` bytes, after which the HTML is converted to text with a
+handful of regular expressions.
+"""
+import base64
+import codecs
+import html
+import re
+
+MAX_BODY_CHARS = 10000
+MAX_HTML_BYTES = 200_000
+# base64 characters decoded per step; a multiple of 4
+CHUNK_CHARS = 16384
+
+_CHARSET = re.compile(r"""charset\s*=\s*["']?([\w.:-]+)""", re.IGNORECASE)
+_HTML_DROP = re.compile(
+    r"<!--.*?-->|<(script|style|head|title)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL
+)
+_HTML_BREAK = re.compile(r"<(br|/p|/div|/tr|/li|/h[1-6]|/blockquote|/table)\b[^>]*>", re.IGNORECASE)
+_HTML_TAG = re.compile(r"<[^>]*>|<[^>]*$")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def extract_text(
+    payload: dict,
+    max_chars: int = MAX_BODY_CHARS,
+    max_html_bytes: int = MAX_HTML_BYTES,
+) -> str:
+    """Body text of a Gmail payload (format=full), at most `max_chars` long."""
+    part = find_body_part(payload)
+    if part is None:
+        return ""
+
+    charset = _part_charset(part)
+    data = part["body"]["data"]
+    if part.get("mimeType", "").lower() == "text/html":
+        return html_to_text(decode_data(data, charset, max_bytes=max_html_bytes))[:max_chars]
+    return decode_data(data, charset, max_chars=max_chars)
+
+
+def find_body_part(payload: dict) -> dict | None:
+    """The first inline text/plain part with data, else the first text/html one."""
+    html_part = None
+    stack = [payload]
+    while stack:
+        part = stack.pop()
+        children = part.get("parts")
+        if children:
+            # Reversed, so parts are popped in document order
+            stack.extend(reversed(children))
+            continue
+        if not part.get("body", {}).get("data") or _is_attachment(part):
+            continue
+
+        mime_type = part.get("mimeType", "").lower()
+        if mime_type == "text/plain":
+            return part
+        if mime_type == "text/html" and html_part is None:
+            html_part = part
+    return html_part
+
+
+def decode_data(
+    data: str,
+    charset: str = "utf-8",
+    max_chars: int | None = None,
+    max_bytes: int | None = None,
+) -> str:
+    """Decode base64url `data` chunk by chunk, stopping at either budget."""
+    try:
+        decoder = codecs.getincrementaldecoder(charset)(errors="ignore")
+    except LookupError:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+
+    pieces = []
+    chars = decoded_bytes = 0
+    for start in range(0, len(data), CHUNK_CHARS):
+        chunk = data[start:start + CHUNK_CHARS]
+        final = start + CHUNK_CHARS >= len(data)
+        if final:
+            chunk += "=" * (-len(chunk) % 4)
+        raw = base64.urlsafe_b64decode(chunk)
+        if max_bytes is not None and decoded_bytes + len(raw) >= max_bytes:
+            raw = raw[:max_bytes - decoded_bytes]
+            final = True
+        decoded_bytes += len(raw)
+
+        text = decoder.decode(raw, final=final)
+        pieces.append(text)
+        chars += len(text)
+        if max_chars is not None and chars >= max_chars:
+            return "".join(pieces)[:max_chars]
+        if final:
+            break
+    return "".join(pieces)
+
+
+def html_to_text(markup: str) -> str:
+    """Readable text of an HTML document: no markup, scripts or styles."""
+    # Line breaks in the source are just spaces; block ends are line breaks
+    markup = " ".join(_HTML_DROP.sub(" ", markup).split())
+    text = html.unescape(_HTML_TAG.sub(" ", _HTML_BREAK.sub("\n", markup)))
+    text = "\n".join(" ".join(line.split()) for line in text.split("\n"))
+    return _BLANK_LINES.sub("\n\n", text).strip()
+
+
+def _header(part: dict, name: str) -> str:
+    for header in part.get("headers", []):
+        if header.get("name", "").lower() == name:
+            return header.get("value", "")
+    return ""
+
+
+def _part_charset(part: dict) -> str:
+    match = _CHARSET.search(_header(part, "content-type"))
+    return match.group(1) if match else "utf-8"
+
+
+def _is_attachment(part: dict) -> bool:
+    if part.get("filename"):
+        return True
+    return _header(part, "content-disposition").lower().startswith("attachment")
@@ -1,19 +1,24 @@
 from datetime import datetime
 from uuid import UUID
+import hashlib
+import hmac
+import time
 
 import httpx
 from sqlalchemy import select, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
+from app.crud.item import item_crud
 from app.integrations.base import BaseIntegration
-from app.models.connection import Connection, Platform
+from app.models.connection import Connection, ConnectionStatus, Platform
 from app.models.item import Item, ItemType
 from app.models.sync_state import SyncState
 
 SLACK_AUTH_URL = "https://slack.com/oauth/v2/authorize"
 SLACK_TOKEN_URL = "https://slack.com/api/oauth.v2.access"
 SLACK_API_BASE = "https://slack.com/api"
+SIGNATURE_MAX_AGE_SECONDS = 300
 SLACK_SCOPES = [
     "channels:history",
     "channels:read",
@@ -155,21 +160,22 @@ class SlackIntegration(BaseIntegration):
                 if not history_data.get("ok"):
                     continue
 
-                for message in history_data.get("messages", []):
-                    if message.get("subtype"):  # Skip system messages
-                        continue
+                messages = [
+                    message for message in history_data.get("messages", [])
+                    if not message.get("subtype")  # Skip system messages
+                ]
+
+                # Check which are already synced, one query per page
+                existing = await item_crud.get_existing_external_ids(
+                    db,
+                    user_id,
+                    Platform.SLACK,
+                    [f"{channel_id}_{message['ts']}" for message in messages],
+                )
 
-                    # Check if already synced
-                    external_id = f"{channel_id}_{message['ts']}"
-                    existing = await db.execute(
-                        select(Item).where(
-                            and_(
-                                Item.user_id == user_id,
-                                Item.external_id == external_id,
-                            )
-                        )
-                    )
-                    if existing.scalar_one_or_none():
+                items = []
+                for message in messages:
+                    if f"{channel_id}_{message['ts']}" in existing:
                         continue
 
                     # Get user info
@@ -190,27 +196,11 @@ class SlackIntegration(BaseIntegration):
                         user_info = users_cache.get(user_slack_id, {})
                         sender_name = user_info.get("real_name") or user_info.get("name", "Unknown")
 
-                    # Parse timestamp
-                    ts = float(message["ts"])
-                    received_at = datetime.fromtimestamp(ts)
-
-                    item = Item(
-                        user_id=user_id,
-                        platform=Platform.SLACK,
-                        item_type=ItemType.SLACK_DM if is_dm else ItemType.SLACK_MESSAGE,
-                        external_id=external_id,
-                        thread_id=message.get("thread_ts"),
-                        subject=None,
-                        body=message.get("text", "")[:10000],
-                        snippet=message.get("text", "")[:500],
-                        sender_name=sender_name[:255],
-                        sender_id=user_slack_id,
-                        channel_id=channel_id,
-                        channel_name=channel_name[:255] if channel_name else None,
-                        received_at=received_at,
+                    item = build_message_item(
+                        user_id, message, channel_id, channel_name, is_dm, sender_name
                     )
-                    db.add(item)
-                    items_synced += 1
+                    items.append(item)
+                items_synced += await item_crud.insert_new(db, items)
 
         # Update sync state
         sync_state.last_sync_at = datetime.utcnow()
@@ -219,3 +209,140 @@ class SlackIntegration(BaseIntegration):
 
         await db.flush()
         return items_synced
+
+
+def build_message_item(
+    user_id: UUID,
+    message: dict,
+    channel_id: str,
+    channel_name: str | None,
+    is_dm: bool,
+    sender_name: str,
+) -> Item:
+    """Build the inbox item for a Slack message."""
+    # Parse timestamp
+    ts = float(message["ts"])
+    received_at = datetime.fromtimestamp(ts)
+
+    return Item(
+        user_id=user_id,
+        platform=Platform.SLACK,
+        item_type=ItemType.SLACK_DM if is_dm else ItemType.SLACK_MESSAGE,
+        external_id=f"{channel_id}_{message['ts']}",
+        thread_id=message.get("thread_ts"),
+        subject=None,
+        body=message.get("text", "")[:10000],
+        snippet=message.get("text", "")[:500],
+        sender_name=sender_name[:255],
+        sender_id=message.get("user", ""),
+        channel_id=channel_id,
+        channel_name=channel_name[:255] if channel_name else None,
+        received_at=received_at,
+    )
+
+
+async def ingest_message_event(db: AsyncSession, payload: dict) -> int:
+    """Store the message of an Events API callback as an item.
+
+    The item is created for every connected user the event names as able
+    to see it (see event_recipients), unless they already have it; other
+    channel members get it from polling. Returns the number of new items.
+    """
+    event = payload.get("event") or {}
+    if event.get("type") != "message" or event.get("subtype"):  # Skip system messages
+        return 0
+    if "ts" not in event or "channel" not in event:
+        return 0
+
+    channel_id = event["channel"]
+    slack_user_ids = await event_recipients(payload)
+    if not slack_user_ids:
+        return 0
+
+    result = await db.execute(
+        select(Connection.user_id)
+        .where(
+            and_(
+                Connection.platform == Platform.SLACK,
+                Connection.status == ConnectionStatus.ACTIVE,
+                Connection.external_user_id.in_(slack_user_ids),
+            )
+        )
+        .distinct()
+    )
+    user_ids = [row[0] for row in result.all()]
+
+    is_dm = event.get("channel_type") == "im"
+    profile = event.get("user_profile") or {}
+    sender_name = profile.get("real_name") or profile.get("name") or "Unknown"
+
+    items = []
+    for user_id in user_ids:
+        # Events only carry the channel ID; reuse the name a sync stored
+        channel_name = "Direct Message"
+        if not is_dm:
+            known = await db.execute(
+                select(Item.channel_name)
+                .where(and_(Item.user_id == user_id, Item.channel_id == channel_id))
+                .limit(1)
+            )
+            channel_name = known.scalar_one_or_none()
+
+        items.append(build_message_item(user_id, event, channel_id, channel_name, is_dm, sender_name))
+
+    # Users that already have the message are skipped by the insert
+    return await item_crud.insert_new(db, items)
+
+
+async def event_recipients(payload: dict) -> set[str]:
+    """Slack user IDs of the installations an Events API callback is visible to.
+
+    The payload names only one authorization. With SLACK_APP_TOKEN the
+    rest are listed through apps.event.authorizations.list; without it,
+    only the named ones are returned.
+    """
+    slack_user_ids = {
+        authorization.get("user_id") for authorization in payload.get("authorizations", [])
+    } | set(payload.get("authed_users", []))
+
+    if settings.slack_app_token and payload.get("event_context"):
+        params = {"event_context": payload["event_context"], "limit": 100}
+        async with httpx.AsyncClient() as client:
+            while True:
+                response = await client.post(
+                    f"{SLACK_API_BASE}/apps.event.authorizations.list",
+                    headers={"Authorization": f"Bearer {settings.slack_app_token}"},
+                    data=params,
+                )
+                response.raise_for_status()
+                data = response.json()
+                if not data.get("ok"):
+                    print(f"Slack event authorizations error: {data.get('error')}")
+                    break
+
+                slack_user_ids |= {
+                    authorization.get("user_id") for authorization in data.get("authorizations", [])
+                }
+                params["cursor"] = data.get("response_metadata", {}).get("next_cursor")
+                if not params["cursor"]:
+                    break
+
+    slack_user_ids.discard(None)
+    return slack_user_ids
+
+
+def verify_signature(body: bytes, timestamp: str, signature: str) -> bool:
+    """Check the X-Slack-Signature of a request against SLACK_SIGNING_SECRET.
+
+    Requests older than five minutes are rejected to prevent replays.
+    """
+    if not settings.slack_signing_secret or not timestamp.isdigit():
+        return False
+    if abs(time.time() - int(timestamp)) > SIGNATURE_MAX_AGE_SECONDS:
+        return False
+
+    base = b"v0:" + timestamp.encode() + b":" + body
+    expected = "v0=" + hmac.new(
+        settings.slack_signing_secret.encode(), base, hashlib.sha256
+    ).hexdigest()
+    return hmac.compare_digest(expected, signature)
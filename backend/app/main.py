@@ -38,6 +38,17 @@ async def health_check():
     return {"status": "healthy", "version": "0.1.0"}
 
 
+@app.get("/health/llm-cache")
+async def llm_cache_stats():
+    """LLM result cache hit/miss counters."""
+    from app.ai.cache import llm_cache
+
+    return {
+        "process": {**llm_cache.stats, "memory_entries": len(llm_cache.local)},
+        "global": await llm_cache.get_global_stats(),
+    }
+
+
 # Import and include API router
 from app.api.v1.router import api_router
 
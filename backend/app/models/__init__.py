@@ -3,6 +3,7 @@ from app.models.connection import Connection
 from app.models.deadline import Deadline
 from app.models.item import Item
 from app.models.reminder import Reminder
+from app.models.sender_profile import SenderProfile
 from app.models.sync_state import SyncState
 from app.models.task import Task
 from app.models.user import User
@@ -16,4 +17,5 @@ __all__ = [
     "Reminder",
     "Briefing",
     "SyncState",
+    "SenderProfile",
 ]
@@ -3,7 +3,7 @@ from typing import TYPE_CHECKING
 import uuid
 import enum
 
-from sqlalchemy import Date, DateTime, Enum, ForeignKey, Text, func
+from sqlalchemy import Date, DateTime, Enum, ForeignKey, String, Text, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -44,6 +44,9 @@ class Briefing(Base):
 
     # Snapshot of data used to generate briefing (JSON)
     data_snapshot: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Hash of the snapshot, and of each of its sections (JSON), for reuse
+    input_fingerprint: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    section_fingerprints: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     generated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
@@ -3,7 +3,7 @@ from typing import TYPE_CHECKING
 import uuid
 import enum
 
-from sqlalchemy import Boolean, DateTime, Enum, Float, ForeignKey, Integer, String, Text, func
+from sqlalchemy import Boolean, DateTime, Enum, Float, ForeignKey, Integer, String, Text, UniqueConstraint, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -49,10 +49,16 @@ class Category(str, enum.Enum):
     OTHER = "other"
 
 
+ITEM_EXTERNAL_ID_CONSTRAINT = "uq_items_user_platform_external_id"
+
+
 class Item(Base):
     """Unified inbox item from any platform."""
 
     __tablename__ = "items"
+    __table_args__ = (
+        UniqueConstraint("user_id", "platform", "external_id", name=ITEM_EXTERNAL_ID_CONSTRAINT),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -71,6 +77,8 @@ class Item(Base):
     subject: Mapped[str | None] = mapped_column(String(500), nullable=True)
     body: Mapped[str | None] = mapped_column(Text, nullable=True)
     snippet: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    # False while only the headers and snippet are synced (see GMAIL_LAZY_BODIES)
+    body_hydrated: Mapped[bool] = mapped_column(Boolean, default=True)
 
     # Sender info
     sender_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
@@ -81,8 +89,11 @@ class Item(Base):
     recipients_to: Mapped[str | None] = mapped_column(Text, nullable=True)  # JSON array
     recipients_cc: Mapped[str | None] = mapped_column(Text, nullable=True)  # JSON array
 
+    # Mailing-list/bulk mail (List-Unsubscribe, Precedence: bulk, ...)
+    is_bulk: Mapped[bool] = mapped_column(Boolean, default=False)
+
     # Slack-specific
-    channel_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    channel_id: Mapped[str | None] = mapped_column(String(255), nullable=True, index=True)
     channel_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
 
     # Calendar-specific
@@ -103,6 +114,12 @@ class Item(Base):
     ai_processed_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True), nullable=True
     )
+    # Pending provider batch job (see app.services.ai_pipeline.submit_backfill)
+    ai_batch_id: Mapped[str | None] = mapped_column(String(255), nullable=True, index=True)
+    # Claimed by a real-time processing run (see app.workers.process_tasks)
+    ai_claimed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
 
     # Status
     is_read: Mapped[bool] = mapped_column(Boolean, default=False, index=True)
@@ -0,0 +1,52 @@
+from datetime import datetime
+import uuid
+
+from sqlalchemy import DateTime, Enum, ForeignKey, Integer, String, Text, UniqueConstraint, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+from app.models.item import ActionType, Category
+
+
+class SenderProfile(Base):
+    """Learned per-user classification memo for a sender.
+
+    Counts of the labels the AI pipeline assigned to this sender's items,
+    used to skip LLM classification for senders whose labels never change.
+    """
+
+    __tablename__ = "sender_profiles"
+    __table_args__ = (UniqueConstraint("user_id", "sender_key"),)
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), index=True
+    )
+
+    # "<platform>:<sender email or id>", lowercased
+    sender_key: Mapped[str] = mapped_column(String(255))
+
+    # Label counts (JSON objects of label -> count)
+    category_counts: Mapped[str | None] = mapped_column(Text, nullable=True)
+    action_counts: Mapped[str | None] = mapped_column(Text, nullable=True)
+    priority_band_counts: Mapped[str | None] = mapped_column(Text, nullable=True)
+    priority_total: Mapped[int] = mapped_column(Integer, default=0)
+    sample_count: Mapped[int] = mapped_column(Integer, default=0)
+
+    # Set when the user corrects a classification; always wins over counts
+    override_category: Mapped[Category | None] = mapped_column(
+        Enum(Category), nullable=True
+    )
+    override_action_type: Mapped[ActionType | None] = mapped_column(
+        Enum(ActionType), nullable=True
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import TYPE_CHECKING
 import uuid
 
-from sqlalchemy import DateTime, ForeignKey, String, Text, func
+from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -41,6 +41,16 @@ class SyncState(Base):
 
     items_synced: Mapped[int] = mapped_column(default=0)
 
+    # Adaptive polling (see app.services.sync_schedule)
+    next_sync_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True, index=True
+    )
+    sync_interval_seconds: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    idle_streak: Mapped[int] = mapped_column(Integer, default=0)  # Syncs in a row with no new items
+    last_activity_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
@@ -2,8 +2,8 @@ from app.schemas.user import UserCreate, UserRead, UserUpdate
 from app.schemas.item import ItemCreate, ItemRead, ItemUpdate, ItemFilter
 from app.schemas.deadline import DeadlineCreate, DeadlineRead, DeadlineUpdate
 from app.schemas.task import TaskCreate, TaskRead, TaskUpdate
-from app.schemas.briefing import BriefingRead
-from app.schemas.connection import ConnectionRead, ConnectionCreate
+from app.schemas.briefing import BriefingRead, BriefingSnapshot
+from app.schemas.connection import ConnectionRead, ConnectionCreate, SyncStatusRead
 
 __all__ = [
     "UserCreate",
@@ -20,6 +20,8 @@ __all__ = [
     "TaskRead",
     "TaskUpdate",
     "BriefingRead",
+    "BriefingSnapshot",
     "ConnectionRead",
     "ConnectionCreate",
+    "SyncStatusRead",
 ]
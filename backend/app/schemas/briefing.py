@@ -4,6 +4,8 @@ from uuid import UUID
 from pydantic import BaseModel, ConfigDict
 
 from app.models.briefing import BriefingType
+from app.models.connection import Platform
+from app.models.task import TaskStatus
 
 
 class BriefingRead(BaseModel):
@@ -23,3 +25,60 @@ class BriefingRequest(BaseModel):
     """Schema for requesting a briefing."""
 
     briefing_type: BriefingType = BriefingType.ON_DEMAND
+
+
+class SnapshotItem(BaseModel):
+    """Unread item as seen by a briefing."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    platform: Platform
+    sender_name: str | None = None
+    sender_email: str | None = None
+    subject: str | None = None
+    snippet: str | None = None
+    ai_summary: str | None = None
+    priority_score: int
+
+
+class SnapshotDeadline(BaseModel):
+    """Pending deadline as seen by a briefing."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    title: str
+    due_at: datetime
+
+
+class SnapshotEvent(BaseModel):
+    """Calendar event as seen by a briefing."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    subject: str | None = None
+    event_start: datetime | None = None
+
+
+class SnapshotTask(BaseModel):
+    """Open task as seen by a briefing."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    title: str
+    status: TaskStatus
+    due_at: datetime | None = None
+
+
+class BriefingSnapshot(BaseModel):
+    """Data a briefing was generated from, stored in Briefing.data_snapshot."""
+
+    briefing_date: date
+    timezone: str = "UTC"
+    unread_items: list[SnapshotItem] = []
+    deadlines: list[SnapshotDeadline] = []
+    events: list[SnapshotEvent] = []
+    tasks: list[SnapshotTask] = []
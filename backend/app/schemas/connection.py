@@ -35,6 +35,27 @@ class ConnectionRead(ConnectionBase):
     updated_at: datetime
 
 
+class ImportProgress(BaseModel):
+    """Progress of an initial mailbox import."""
+
+    pages: int
+    imported: int
+    estimated_total: int | None = None
+    started_at: datetime
+
+
+class SyncStatusRead(BaseModel):
+    """Sync status of a connection."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    last_sync_at: datetime | None = None
+    last_sync_status: str | None = None
+    next_sync_at: datetime | None = None
+    items_synced: int = 0
+    import_progress: ImportProgress | None = None
+
+
 class OAuthCallbackData(BaseModel):
     """OAuth callback data."""
 
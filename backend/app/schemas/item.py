@@ -27,6 +27,7 @@ class ItemCreate(ItemBase):
     sender_id: str | None = None
     recipients_to: str | None = None
     recipients_cc: str | None = None
+    is_bulk: bool = False
     channel_id: str | None = None
     channel_name: str | None = None
     event_start: datetime | None = None
@@ -44,6 +45,10 @@ class ItemUpdate(BaseModel):
     is_snoozed: bool | None = None
     snoozed_until: datetime | None = None
 
+    # User corrections to the AI classification
+    category: Category | None = None
+    action_type: ActionType | None = None
+
 
 class ItemRead(ItemBase):
     """Schema for reading an item."""
@@ -57,6 +62,7 @@ class ItemRead(ItemBase):
     external_id: str
     thread_id: str | None
     snippet: str | None
+    body_hydrated: bool
 
     sender_name: str | None
     sender_email: str | None
@@ -64,6 +70,7 @@ class ItemRead(ItemBase):
 
     recipients_to: str | None
     recipients_cc: str | None
+    is_bulk: bool
 
     channel_id: str | None
     channel_name: str | None
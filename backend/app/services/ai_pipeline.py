@@ -1,6 +1,10 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
 from datetime import datetime
-from uuid import UUID
+from typing import Any
 
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.ai.summarizer import summarize_item
@@ -8,19 +12,70 @@ from app.ai.deadline_extractor import extract_deadlines
 from app.ai.action_classifier import classify_action
 from app.ai.priority_scorer import score_priority
 from app.ai.categorizer import categorize_item
+from app.ai.batch import BaseBatchProvider, BatchRequest, BatchStatus
+from app.ai.heuristics import pre_classify
+from app.ai.item_analyzer import ItemAnalysis, analyze_item, build_analyzer_inputs, parse_analysis
+from app.ai.packing import PACKED_FIELDS, analyze_packed, is_packable
+from app.ai.prompts import ITEM_ANALYZER_PROMPT
+from app.ai.provider import batch_api_available, get_batch_provider
+from app.ai.sender_memo import memo_action_type, memo_category, memo_priority, sender_key
+from app.config import settings
 from app.crud.deadline import deadline_crud
+from app.crud.sender_profile import sender_profile_crud
 from app.models.item import Item
+from app.models.sender_profile import SenderProfile
+from app.services.item_bodies import hydrate_bodies
+
+
+@dataclass(frozen=True)
+class Stage:
+    """A node in the per-item AI stage graph.
+
+    Each stage produces one ItemAnalysis field and may depend on fields
+    produced by other stages.
+    """
+
+    field: str
+    run: Callable[[Item, ItemAnalysis], Awaitable[Any]]
+    depends_on: tuple[str, ...] = ()
+
+
+async def _classify(item: Item, analysis: ItemAnalysis) -> Any:
+    _, action_type = await classify_action(item)
+    return action_type
+
+
+async def _score(item: Item, analysis: ItemAnalysis) -> Any:
+    # score_priority reads the action classification from the item
+    if analysis.action_type is not None:
+        item.action_required = analysis.action_required
+        item.action_type = analysis.action_type
+    return await score_priority(item)
+
+
+STAGES: tuple[Stage, ...] = (
+    Stage("summary", lambda item, analysis: summarize_item(item)),
+    Stage("deadlines", lambda item, analysis: extract_deadlines(item)),
+    Stage("action_type", _classify),
+    Stage("category", lambda item, analysis: categorize_item(item)),
+    Stage("priority_score", _score, depends_on=("action_type",)),
+)
 
 
 async def process_item(db: AsyncSession, item: Item) -> Item:
     """Run the full AI processing pipeline on an item.
 
-    Pipeline steps:
-    1. Summarize the item
-    2. Extract deadlines
-    3. Classify action required
-    4. Score priority
-    5. Categorize
+    In "fused" mode a single LLM call produces every field and the stage
+    graph only runs for fields the fused response left out. In "staged"
+    mode the whole graph runs: summarize, deadlines, classify and
+    categorize concurrently, followed by priority scoring.
+
+    Stages that fail or time out leave their field at its default; the
+    results of the other stages are still persisted and the confidence is
+    lowered accordingly.
+
+    Fields are first taken from the sender memo and then from the local
+    heuristic rules whenever they are confident, skipping those LLM calls.
 
     Returns the updated item.
     """
@@ -28,45 +83,309 @@ async def process_item(db: AsyncSession, item: Item) -> Item:
     if item.ai_processed_at:
         return item
 
-    try:
-        # Step 1: Summarize
-        item.ai_summary = await summarize_item(item)
+    await hydrate_for_analysis(db, [item])
+    profiles = await _get_profiles(db, [item])
+    analysis = await _analyze(item, _initial_analysis(item, profiles))
+    await _learn(db, [(item, await _save_analysis(db, item, analysis))])
+    return item
+
+
+async def hydrate_for_analysis(db: AsyncSession, items: list[Item]) -> None:
+    """Fetch the bodies the analysis needs.
+
+    Bulk mail is analyzed from its snippet, so lazily synced newsletters
+    and notifications never have their bodies downloaded for the AI.
+    """
+    await hydrate_bodies(db, [item for item in items if not item.is_bulk])
+
 
-        # Step 2: Extract deadlines
-        deadline_creates = await extract_deadlines(item)
-        for deadline_create in deadline_creates:
-            await deadline_crud.create(db, item.user_id, deadline_create)
+async def _get_profiles(
+    db: AsyncSession, items: list[Item]
+) -> dict[tuple, SenderProfile]:
+    if not settings.sender_memo_enabled:
+        return {}
+    return await sender_profile_crud.get_for_items(db, items)
 
-        # Step 3: Classify action
-        item.action_required, item.action_type = await classify_action(item)
 
-        # Step 4: Score priority
-        item.priority_score = await score_priority(item)
+def _initial_analysis(item: Item, profiles: dict[tuple, SenderProfile]) -> ItemAnalysis:
+    """Start an analysis with what the memo and local rules are confident about."""
+    analysis = _memo_analysis(item, profiles)
+    if settings.ai_heuristics_enabled:
+        analysis.merge(pre_classify(item))
+    return analysis
 
-        # Step 5: Categorize
-        item.category = await categorize_item(item)
 
-        # Mark as processed
-        item.ai_processed_at = datetime.utcnow()
-        item.ai_confidence = 0.85  # Default confidence
+def _memo_analysis(item: Item, profiles: dict[tuple, SenderProfile]) -> ItemAnalysis:
+    """Start an analysis with whatever the sender memo is confident about."""
+    analysis = ItemAnalysis()
+    profile = profiles.get((item.user_id, sender_key(item)))
+    if profile is None:
+        return analysis
 
+    analysis.category = memo_category(profile)
+    analysis.action_type = memo_action_type(profile)
+    analysis.priority_score = memo_priority(profile)
+    analysis.prefilled = {
+        name
+        for name in ("category", "action_type", "priority_score")
+        if getattr(analysis, name) is not None
+    }
+    return analysis
+
+
+async def _analyze(item: Item, analysis: ItemAnalysis) -> ItemAnalysis | None:
+    """Run the LLM side of the pipeline. Touches no database state.
+
+    Returns None if the pipeline failed outright.
+    """
+    try:
+        # A single missing field is cheaper to fill with its own stage
+        if settings.ai_pipeline_mode == "fused" and len(analysis.missing_fields()) > 1:
+            try:
+                analysis.merge(await analyze_item(item))
+            except Exception as e:
+                print(f"Fused AI analysis failed for item {item.id}, falling back to stages: {e}")
+
+        await run_stage_graph(item, analysis)
+        return analysis
     except Exception as e:
         # Log error but don't fail
         print(f"AI processing error for item {item.id}: {e}")
-        item.ai_processed_at = datetime.utcnow()
+        return None
+
+
+async def _save_analysis(
+    db: AsyncSession, item: Item, analysis: ItemAnalysis | None
+) -> dict | None:
+    """Persist analysis results and mark the item as processed.
+
+    Returns the LLM-produced labels the sender memo should learn, if any.
+    """
+    item.ai_processed_at = datetime.utcnow()
+    learned = None
+    if analysis is None:
         item.ai_confidence = 0.0
+    else:
+        await _apply_analysis(db, item, analysis)
+        produced = len(STAGES) - len(analysis.missing_fields())
+        item.ai_confidence = round(0.85 * produced / len(STAGES), 2)
+
+        # Only LLM results teach the memo; memo hits would just reinforce it
+        if settings.sender_memo_enabled:
+            learned = {
+                name: None if name in analysis.prefilled else getattr(analysis, name)
+                for name in ("category", "action_type", "priority_score")
+            }
 
     await db.flush()
-    return item
+    return learned
+
+
+async def _learn(db: AsyncSession, samples: list[tuple[Item, dict | None]]) -> None:
+    """Count learned labels towards sender profiles.
+
+    Profiles are updated in sender order, so concurrent batches sharing
+    senders lock their rows in the same order and can't deadlock.
+    """
+    samples = [(item, learned) for item, learned in samples if learned]
+    samples.sort(key=lambda sample: (str(sample[0].user_id), sender_key(sample[0]) or ""))
+    for item, learned in samples:
+        await sender_profile_crud.record(db, item, **learned)
+
+
+async def run_stage_graph(item: Item, analysis: ItemAnalysis) -> list[str]:
+    """Fill missing analysis fields by running the stage graph.
+
+    Every missing stage is started at once; a stage with dependencies waits
+    only for those stages to finish (successfully or not). Returns the
+    fields whose stage failed or timed out.
+    """
+    tasks: dict[str, asyncio.Task] = {}
+    failed: list[str] = []
+
+    async def run(stage: Stage) -> None:
+        deps = [tasks[dep] for dep in stage.depends_on if dep in tasks]
+        if deps:
+            await asyncio.gather(*deps)
+        try:
+            result = await stage.run(item, analysis)
+        except Exception as e:
+            print(f"AI stage {stage.field} failed for item {item.id}: {e!r}")
+            failed.append(stage.field)
+            return
+        setattr(analysis, stage.field, result)
+
+    for stage in STAGES:
+        if getattr(analysis, stage.field) is None:
+            tasks[stage.field] = asyncio.ensure_future(run(stage))
+
+    await asyncio.gather(*tasks.values())
+    return failed
+
+
+async def _apply_analysis(db: AsyncSession, item: Item, analysis: ItemAnalysis) -> None:
+    """Write the produced analysis fields onto the item and persist deadlines."""
+    if analysis.summary is not None:
+        item.ai_summary = analysis.summary
+    if analysis.action_type is not None:
+        item.action_required = analysis.action_required
+        item.action_type = analysis.action_type
+    if analysis.priority_score is not None:
+        item.priority_score = analysis.priority_score
+    if analysis.category is not None:
+        item.category = analysis.category
+
+    for deadline_create in analysis.deadlines or []:
+        await deadline_crud.create(db, item.user_id, deadline_create)
 
 
 async def process_items_batch(
     db: AsyncSession,
     items: list[Item],
+    concurrency: int | None = None,
 ) -> list[Item]:
-    """Process multiple items through the AI pipeline."""
-    processed = []
+    """Process multiple items through the AI pipeline concurrently.
+
+    Up to `concurrency` items (default: AI_BATCH_CONCURRENCY) are analyzed
+    at once. All results are written once every analysis has finished, so
+    the items' rows are only locked for the write-back, not while the LLM
+    calls run.
+
+    Short Slack and calendar items are first analyzed AI_PACK_SIZE at a time
+    in a single packed request.
+    """
+    semaphore = asyncio.Semaphore(concurrency or settings.ai_batch_concurrency)
+    pending = [item for item in items if not item.ai_processed_at]
+    await hydrate_for_analysis(db, pending)
+    profiles = await _get_profiles(db, pending)
+    analyses = {item.id: _initial_analysis(item, profiles) for item in pending}
+    await _analyze_packed(pending, analyses, semaphore)
+
+    async def run(item: Item) -> ItemAnalysis | None:
+        async with semaphore:
+            return await _analyze(item, analyses[item.id])
+
+    results = await asyncio.gather(*(run(item) for item in pending))
+    samples = [
+        (item, await _save_analysis(db, item, analysis))
+        for item, analysis in zip(pending, results)
+    ]
+    await _learn(db, samples)
+    return items
+
+
+async def _analyze_packed(
+    items: list[Item],
+    analyses: dict,
+    semaphore: asyncio.Semaphore,
+) -> None:
+    """Fill analyses of short items with packed requests of AI_PACK_SIZE items.
+
+    Fields a packed response leaves out are filled per item afterwards.
+    """
+    if settings.ai_pack_size < 2:
+        return
+
+    fields = PACKED_FIELDS[settings.ai_pipeline_mode]
+    pending = [
+        item
+        for item in items
+        if item.id in analyses
+        and is_packable(item)
+        and any(getattr(analyses[item.id], name) is None for name in fields)
+    ]
+    chunks = [
+        pending[i:i + settings.ai_pack_size]
+        for i in range(0, len(pending), settings.ai_pack_size)
+    ]
+
+    async def run(chunk: list[Item]) -> None:
+        # A lone item gains nothing from the packed prompt
+        if len(chunk) < 2:
+            return
+        async with semaphore:
+            try:
+                results = await analyze_packed(chunk, settings.ai_pipeline_mode)
+            except Exception as e:
+                print(f"Packed AI analysis of {len(chunk)} items failed: {e}")
+                return
+        for item, result in zip(chunk, results):
+            analyses[item.id].merge(result)
+
+    await asyncio.gather(*(run(chunk) for chunk in chunks))
+
+
+def adaptive_batch_size(backlog: int) -> int:
+    """Pick a batch size that grows with the depth of the unprocessed backlog."""
+    size = max(settings.ai_batch_min_size, backlog // 4)
+    return min(backlog, size, settings.ai_batch_max_size)
+
+
+async def submit_backfill(
+    db: AsyncSession, items: list[Item], provider: BaseBatchProvider | None = None
+) -> str:
+    """Submit items for analysis through the provider's batch API.
+
+    Items are tagged with the batch ID so the real-time pipeline leaves
+    them alone until apply_backfill() collects the results. `provider`
+    defaults to the configured one. Returns the batch ID.
+    """
+    provider = provider or get_batch_provider()
+    await hydrate_for_analysis(db, items)
+    requests = [
+        BatchRequest(
+            custom_id=str(item.id),
+            messages=ITEM_ANALYZER_PROMPT.format_messages(**build_analyzer_inputs(item)),
+        )
+        for item in items
+    ]
+    batch_id = await provider.submit(requests)
+
     for item in items:
-        processed_item = await process_item(db, item)
-        processed.append(processed_item)
-    return processed
+        item.ai_batch_id = batch_id
+    await db.flush()
+    return batch_id
+
+
+async def apply_backfill(
+    db: AsyncSession, batch_id: str, provider: BaseBatchProvider | None = None
+) -> dict | None:
+    """Persist the results of a finished backfill batch.
+
+    Complete analyses are saved like real-time ones. Items whose result is
+    missing or incomplete are released back to the real-time pipeline, as
+    are all items of a batch that no configured batch API can collect.
+    Returns None while the batch is still running.
+    """
+    if provider is None and not batch_api_available():
+        status = BatchStatus.FAILED
+    else:
+        provider = provider or get_batch_provider()
+        status = await provider.get_status(batch_id)
+    if status == BatchStatus.IN_PROGRESS:
+        return None
+
+    results = await provider.get_results(batch_id) if status == BatchStatus.ENDED else {}
+
+    result = await db.execute(select(Item).where(Item.ai_batch_id == batch_id))
+    items = list(result.scalars().all())
+    profiles = await _get_profiles(db, items)
+
+    applied = 0
+    samples = []
+    for item in items:
+        item.ai_batch_id = None
+        if item.ai_processed_at or str(item.id) not in results:
+            continue
+
+        analysis = _initial_analysis(item, profiles)
+        analysis.merge(parse_analysis(results[str(item.id)], item))
+        if analysis.missing_fields():
+            continue
+
+        samples.append((item, await _save_analysis(db, item, analysis)))
+        applied += 1
+
+    await _learn(db, samples)
+    await db.flush()
+    return {"applied": applied, "released": len(items) - applied}
@@ -0,0 +1,64 @@
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from uuid import UUID
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.user import User
+
+
+def get_zone(name: str | None) -> ZoneInfo:
+    """Resolve a user's timezone name, falling back to UTC if it is unknown."""
+    try:
+        return ZoneInfo(name or "UTC")
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo("UTC")
+
+
+async def get_user_zone(db: AsyncSession, user_id: UUID) -> ZoneInfo:
+    """A user's timezone (UTC if the user or their timezone is unknown)."""
+    result = await db.execute(select(User.timezone).where(User.id == user_id))
+    return get_zone(result.scalar_one_or_none())
+
+
+def local_today(zone: ZoneInfo) -> date:
+    """The current date in a timezone."""
+    return datetime.now(timezone.utc).astimezone(zone).date()
+
+
+def local_day_bounds(zone: ZoneInfo, day: date) -> tuple[datetime, datetime]:
+    """Start and end (exclusive) of a local date, as UTC-aware datetimes."""
+    start = datetime.combine(day, time.min, tzinfo=zone)
+    end = datetime.combine(day + timedelta(days=1), time.min, tzinfo=zone)
+    return start.astimezone(timezone.utc), end.astimezone(timezone.utc)
+
+
+def generation_time(zone: ZoneInfo, briefing_date: date) -> datetime:
+    """When the morning briefing for a local date should be generated (UTC-aware)."""
+    local_target = datetime.combine(
+        briefing_date, time(hour=settings.briefing_local_hour), tzinfo=zone
+    )
+    return local_target - timedelta(minutes=settings.briefing_lead_minutes)
+
+
+def due_briefing_dates(timezones: list[str], until: datetime) -> dict[date, list[str]]:
+    """Group the timezones whose current local briefing is due before `until`.
+
+    A timezone is due for its local date from that date's generation time
+    on, so a scheduler run that comes late still catches every timezone it
+    skipped. Returns the timezones keyed by the local briefing date they
+    are due for.
+    """
+    due: dict[date, list[str]] = defaultdict(list)
+    for name in timezones:
+        zone = get_zone(name)
+        local_today = until.astimezone(zone).date()
+        # The lead time can make tomorrow's local briefing due today
+        for briefing_date in (local_today + timedelta(days=1), local_today):
+            if generation_time(zone, briefing_date) < until:
+                due[briefing_date].append(name)
+                break
+    return dict(due)
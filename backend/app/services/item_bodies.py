@@ -0,0 +1,55 @@
+from sqlalchemy import select, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.integrations.gmail import GmailIntegration
+from app.models.connection import Connection, ConnectionStatus, Platform
+from app.models.item import Item
+
+
+async def hydrate_bodies(db: AsyncSession, items: list[Item]) -> int:
+    """Fetch the bodies of items that were synced without one.
+
+    Bodies are fetched through each user's Gmail connection, batched per
+    user. Messages gone from Gmail are marked hydrated without a body, so
+    readers fall back to the snippet and they aren't fetched again. If
+    Gmail can't be reached, the user's items stay unhydrated and are
+    retried on the next call. Returns the number of items hydrated.
+    """
+    pending: dict = {}
+    for item in items:
+        if not item.body_hydrated and item.platform == Platform.GMAIL:
+            pending.setdefault(item.user_id, []).append(item)
+    if not pending:
+        return 0
+
+    result = await db.execute(
+        select(Connection).where(
+            and_(
+                Connection.user_id.in_(pending),
+                Connection.platform == Platform.GMAIL,
+                Connection.status == ConnectionStatus.ACTIVE,
+            )
+        )
+    )
+
+    hydrated = 0
+    for connection in result.scalars().all():
+        integration = GmailIntegration(connection)
+        if not await integration.ensure_fresh_tokens():
+            continue
+        user_items = pending[connection.user_id]
+        try:
+            bodies = await integration.fetch_bodies(
+                list(dict.fromkeys(item.external_id for item in user_items))
+            )
+        except Exception as e:
+            print(f"Body hydration failed for connection {connection.id}: {e}")
+            continue
+
+        for item in user_items:
+            item.body = bodies.get(item.external_id)
+            item.body_hydrated = True
+            hydrated += 1
+
+    await db.flush()
+    return hydrated
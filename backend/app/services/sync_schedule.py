@@ -0,0 +1,134 @@
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+import json
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.connection import Platform
+from app.models.sync_state import SyncState
+
+# Cap on the backoff exponent, well past any sane max/base interval ratio
+MAX_IDLE_STREAK = 16
+
+
+def watch_expires_at(sync_state: SyncState | None) -> datetime | None:
+    """When a Gmail connection's push notification watch expires, if it has one."""
+    if not sync_state or not sync_state.sync_metadata:
+        return None
+    expiration = json.loads(sync_state.sync_metadata).get("watch_expiration")
+    if not expiration:
+        return None
+    return datetime.fromtimestamp(expiration / 1000, tz=timezone.utc)
+
+
+def push_enabled(platform: Platform, sync_state: SyncState | None = None) -> bool:
+    """Whether a connection is notified of changes by push.
+
+    A Gmail connection only is while its watch is live.
+    """
+    if platform == Platform.GMAIL:
+        expires_at = watch_expires_at(sync_state)
+        return (
+            bool(settings.gmail_pubsub_topic)
+            and expires_at is not None
+            and expires_at > datetime.now(timezone.utc)
+        )
+    if platform == Platform.SLACK:
+        # Without the app token, events may miss users sharing a channel
+        return settings.slack_events_enabled and bool(settings.slack_app_token)
+    return False
+
+
+def base_interval(platform: Platform, sync_state: SyncState | None = None) -> int:
+    """Polling interval (seconds) of a connection while it is active.
+
+    With push notifications, polling only reconciles missed notifications.
+    """
+    if push_enabled(platform, sync_state):
+        return settings.sync_push_interval_seconds
+    return {
+        Platform.GMAIL: settings.sync_gmail_interval_seconds,
+        Platform.SLACK: settings.sync_slack_interval_seconds,
+        Platform.CALENDAR: settings.sync_calendar_interval_seconds,
+    }[platform]
+
+
+def next_interval(
+    platform: Platform, idle_streak: int, sync_state: SyncState | None = None
+) -> int:
+    """Polling interval after `idle_streak` syncs in a row found nothing new.
+
+    Stays at the base interval for SYNC_IDLE_GRACE_SYNCS idle syncs, then
+    doubles with every further one, up to SYNC_MAX_INTERVAL_SECONDS.
+    """
+    base = base_interval(platform, sync_state)
+    backoff = min(max(idle_streak - settings.sync_idle_grace_syncs, 0), MAX_IDLE_STREAK)
+    return max(base, min(base * 2 ** backoff, settings.sync_max_interval_seconds))
+
+
+async def get_sync_state(db: AsyncSession, connection_id: UUID) -> SyncState:
+    """Get a connection's sync state, creating it if needed.
+
+    A new state is flushed right away: sessions don't autoflush, so a
+    later lookup in the same session would otherwise create a second one.
+    """
+    result = await db.execute(
+        select(SyncState).where(SyncState.connection_id == connection_id)
+    )
+    sync_state = result.scalars().first()
+    if not sync_state:
+        sync_state = SyncState(connection_id=connection_id, items_synced=0, idle_streak=0)
+        db.add(sync_state)
+        await db.flush()
+    return sync_state
+
+
+async def record_sync(
+    db: AsyncSession,
+    connection_id: UUID,
+    platform: Platform,
+    items_synced: int,
+    error: str | None = None,
+) -> SyncState:
+    """Update a connection's activity statistics and schedule its next sync.
+
+    A sync that brings new items resets the connection to its platform's
+    base interval; idle or failed syncs back it off exponentially. A
+    partial sync (an import with pages left) is due again right away.
+    """
+    sync_state = await get_sync_state(db, connection_id)
+    now = datetime.now(timezone.utc)
+
+    if items_synced > 0:
+        sync_state.idle_streak = 0
+        sync_state.last_activity_at = now
+    else:
+        sync_state.idle_streak = (sync_state.idle_streak or 0) + 1
+    if error is not None:
+        sync_state.last_sync_status = "error"
+        sync_state.last_sync_error = error
+
+    interval = next_interval(platform, sync_state.idle_streak, sync_state)
+    sync_state.sync_interval_seconds = interval
+    sync_state.next_sync_at = now + timedelta(seconds=interval)
+    if sync_state.last_sync_status == "partial" and error is None:
+        # An import that stopped early continues on the next dispatch
+        sync_state.next_sync_at = now
+
+    await db.flush()
+    return sync_state
+
+
+async def request_sync(db: AsyncSession, connection_id: UUID) -> SyncState:
+    """Make a connection due for sync right away, at its most frequent interval.
+
+    The next dispatch (every SYNC_DISPATCH_INTERVAL_SECONDS) queues it.
+    """
+    sync_state = await get_sync_state(db, connection_id)
+    sync_state.idle_streak = 0
+    sync_state.next_sync_at = datetime.now(timezone.utc)
+
+    await db.flush()
+    return sync_state
@@ -0,0 +1,195 @@
+"""Asyncio-native worker for network-bound Celery tasks.
+
+Consumes Celery messages from a Redis queue and runs up to `concurrency`
+task coroutines at once in a single process, instead of one task per
+prefork process. Only the tasks in ASYNC_TASKS can be run, so it consumes
+their own queue, CELERY_IO_QUEUE; any other task is put back on the queue.
+
+Usage (from backend/):
+    python -m app.workers.aio_worker [--queue io] [--concurrency 200]
+"""
+import argparse
+import asyncio
+import queue
+import signal
+import socket
+import threading
+import time
+from functools import partial
+
+from kombu import Connection, Exchange, Queue
+from kombu.message import Message
+
+from app.celery_app import celery_app
+from app.config import settings
+from app.database import AsyncSessionLocal, make_engine
+from app.models.connection import Platform
+from app.workers.process_tasks import process_item_by_id
+from app.workers.sync_tasks import (
+    dispatch_due_syncs,
+    dispatch_platform_sync,
+    renew_expiring_watches,
+    sync_connection_by_id,
+)
+
+# Celery task name -> coroutine function running the same work (see IO_TASKS)
+ASYNC_TASKS = {
+    "app.workers.sync_tasks.sync_all_gmail": partial(dispatch_platform_sync, Platform.GMAIL),
+    "app.workers.sync_tasks.sync_all_slack": partial(dispatch_platform_sync, Platform.SLACK),
+    "app.workers.sync_tasks.sync_all_calendar": partial(dispatch_platform_sync, Platform.CALENDAR),
+    "app.workers.sync_tasks.sync_due_connections": dispatch_due_syncs,
+    "app.workers.sync_tasks.sync_user_connection": sync_connection_by_id,
+    "app.workers.sync_tasks.renew_gmail_watches": renew_expiring_watches,
+    "app.workers.process_tasks.process_single_item": process_item_by_id,
+}
+
+STATS_INTERVAL_SECONDS = 30
+
+
+def parse_task_message(body, message: Message) -> tuple[str, str, list, dict]:
+    """Extract (task name, task id, args, kwargs) from a Celery message."""
+    headers = message.headers or {}
+    if "task" in headers:
+        # Protocol 2: body is (args, kwargs, embed)
+        args, kwargs, _ = body
+        return headers["task"], headers["id"], list(args), dict(kwargs)
+    # Protocol 1: everything is in the body
+    return body["task"], body["id"], list(body.get("args", [])), dict(body.get("kwargs", {}))
+
+
+class AsyncioWorker:
+    """Runs Celery tasks from one queue as coroutines on a single event loop.
+
+    A background thread owns the kombu connection: it receives messages,
+    hands them to the loop, and acknowledges them once their coroutine has
+    finished (late ack, like the prefork workers). Messages for tasks it
+    can't run are rejected and requeued rather than acked. The prefetch
+    count caps the number of tasks in flight.
+    """
+
+    def __init__(self, queue_name: str, concurrency: int):
+        self.queue = Queue(queue_name, Exchange(queue_name), routing_key=queue_name)
+        self.concurrency = concurrency
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.tasks: set[asyncio.Task] = set()
+        # (message, whether to requeue it instead of acking)
+        self.acks: queue.Queue[tuple[Message, bool]] = queue.Queue()
+        self.stopping = threading.Event()
+        self.processed = 0
+        self.failed = 0
+
+    async def run(self) -> None:
+        self.loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            self.loop.add_signal_handler(sig, self.stopping.set)
+
+        engine = make_engine(
+            pool_size=settings.aio_worker_db_pool_size,
+            max_overflow=settings.aio_worker_db_pool_size,
+            pool_timeout=300,
+        )
+        AsyncSessionLocal.configure(bind=engine)
+
+        print(f"aio worker consuming '{self.queue.name}' with concurrency {self.concurrency}")
+        consumer = self.loop.run_in_executor(None, self._consume)
+        stats = asyncio.create_task(self._report_stats())
+        try:
+            while not self.stopping.is_set():
+                await asyncio.sleep(0.5)
+
+            # Finish what has been received; the consumer then acks and exits
+            if self.tasks:
+                await asyncio.gather(*self.tasks, return_exceptions=True)
+            await consumer
+        finally:
+            stats.cancel()
+            await engine.dispose()
+
+    def _consume(self) -> None:
+        with Connection(settings.redis_url) as connection:
+            with connection.Consumer(
+                self.queue, callbacks=[self._on_message], accept=["json"]
+            ) as consumer:
+                consumer.qos(prefetch_count=self.concurrency)
+                while not (self.stopping.is_set() and not self.tasks):
+                    self._flush_acks()
+                    if self.stopping.is_set():
+                        time.sleep(0.1)
+                        continue
+                    try:
+                        connection.drain_events(timeout=0.5)
+                    except socket.timeout:
+                        pass
+                self._flush_acks()
+
+    def _flush_acks(self) -> None:
+        while True:
+            try:
+                message, requeue = self.acks.get_nowait()
+            except queue.Empty:
+                return
+            if requeue:
+                message.reject(requeue=True)
+            else:
+                message.ack()
+
+    def _on_message(self, body, message: Message) -> None:
+        # Called on the consumer thread
+        self.loop.call_soon_threadsafe(self._spawn, body, message)
+
+    def _spawn(self, body, message: Message) -> None:
+        task = self.loop.create_task(self._execute(body, message))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def _execute(self, body, message: Message) -> None:
+        try:
+            name, task_id, args, kwargs = parse_task_message(body, message)
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"aio worker dropped a malformed message: {e!r}")
+            self.acks.put((message, False))
+            return
+
+        fn = ASYNC_TASKS.get(name)
+        if fn is None:
+            # Leave it to a worker that can run it
+            print(f"aio worker cannot run task {name}, requeued; is CELERY_IO_QUEUE shared?")
+            self.acks.put((message, True))
+            return
+
+        try:
+            result, state = await fn(*args, **kwargs), "SUCCESS"
+            self.processed += 1
+        except Exception as e:
+            print(f"aio worker task {task_id} failed: {e!r}")
+            result, state = e, "FAILURE"
+            self.failed += 1
+        finally:
+            self.acks.put((message, False))
+
+        await self.loop.run_in_executor(
+            None, celery_app.backend.store_result, task_id, result, state
+        )
+
+    async def _report_stats(self) -> None:
+        started = time.monotonic()
+        while True:
+            await asyncio.sleep(STATS_INTERVAL_SECONDS)
+            elapsed = time.monotonic() - started
+            print(
+                f"aio worker: {self.processed} done, {self.failed} failed, "
+                f"{len(self.tasks)} in flight, {self.processed / elapsed:.1f} tasks/s"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Asyncio worker for network-bound tasks")
+    parser.add_argument("--queue", default=settings.celery_io_queue)
+    parser.add_argument("--concurrency", type=int, default=settings.aio_worker_concurrency)
+    args = parser.parse_args()
+
+    asyncio.run(AsyncioWorker(args.queue, args.concurrency).run())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,46 +1,218 @@
 import asyncio
-from datetime import date
+from datetime import date, datetime, timedelta, timezone
 from uuid import UUID
 
-from sqlalchemy import select
+import redis.asyncio as redis
+from celery import chord
+from sqlalchemy import select, and_
 
 from app.celery_app import celery_app
+from app.config import settings
 from app.database import AsyncSessionLocal
+from app.workers.runtime import run_async
+from app.models.briefing import Briefing, BriefingType
 from app.models.user import User
 from app.ai.briefing_generator import generate_daily_briefing
+from app.services.briefing_schedule import due_briefing_dates
+
+PROGRESS_KEY_PREFIX = "briefing_run:"
+LOCK_KEY_PREFIX = "briefing_lock:"
+LOCK_TTL_SECONDS = 600  # Matches task_time_limit
+PROGRESS_TTL_SECONDS = 2 * 24 * 3600
+
+_redis_client: redis.Redis | None = None
+_redis_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _get_redis() -> redis.Redis:
+    """Shared client for the running loop (redis.asyncio connections are loop-bound)."""
+    global _redis_client, _redis_loop
+    loop = asyncio.get_running_loop()
+    if _redis_client is None or _redis_loop is not loop:
+        _redis_client = redis.from_url(settings.redis_url, decode_responses=True)
+        _redis_loop = loop
+    return _redis_client
+
+
+async def _set_progress(run_date: str, statuses: dict[str, str]) -> None:
+    """Record users' briefing status (pending, done or error) for a run date."""
+    progress_key = f"{PROGRESS_KEY_PREFIX}{run_date}"
+    async with _get_redis().pipeline(transaction=False) as pipe:
+        pipe.hset(progress_key, mapping=statuses)
+        pipe.expire(progress_key, PROGRESS_TTL_SECONDS)
+        await pipe.execute()
+
+
+async def _users_without_briefing(
+    briefing_date: date,
+    timezones: list[str] | None = None,
+) -> list[UUID]:
+    async with AsyncSessionLocal() as db:
+        has_briefing = select(Briefing.id).where(
+            and_(
+                Briefing.user_id == User.id,
+                Briefing.briefing_date == briefing_date,
+                Briefing.briefing_type == BriefingType.DAILY_MORNING,
+            )
+        )
+        query = select(User.id).where(~has_briefing.exists()).order_by(User.id)
+        if timezones is not None:
+            query = query.where(User.timezone.in_(timezones))
+
+        result = await db.execute(query)
+        return [row[0] for row in result.all()]
+
+
+async def _user_timezones() -> list[str]:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(User.timezone).distinct())
+        return [row[0] for row in result.all()]
+
+
+@celery_app.task(name="app.workers.briefing_tasks.schedule_morning_briefings")
+def schedule_morning_briefings():
+    """Dispatch the morning briefings due by the end of the current window.
+
+    Runs every BRIEFING_SCHEDULE_INTERVAL_MINUTES. Users are bucketed by
+    timezone, and each bucket is generated BRIEFING_LEAD_MINUTES ahead of
+    BRIEFING_LOCAL_HOUR in its local time, which spreads the load over the
+    day instead of generating every briefing at once. Every timezone whose
+    briefing is already due is dispatched, not just those due in this
+    window, so a late run catches up; users who already have their
+    briefing are left out by _dispatch_morning_briefings.
+    """
+    interval = timedelta(minutes=settings.briefing_schedule_interval_minutes)
+    now = datetime.now(timezone.utc)
+    window_start = now - (now - now.replace(hour=0, minute=0, second=0, microsecond=0)) % interval
+
+    try:
+        timezones = run_async(_user_timezones())
+    except Exception as e:
+        return {"error": str(e)}
+
+    due = due_briefing_dates(timezones, window_start + interval)
+    dispatched = []
+    for briefing_date, zones in due.items():
+        dispatched.append(_dispatch_morning_briefings(briefing_date, zones))
+
+    return {"window_start": window_start.isoformat(), "dispatched": dispatched}
 
 
 @celery_app.task(name="app.workers.briefing_tasks.generate_all_morning_briefings")
-def generate_all_morning_briefings():
-    """Generate morning briefings for all users."""
-    async def _generate():
-        async with AsyncSessionLocal() as db:
+def generate_all_morning_briefings(briefing_date: str | None = None):
+    """Generate morning briefings for all users at once, regardless of timezone."""
+    run_date = date.fromisoformat(briefing_date) if briefing_date else date.today()
+    return _dispatch_morning_briefings(run_date)
+
+
+def _dispatch_morning_briefings(run_date: date, timezones: list[str] | None = None) -> dict:
+    """Fan out morning briefings for users (optionally in `timezones`).
+
+    Users that don't have the date's briefing yet are split into shards of
+    BRIEFING_SHARD_SIZE, each generated by its own subtask. Dispatching
+    again resumes where a previous run stopped without duplicating
+    briefings. Progress is kept per user in the Redis hash
+    briefing_run:<date> (user ID -> pending, done or error), so
+    dispatching a user twice never counts them twice.
+    """
+    try:
+        user_ids = run_async(_users_without_briefing(run_date, timezones))
+    except Exception as e:
+        return {"briefing_date": str(run_date), "error": str(e)}
+
+    if not user_ids:
+        return {"briefing_date": str(run_date), "shards": 0, "users": 0}
+
+    size = settings.briefing_shard_size
+    shards = [
+        [str(user_id) for user_id in user_ids[i:i + size]]
+        for i in range(0, len(user_ids), size)
+    ]
+
+    try:
+        run_async(_set_progress(str(run_date), {str(user_id): "pending" for user_id in user_ids}))
+    except redis.RedisError as e:
+        print(f"Could not record briefing progress for {run_date}: {e}")
+
+    chord(
+        generate_briefing_shard.s(shard, str(run_date)) for shard in shards
+    )(finish_morning_briefings.s(str(run_date)))
+
+    return {"briefing_date": str(run_date), "shards": len(shards), "users": len(user_ids)}
+
+
+@celery_app.task(name="app.workers.briefing_tasks.generate_briefing_shard")
+def generate_briefing_shard(user_ids: list[str], briefing_date: str):
+    """Generate morning briefings for one shard of users.
+
+    Up to BRIEFING_SHARD_CONCURRENCY briefings are generated at once, each
+    in its own session. Users that already have the briefing, or whose
+    briefing another worker is generating, are skipped.
+    """
+    run_date = date.fromisoformat(briefing_date)
+
+    async def _generate_one(user_id: UUID, semaphore: asyncio.Semaphore) -> str:
+        outcome = await _generate_locked(user_id, semaphore)
+        # A user another worker is generating is that worker's to record
+        if outcome != "locked":
+            status = "error" if outcome == "errors" else "done"
             try:
-                result = await db.execute(select(User))
-                users = list(result.scalars().all())
+                await _set_progress(briefing_date, {str(user_id): status})
+            except redis.RedisError as e:
+                print(f"Could not record briefing progress for user {user_id}: {e}")
+        return "skipped" if outcome == "locked" else outcome
 
-                generated_count = 0
-                error_count = 0
+    async def _generate_locked(user_id: UUID, semaphore: asyncio.Semaphore) -> str:
+        client = _get_redis()
+        lock_key = f"{LOCK_KEY_PREFIX}{user_id}:{briefing_date}"
+        async with semaphore:
+            if not await client.set(lock_key, "1", nx=True, ex=LOCK_TTL_SECONDS):
+                return "locked"
 
-                for user in users:
-                    try:
-                        await generate_daily_briefing(db, user.id)
-                        generated_count += 1
-                    except Exception as e:
-                        print(f"Error generating briefing for user {user.id}: {e}")
-                        error_count += 1
+            async with AsyncSessionLocal() as db:
+                try:
+                    existing = await db.execute(
+                        select(Briefing.id).where(
+                            and_(
+                                Briefing.user_id == user_id,
+                                Briefing.briefing_date == run_date,
+                                Briefing.briefing_type == BriefingType.DAILY_MORNING,
+                            )
+                        )
+                    )
+                    if existing.first() is not None:
+                        return "skipped"
 
-                await db.commit()
+                    await generate_daily_briefing(db, user_id, run_date)
+                    await db.commit()
+                    return "generated"
+                except Exception as e:
+                    await db.rollback()
+                    await client.delete(lock_key)
+                    print(f"Error generating briefing for user {user_id}: {e}")
+                    return "errors"
+
+    async def _generate():
+        semaphore = asyncio.Semaphore(settings.briefing_shard_concurrency)
+        outcomes = await asyncio.gather(
+            *(_generate_one(UUID(user_id), semaphore) for user_id in user_ids)
+        )
+        return {
+            outcome: sum(1 for o in outcomes if o == outcome)
+            for outcome in ("generated", "skipped", "errors")
+        }
+
+    return run_async(_generate())
 
-                return {
-                    "generated": generated_count,
-                    "errors": error_count,
-                }
-            except Exception as e:
-                await db.rollback()
-                return {"error": str(e)}
 
-    return asyncio.run(_generate())
+@celery_app.task(name="app.workers.briefing_tasks.finish_morning_briefings")
+def finish_morning_briefings(shard_results: list[dict], briefing_date: str):
+    """Sum up the shard results of a morning briefing run."""
+    totals = {"generated": 0, "skipped": 0, "errors": 0}
+    for result in shard_results:
+        for field in totals:
+            totals[field] += result.get(field, 0)
+    return {"briefing_date": briefing_date, "shards": len(shard_results), **totals}
 
 
 @celery_app.task(name="app.workers.briefing_tasks.generate_user_briefing")
@@ -69,4 +241,4 @@ def generate_user_briefing(user_id: str, briefing_date: str | None = None):
                 await db.rollback()
                 return {"error": str(e)}
 
-    return asyncio.run(_generate())
+    return run_async(_generate())
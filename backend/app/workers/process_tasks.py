@@ -1,84 +1,240 @@
-import asyncio
+import time
+from datetime import datetime, timedelta, timezone
 from uuid import UUID
 
-from sqlalchemy import select, and_
+from sqlalchemy import select, update, and_, or_, func
 
 from app.celery_app import celery_app
+from app.config import settings
 from app.database import AsyncSessionLocal
+from app.workers.runtime import run_async
 from app.models.item import Item
 from app.models.deadline import DeadlineStatus
-from app.services.ai_pipeline import process_item
+from app.ai.provider import batch_api_available
+from app.services.ai_pipeline import (
+    adaptive_batch_size,
+    apply_backfill,
+    hydrate_for_analysis,
+    process_item,
+    process_items_batch,
+    submit_backfill,
+)
 from app.crud.deadline import deadline_crud
+from app.crud.sender_profile import sender_profile_crud
+
+
+def _pending_realtime():
+    """Filter for unprocessed items not waiting on a batch job or claimed by a live run."""
+    stale = datetime.now(timezone.utc) - timedelta(seconds=settings.ai_claim_timeout_seconds)
+    return and_(
+        Item.ai_processed_at.is_(None),
+        Item.ai_batch_id.is_(None),
+        or_(Item.ai_claimed_at.is_(None), Item.ai_claimed_at < stale),
+    )
+
+
+async def _claim_items(db, limit: int) -> list[Item]:
+    """Claim up to `limit` pending items for this run and commit the claim.
+
+    The rows are locked (SKIP LOCKED) only for the claiming update, so the
+    slow LLM work that follows never blocks other writes to them.
+    """
+    claimed = await db.execute(
+        update(Item)
+        .where(
+            Item.id.in_(
+                select(Item.id)
+                .where(_pending_realtime())
+                .order_by(Item.received_at.desc())
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+                .scalar_subquery()
+            )
+        )
+        # A claim isn't a change to the item
+        .values(ai_claimed_at=func.now(), updated_at=Item.updated_at)
+        .returning(Item.id)
+    )
+    item_ids = list(claimed.scalars().all())
+    await db.commit()
+    if not item_ids:
+        return []
+
+    result = await db.execute(
+        select(Item).where(Item.id.in_(item_ids)).order_by(Item.received_at.desc())
+    )
+    return list(result.scalars().all())
 
 
 @celery_app.task(name="app.workers.process_tasks.process_unprocessed_items")
 def process_unprocessed_items():
-    """Process items that haven't been through the AI pipeline."""
+    """Process items that haven't been through the AI pipeline.
+
+    Keeps pulling batches, sized to the current backlog, until the backlog
+    is drained or AI_BATCH_TIME_BUDGET_SECONDS has elapsed. Each batch is
+    claimed in a short transaction first, so overlapping runs never pick up
+    the same items and the rows aren't locked during the LLM calls; claims
+    of a run that died expire after AI_CLAIM_TIMEOUT_SECONDS. A backlog
+    deeper than AI_BACKFILL_THRESHOLD is handed to the provider batch API
+    instead (see backfill_unprocessed_items), if there is one.
+    """
     async def _process():
+        stop_at = time.monotonic() + settings.ai_batch_time_budget_seconds
+        processed_count = 0
+        error_count = 0
+        batch_count = 0
+
+        while time.monotonic() < stop_at:
+            async with AsyncSessionLocal() as db:
+                claimed_ids = []
+                try:
+                    backlog_result = await db.execute(
+                        select(func.count(Item.id)).where(_pending_realtime())
+                    )
+                    backlog = backlog_result.scalar_one()
+                    if backlog == 0:
+                        break
+                    if (
+                        batch_count == 0
+                        and backlog > settings.ai_backfill_threshold
+                        and batch_api_available()
+                    ):
+                        backfill_unprocessed_items.delay()
+                        return {"processed": 0, "errors": 0, "batches": 0, "backfill": backlog}
+
+                    items = await _claim_items(db, adaptive_batch_size(backlog))
+                    if not items:
+                        break
+                    claimed_ids = [item.id for item in items]
+
+                    # Commit fetched bodies before the LLM calls start
+                    await hydrate_for_analysis(db, items)
+                    await db.commit()
+                    await process_items_batch(db, items)
+                    await db.commit()
+
+                    processed_count += len(items)
+                    error_count += sum(1 for item in items if item.ai_confidence == 0.0)
+                    batch_count += 1
+                except Exception as e:
+                    await db.rollback()
+                    if claimed_ids:
+                        # Release the claim so the next run retries these items
+                        await db.execute(
+                            update(Item)
+                            .where(Item.id.in_(claimed_ids))
+                            .values(ai_claimed_at=None, updated_at=Item.updated_at)
+                        )
+                        await db.commit()
+                    return {
+                        "processed": processed_count,
+                        "errors": error_count,
+                        "batches": batch_count,
+                        "error": str(e),
+                    }
+
+        return {
+            "processed": processed_count,
+            "errors": error_count,
+            "batches": batch_count,
+        }
+
+    return run_async(_process())
+
+
+@celery_app.task(name="app.workers.process_tasks.backfill_unprocessed_items")
+def backfill_unprocessed_items():
+    """Submit the unprocessed backlog to the provider batch API.
+
+    Batch APIs trade latency (minutes to hours) for a lower price, which
+    suits bulk imports. Results are collected by poll_backfill_batch.
+    Without a batch API the backlog is left to process_unprocessed_items.
+    """
+    if not batch_api_available():
+        return {"submitted": 0, "skipped": "no batch API"}
+
+    async def _submit():
         async with AsyncSessionLocal() as db:
             try:
-                # Get unprocessed items
                 result = await db.execute(
                     select(Item)
-                    .where(Item.ai_processed_at.is_(None))
+                    .where(_pending_realtime())
                     .order_by(Item.received_at.desc())
-                    .limit(20)  # Process 20 at a time
+                    .limit(settings.ai_backfill_max_items)
+                    .with_for_update(skip_locked=True)
                 )
                 items = list(result.scalars().all())
+                if not items:
+                    return {"submitted": 0}
 
-                processed_count = 0
-                error_count = 0
-
-                for item in items:
-                    try:
-                        await process_item(db, item)
-                        processed_count += 1
-                    except Exception as e:
-                        print(f"Error processing item {item.id}: {e}")
-                        error_count += 1
-
+                batch_id = await submit_backfill(db, items)
                 await db.commit()
-
-                return {
-                    "processed": processed_count,
-                    "errors": error_count,
-                }
             except Exception as e:
                 await db.rollback()
                 return {"error": str(e)}
 
-    return asyncio.run(_process())
+        poll_backfill_batch.apply_async(
+            args=[batch_id], countdown=settings.ai_backfill_poll_seconds
+        )
+        return {"batch_id": batch_id, "submitted": len(items)}
 
+    return run_async(_submit())
 
-@celery_app.task(name="app.workers.process_tasks.process_single_item")
-def process_single_item(item_id: str):
-    """Process a single item through the AI pipeline."""
-    async def _process():
+
+@celery_app.task(name="app.workers.process_tasks.poll_backfill_batch")
+def poll_backfill_batch(batch_id: str):
+    """Apply a backfill batch's results, or check again later if still running."""
+    async def _poll():
         async with AsyncSessionLocal() as db:
             try:
-                result = await db.execute(
-                    select(Item).where(Item.id == UUID(item_id))
-                )
-                item = result.scalar_one_or_none()
-
-                if not item:
-                    return {"error": "Item not found"}
-
-                await process_item(db, item)
+                summary = await apply_backfill(db, batch_id)
                 await db.commit()
-
-                return {
-                    "item_id": item_id,
-                    "summary": item.ai_summary,
-                    "priority": item.priority_score,
-                    "category": item.category.value if item.category else None,
-                    "action_type": item.action_type.value if item.action_type else None,
-                }
             except Exception as e:
                 await db.rollback()
-                return {"error": str(e)}
+                summary = {"error": str(e)}
+
+        # Items stay tagged with the batch until its results are applied
+        if summary is None or "error" in summary:
+            poll_backfill_batch.apply_async(
+                args=[batch_id], countdown=settings.ai_backfill_poll_seconds
+            )
+            return {"batch_id": batch_id, "status": "in_progress", **(summary or {})}
+        return {"batch_id": batch_id, **summary}
+
+    return run_async(_poll())
+
+
+async def process_item_by_id(item_id: str) -> dict:
+    """Process a single item through the AI pipeline."""
+    async with AsyncSessionLocal() as db:
+        try:
+            result = await db.execute(
+                select(Item).where(Item.id == UUID(item_id))
+            )
+            item = result.scalar_one_or_none()
+
+            if not item:
+                return {"error": "Item not found"}
+
+            await process_item(db, item)
+            await db.commit()
 
-    return asyncio.run(_process())
+            return {
+                "item_id": item_id,
+                "summary": item.ai_summary,
+                "priority": item.priority_score,
+                "category": item.category.value if item.category else None,
+                "action_type": item.action_type.value if item.action_type else None,
+            }
+        except Exception as e:
+            await db.rollback()
+            return {"error": str(e)}
+
+
+@celery_app.task(name="app.workers.process_tasks.process_single_item")
+def process_single_item(item_id: str):
+    """Process a single item through the AI pipeline."""
+    return run_async(process_item_by_id(item_id))
 
 
 @celery_app.task(name="app.workers.process_tasks.mark_overdue_deadlines")
@@ -107,4 +263,29 @@ def mark_overdue_deadlines():
                 await db.rollback()
                 return {"error": str(e)}
 
-    return asyncio.run(_mark())
+    return run_async(_mark())
+
+
+@celery_app.task(name="app.workers.process_tasks.seed_sender_profiles")
+def seed_sender_profiles():
+    """Build sender memo profiles from already processed items."""
+    async def _seed():
+        async with AsyncSessionLocal() as db:
+            try:
+                from app.models.user import User
+
+                result = await db.execute(select(User.id))
+                user_ids = [row[0] for row in result.all()]
+
+                total_seeded = 0
+                for user_id in user_ids:
+                    total_seeded += await sender_profile_crud.seed_from_history(db, user_id)
+
+                await db.commit()
+
+                return {"profiles_seeded": total_seeded}
+            except Exception as e:
+                await db.rollback()
+                return {"error": str(e)}
+
+    return run_async(_seed())
@@ -0,0 +1,85 @@
+import asyncio
+import threading
+from collections.abc import Coroutine
+from typing import Any, TypeVar
+
+from celery.signals import worker_process_init, worker_process_shutdown
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.database import AsyncSessionLocal, make_engine
+
+T = TypeVar("T")
+
+
+class WorkerRuntime:
+    """A long-lived event loop and database engine for one worker process.
+
+    The loop runs in a background thread, so the asyncpg pool, Redis
+    clients and HTTP connections it owns survive from one task to the next
+    instead of being rebuilt by a fresh asyncio.run() per task.
+    """
+
+    def __init__(self):
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.engine: AsyncEngine | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the loop thread and bind sessions to a process-local engine."""
+        with self._lock:
+            if self.running:
+                return
+
+            self.loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=self.loop.run_forever, name="worker-runtime", daemon=True
+            )
+            self._thread.start()
+
+            # Never reuse a pool inherited from the parent process
+            self.engine = make_engine()
+            AsyncSessionLocal.configure(bind=self.engine)
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Run a coroutine on the runtime loop and wait for its result."""
+        if not self.running:
+            self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def stop(self) -> None:
+        """Dispose of the engine and stop the loop thread."""
+        with self._lock:
+            if not self.running:
+                return
+
+            if self.engine is not None:
+                asyncio.run_coroutine_threadsafe(self.engine.dispose(), self.loop).result()
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join()
+            self.loop.close()
+            self.loop = None
+            self.engine = None
+            self._thread = None
+
+
+runtime = WorkerRuntime()
+
+
+def run_async(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a task's coroutine on the worker process's persistent loop."""
+    return runtime.run(coro)
+
+
+@worker_process_init.connect
+def _start_runtime(**kwargs) -> None:
+    runtime.start()
+
+
+@worker_process_shutdown.connect
+def _stop_runtime(**kwargs) -> None:
+    runtime.stop()
@@ -1,16 +1,48 @@
 import asyncio
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from uuid import UUID, uuid4
 
-from sqlalchemy import select
+import redis.asyncio as redis
+from sqlalchemy import select, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.celery_app import celery_app
+from app.config import settings
 from app.database import AsyncSessionLocal
+from app.workers.runtime import run_async
 from app.models.connection import Connection, ConnectionStatus, Platform
+from app.models.sync_state import SyncState
+from app.services.sync_schedule import get_sync_state, record_sync, watch_expires_at
 from app.integrations.gmail import GmailIntegration
 from app.integrations.slack import SlackIntegration
 from app.integrations.calendar import CalendarIntegration
 
+LOCK_KEY_PREFIX = "sync_lock:"
+QUEUED_KEY_PREFIX = "sync_queued:"
+RERUN_KEY_PREFIX = "sync_rerun:"
+LOCK_TTL_SECONDS = 600  # Matches task_time_limit
+QUEUED_TTL_SECONDS = 600  # Lets a lost queue message be dispatched again
+# Deletes a lock only if it still holds our token
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+_redis_client: redis.Redis | None = None
+_redis_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _get_redis() -> redis.Redis:
+    """Shared client for the running loop (redis.asyncio connections are loop-bound)."""
+    global _redis_client, _redis_loop
+    loop = asyncio.get_running_loop()
+    if _redis_client is None or _redis_loop is not loop:
+        _redis_client = redis.from_url(settings.redis_url, decode_responses=True)
+        _redis_loop = loop
+    return _redis_client
+
 
 def get_integration_class(platform: Platform):
     """Get the integration class for a platform."""
@@ -29,115 +61,233 @@ async def _sync_connection(connection: Connection, db: AsyncSession) -> int:
         return 0
 
     integration = integration_class(connection)
-
-    # Refresh tokens if needed
-    if integration.is_token_expired():
-        try:
-            token_data = await integration.refresh_tokens()
-            connection.access_token = token_data["access_token"]
-            if token_data.get("refresh_token"):
-                connection.refresh_token = token_data["refresh_token"]
-            if token_data.get("expires_in"):
-                connection.token_expires_at = datetime.utcnow() + timedelta(
-                    seconds=token_data["expires_in"]
-                )
-        except Exception as e:
-            connection.status = ConnectionStatus.ERROR
-            connection.last_error = str(e)
-            return 0
+    if not await integration.ensure_fresh_tokens():
+        return 0
 
     # Perform sync
     try:
         items_synced = await integration.sync(db, connection.user_id)
         connection.last_error = None
-        return items_synced
     except Exception as e:
         connection.last_error = str(e)
+        await record_sync(db, connection.id, connection.platform, 0, error=str(e))
         return 0
 
+    await record_sync(db, connection.id, connection.platform, items_synced)
+    return items_synced
 
-async def _sync_platform(platform: Platform) -> dict:
-    """Sync all connections for a platform."""
-    async with AsyncSessionLocal() as db:
-        try:
+
+async def queue_syncs(connection_ids: list[str], rerun_if_syncing: bool = False) -> tuple[int, int]:
+    """Enqueue sync_user_connection for each connection; returns (queued, skipped).
+
+    Connections whose sync is still running (sync_lock:<id>) or already
+    waiting in the queue (sync_queued:<id>) are skipped, so a slow sync
+    never piles up behind the next dispatch. With `rerun_if_syncing` (for
+    change notifications), a running sync is queued again once it ends,
+    as it may have started before the change.
+
+    Redis is checked in two pipelined round trips, and the blocking
+    publish runs in the default executor, off the event loop.
+    """
+    if not connection_ids:
+        return 0, 0
+    client = _get_redis()
+
+    async with client.pipeline(transaction=False) as pipe:
+        for connection_id in connection_ids:
+            pipe.exists(f"{LOCK_KEY_PREFIX}{connection_id}")
+        locked = await pipe.execute()
+    syncing = [cid for cid, is_locked in zip(connection_ids, locked) if is_locked]
+    idle = [cid for cid, is_locked in zip(connection_ids, locked) if not is_locked]
+
+    async with client.pipeline(transaction=False) as pipe:
+        if rerun_if_syncing:
+            for connection_id in syncing:
+                pipe.set(f"{RERUN_KEY_PREFIX}{connection_id}", "1", ex=LOCK_TTL_SECONDS)
+        for connection_id in idle:
+            pipe.set(f"{QUEUED_KEY_PREFIX}{connection_id}", "1", nx=True, ex=QUEUED_TTL_SECONDS)
+        results = await pipe.execute()
+    claimed = results[len(syncing) if rerun_if_syncing else 0:]
+    to_queue = [cid for cid, was_set in zip(idle, claimed) if was_set]
+
+    if to_queue:
+        await asyncio.get_running_loop().run_in_executor(None, _publish_syncs, to_queue)
+    return len(to_queue), len(connection_ids) - len(to_queue)
+
+
+def _publish_syncs(connection_ids: list[str]) -> None:
+    for connection_id in connection_ids:
+        sync_user_connection.delay(connection_id)
+
+
+async def dispatch_due_syncs() -> dict:
+    """Queue a sync of every active connection whose next sync is due.
+
+    Connections never synced (no sync state yet) are always due.
+    """
+    try:
+        async with AsyncSessionLocal() as db:
             result = await db.execute(
-                select(Connection).where(
-                    Connection.platform == platform,
+                select(Connection.id)
+                .outerjoin(SyncState, SyncState.connection_id == Connection.id)
+                .where(
                     Connection.status == ConnectionStatus.ACTIVE,
+                    or_(
+                        SyncState.next_sync_at.is_(None),
+                        SyncState.next_sync_at <= datetime.now(timezone.utc),
+                    ),
                 )
+                .distinct()
             )
-            connections = list(result.scalars().all())
+            connection_ids = [str(row[0]) for row in result.all()]
 
-            total_synced = 0
-            synced_count = 0
-            error_count = 0
+        queued, skipped = await queue_syncs(connection_ids)
+        return {"connections_queued": queued, "connections_skipped": skipped}
+    except Exception as e:
+        return {"error": str(e)}
 
-            for connection in connections:
-                try:
-                    items = await _sync_connection(connection, db)
-                    total_synced += items
-                    synced_count += 1
-                except Exception:
-                    error_count += 1
 
-            await db.commit()
+async def dispatch_platform_sync(platform: Platform) -> dict:
+    """Queue a sync of every active connection of a platform, due or not."""
+    try:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(Connection.id).where(
+                    Connection.platform == platform,
+                    Connection.status == ConnectionStatus.ACTIVE,
+                )
+            )
+            connection_ids = [str(row[0]) for row in result.all()]
 
-            return {
-                "platform": platform.value,
-                "connections_synced": synced_count,
-                "items_synced": total_synced,
-                "errors": error_count,
-            }
-        except Exception as e:
-            await db.rollback()
-            return {
-                "platform": platform.value,
-                "error": str(e),
-            }
+        queued, skipped = await queue_syncs(connection_ids)
+        return {
+            "platform": platform.value,
+            "connections_queued": queued,
+            "connections_skipped": skipped,
+        }
+    except Exception as e:
+        return {
+            "platform": platform.value,
+            "error": str(e),
+        }
+
+
+@celery_app.task(name="app.workers.sync_tasks.sync_due_connections")
+def sync_due_connections():
+    """Queue the connections due for sync under adaptive scheduling."""
+    return run_async(dispatch_due_syncs())
 
 
 @celery_app.task(name="app.workers.sync_tasks.sync_all_gmail")
 def sync_all_gmail():
-    """Sync all Gmail connections."""
-    return asyncio.run(_sync_platform(Platform.GMAIL))
+    """Queue a sync of every Gmail connection."""
+    return run_async(dispatch_platform_sync(Platform.GMAIL))
 
 
 @celery_app.task(name="app.workers.sync_tasks.sync_all_slack")
 def sync_all_slack():
-    """Sync all Slack connections."""
-    return asyncio.run(_sync_platform(Platform.SLACK))
+    """Queue a sync of every Slack connection."""
+    return run_async(dispatch_platform_sync(Platform.SLACK))
 
 
 @celery_app.task(name="app.workers.sync_tasks.sync_all_calendar")
 def sync_all_calendar():
-    """Sync all Calendar connections."""
-    return asyncio.run(_sync_platform(Platform.CALENDAR))
+    """Queue a sync of every Calendar connection."""
+    return run_async(dispatch_platform_sync(Platform.CALENDAR))
+
+
+async def sync_connection_by_id(connection_id: str) -> dict:
+    """Sync a specific user connection.
+
+    Holds sync_lock:<id> while running; if another worker already holds it,
+    the sync is skipped. The lock stores a token, so a sync that outlived
+    the lock's TTL can't release a lock another worker has taken since.
+    Queues itself again if a change was notified while it ran
+    (sync_rerun:<id>).
+    """
+    client = _get_redis()
+    lock_key = f"{LOCK_KEY_PREFIX}{connection_id}"
+    token = uuid4().hex
+    if not await client.set(lock_key, token, nx=True, ex=LOCK_TTL_SECONDS):
+        return {"connection_id": connection_id, "skipped": "already syncing"}
+    # Let the next dispatch queue this connection again
+    await client.delete(f"{QUEUED_KEY_PREFIX}{connection_id}")
+
+    async with AsyncSessionLocal() as db:
+        try:
+            result = await db.execute(
+                select(Connection).where(Connection.id == UUID(connection_id))
+            )
+            connection = result.scalar_one_or_none()
+
+            if not connection:
+                return {"error": "Connection not found"}
+
+            items = await _sync_connection(connection, db)
+            await db.commit()
+
+            return {
+                "connection_id": connection_id,
+                "items_synced": items,
+            }
+        except Exception as e:
+            await db.rollback()
+            return {"error": str(e)}
+        finally:
+            await client.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+            if await client.delete(f"{RERUN_KEY_PREFIX}{connection_id}"):
+                await queue_syncs([connection_id])
 
 
 @celery_app.task(name="app.workers.sync_tasks.sync_user_connection")
 def sync_user_connection(connection_id: str):
     """Sync a specific user connection."""
-    async def _sync():
-        async with AsyncSessionLocal() as db:
-            try:
-                from uuid import UUID
-                result = await db.execute(
-                    select(Connection).where(Connection.id == UUID(connection_id))
+    return run_async(sync_connection_by_id(connection_id))
+
+
+async def renew_expiring_watches() -> dict:
+    """Start Gmail push watches, or renew those expiring within GMAIL_WATCH_RENEW_HOURS."""
+    if not settings.gmail_pubsub_topic:
+        return {"skipped": "GMAIL_PUBSUB_TOPIC is not set"}
+
+    renew_before = datetime.now(timezone.utc) + timedelta(hours=settings.gmail_watch_renew_hours)
+    async with AsyncSessionLocal() as db:
+        try:
+            result = await db.execute(
+                select(Connection).where(
+                    Connection.platform == Platform.GMAIL,
+                    Connection.status == ConnectionStatus.ACTIVE,
                 )
-                connection = result.scalar_one_or_none()
+            )
+            connections = list(result.scalars().all())
+
+            renewed = 0
+            error_count = 0
+            for connection in connections:
+                expires_at = watch_expires_at(await get_sync_state(db, connection.id))
+                if expires_at and expires_at > renew_before:
+                    continue
+
+                integration = GmailIntegration(connection)
+                try:
+                    if not await integration.ensure_fresh_tokens():
+                        error_count += 1
+                        continue
+                    await integration.watch(db)
+                    renewed += 1
+                except Exception as e:
+                    connection.last_error = str(e)
+                    error_count += 1
 
-                if not connection:
-                    return {"error": "Connection not found"}
+            await db.commit()
 
-                items = await _sync_connection(connection, db)
-                await db.commit()
+            return {"watches_renewed": renewed, "errors": error_count}
+        except Exception as e:
+            await db.rollback()
+            return {"error": str(e)}
 
-                return {
-                    "connection_id": connection_id,
-                    "items_synced": items,
-                }
-            except Exception as e:
-                await db.rollback()
-                return {"error": str(e)}
 
-    return asyncio.run(_sync())
+@celery_app.task(name="app.workers.sync_tasks.renew_gmail_watches")
+def renew_gmail_watches():
+    """Keep Gmail push notification watches alive."""
+    return run_async(renew_expiring_watches())
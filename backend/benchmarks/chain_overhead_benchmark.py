@@ -0,0 +1,62 @@
+"""Measure the per-call cost of building an LLM chain: rebuilding
+`prompt | llm | parser` (with a fresh briefing client) on every call, as
+before the chain registry, vs looking it up in the registry.
+
+No requests are sent; dummy API keys are used.
+
+Usage (from backend/):
+    python -m benchmarks.chain_overhead_benchmark [anthropic|openai] [iterations]
+"""
+import sys
+import time
+
+from langchain_core.output_parsers import StrOutputParser
+
+from app.ai import chains, provider
+from app.ai.prompts import BRIEFING_GENERATOR_PROMPT, SUMMARIZER_PROMPT
+from app.config import settings
+
+
+def timed(fn, iterations: int) -> float:
+    fn()  # Warm up lazy imports
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main(llm_provider: str = "anthropic", iterations: int = 200) -> None:
+    settings.llm_provider = llm_provider
+    settings.anthropic_api_key = settings.anthropic_api_key or "sk-benchmark"
+    settings.openai_api_key = settings.openai_api_key or "sk-benchmark"
+    provider.get_llm.cache_clear()
+    provider.get_llm_for_briefing.cache_clear()
+    chains.get_chain.cache_clear()
+
+    def rebuild_item_chain():
+        SUMMARIZER_PROMPT | provider.get_llm() | StrOutputParser()
+
+    def rebuild_briefing_chain():
+        provider.get_llm_for_briefing.cache_clear()
+        BRIEFING_GENERATOR_PROMPT | provider.get_llm_for_briefing() | StrOutputParser()
+
+    rows = [
+        ("item chain, rebuilt", timed(rebuild_item_chain, iterations)),
+        ("item chain, registry", timed(lambda: chains.get_chain("summarizer"), iterations)),
+        ("briefing chain, rebuilt", timed(rebuild_briefing_chain, iterations)),
+        (
+            "briefing chain, registry",
+            timed(lambda: chains.get_chain("briefing_generator"), iterations),
+        ),
+    ]
+
+    print(f"Provider: {llm_provider}, {iterations} iterations")
+    for label, micros in rows:
+        print(f"{label:<28}{micros:>10.1f} us/call")
+
+
+if __name__ == "__main__":
+    main(
+        sys.argv[1] if len(sys.argv) > 1 else "anthropic",
+        int(sys.argv[2]) if len(sys.argv) > 2 else 200,
+    )
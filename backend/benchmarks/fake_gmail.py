@@ -0,0 +1,267 @@
+"""Local fake of the Gmail API endpoints used by GmailIntegration.sync:
+profile, message list, history, single message GET and the multipart batch
+endpoint. Messages are served in "full" or "metadata" format.
+Every HTTP request waits `latency` seconds, like a round trip to Google,
+and response bytes are counted in app.state.bytes_sent.
+
+Used by the Gmail benchmarks, with MemorySession in place of the database;
+run standalone to poke at it by hand:
+    python -m benchmarks.fake_gmail [messages] [latency_ms] [port]
+"""
+import asyncio
+import base64
+import json
+import sys
+import threading
+import uuid
+from collections.abc import Mapping
+from urllib.parse import urlsplit
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.datastructures import QueryParams
+
+API_PATH = "/gmail/v1"
+BATCH_PATH = "/batch/gmail/v1"
+
+
+class SyntheticMailbox(Mapping):
+    """Message resources by ID, built on access so large mailboxes stay cheap."""
+
+    FIRST_ID = 0x18C0000000000000
+
+    def __init__(self, count: int):
+        self.count = count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self):
+        return (f"{self.FIRST_ID + n:x}" for n in range(self.count))
+
+    def __getitem__(self, message_id: str) -> dict:
+        try:
+            n = int(message_id, 16) - self.FIRST_ID
+        except ValueError:
+            raise KeyError(message_id)
+        if not 0 <= n < self.count:
+            raise KeyError(message_id)
+        return self._message(message_id, n)
+
+    @staticmethod
+    def _message(message_id: str, n: int) -> dict:
+        text = f"Hello, this is message {n}.\n" + "Lorem ipsum dolor sit amet. " * (20 + n % 200)
+        html = f"<html><body><p>{text}</p></body></html>"
+        headers = [
+            {"name": "Subject", "value": f"Message {n}"},
+            {"name": "From", "value": f"Sender {n % 17} <sender{n % 17}@example.com>"},
+            {"name": "To", "value": "me@example.com"},
+            {"name": "Date", "value": "Mon, 13 Oct 2025 09:00:00 +0000"},
+            {"name": "Received", "value": "from mail.example.com by mx.google.com; Mon, 13 Oct 2025"},
+        ]
+        # Three in five are newsletters: heavier, table-laden HTML
+        if n % 5 < 3:
+            headers.append({"name": "List-Unsubscribe", "value": f"<https://example.com/u/{n}>"})
+            html = "<html><body><table>" + f"<tr><td style='padding:8px'>{text}</td></tr>" * 4 + "</table></body></html>"
+        return {
+            "id": message_id,
+            "threadId": message_id,
+            "labelIds": ["INBOX", "UNREAD"],
+            "snippet": text[:120],
+            "historyId": str(1000 + n),
+            "payload": {
+                "mimeType": "multipart/alternative",
+                "headers": headers,
+                "parts": [
+                    {
+                        "mimeType": "text/plain",
+                        "body": {"data": base64.urlsafe_b64encode(text.encode()).decode()},
+                    },
+                    {
+                        "mimeType": "text/html",
+                        "body": {"data": base64.urlsafe_b64encode(html.encode()).decode()},
+                    },
+                ],
+            },
+        }
+
+
+def make_messages(count: int) -> SyntheticMailbox:
+    """Synthetic message resources with headers and bodies of varied size."""
+    return SyntheticMailbox(count)
+
+
+def render(message: dict, params: Mapping) -> dict:
+    """A message resource in the requested format ("full" or "metadata")."""
+    if params.get("format") != "metadata":
+        return message
+    wanted = {name.lower() for name in params.getlist("metadataHeaders")}
+    payload = message["payload"]
+    return {
+        **message,
+        "payload": {
+            "mimeType": payload["mimeType"],
+            "headers": [h for h in payload["headers"] if not wanted or h["name"].lower() in wanted],
+        },
+    }
+
+
+def create_app(messages: Mapping[str, dict], latency: float, fail_every: int = 0) -> FastAPI:
+    """Fake Gmail API app. With `fail_every`, every nth batch sub-request gets a 429."""
+    app = FastAPI()
+    app.state.requests = 0
+    app.state.bytes_sent = 0
+    ordered_ids = list(messages)
+    history_id = str(1000 + len(messages))
+
+    @app.middleware("http")
+    async def round_trip(request: Request, call_next):
+        app.state.requests += 1
+        await asyncio.sleep(latency)
+        response = await call_next(request)
+        body_iterator = response.body_iterator
+
+        async def counted():
+            async for chunk in body_iterator:
+                app.state.bytes_sent += len(chunk)
+                yield chunk
+
+        response.body_iterator = counted()
+        return response
+
+    @app.get(f"{API_PATH}/users/me/messages")
+    async def list_messages(maxResults: int = 100, pageToken: str | None = None):
+        start = int(pageToken or 0)
+        page = ordered_ids[start:start + maxResults]
+        data = {"messages": [{"id": i, "threadId": i} for i in page], "resultSizeEstimate": len(ordered_ids)}
+        if start + maxResults < len(ordered_ids):
+            data["nextPageToken"] = str(start + maxResults)
+        return data
+
+    @app.get(f"{API_PATH}/users/me/profile")
+    async def get_profile():
+        return {"emailAddress": "me@example.com", "messagesTotal": len(ordered_ids), "historyId": history_id}
+
+    @app.get(f"{API_PATH}/users/me/history")
+    async def list_history(startHistoryId: str):
+        return {"history": [], "historyId": history_id}
+
+    @app.get(f"{API_PATH}/users/me/messages/{{message_id}}")
+    async def get_message(message_id: str, request: Request):
+        if message_id not in messages:
+            return JSONResponse({"error": {"code": 404}}, status_code=404)
+        return render(messages[message_id], request.query_params)
+
+    @app.post(BATCH_PATH)
+    async def batch(request: Request):
+        boundary = request.headers["content-type"].split("boundary=", 1)[1]
+        body = (await request.body()).decode()
+
+        requests = []
+        for part in body.split(f"--{boundary}")[1:-1]:
+            content_id = part.split("Content-ID: <", 1)[1].split(">", 1)[0]
+            url = urlsplit(part.split("GET ", 1)[1].split()[0])
+            requests.append((content_id, url.path.rsplit("/", 1)[1], QueryParams(url.query)))
+
+        response_boundary = f"batch_{uuid.uuid4().hex}"
+
+        async def parts():
+            for n, (content_id, message_id, params) in enumerate(requests, start=1):
+                if fail_every and n % fail_every == 0:
+                    status, payload = "429 Too Many Requests", {"error": {"code": 429}}
+                elif message_id in messages:
+                    status, payload = "200 OK", render(messages[message_id], params)
+                else:
+                    status, payload = "404 Not Found", {"error": {"code": 404}}
+                yield (
+                    f"--{response_boundary}\r\n"
+                    "Content-Type: application/http\r\n"
+                    f"Content-ID: <response-{content_id}>\r\n\r\n"
+                    f"HTTP/1.1 {status}\r\n"
+                    "Content-Type: application/json; charset=UTF-8\r\n\r\n"
+                    f"{json.dumps(payload)}\r\n"
+                ).encode()
+            yield f"--{response_boundary}--\r\n".encode()
+
+        return StreamingResponse(parts(), media_type=f"multipart/mixed; boundary={response_boundary}")
+
+    return app
+
+
+class MemorySession:
+    """Stands in for the AsyncSession GmailIntegration.sync uses: keeps the
+    sync state and the external IDs of inserted items in memory."""
+
+    def __init__(self):
+        self.sync_state = None
+        self.external_ids: set[str] = set()
+        self.body_bytes = 0
+        self.commits = 0
+
+    async def execute(self, statement, rows: list | None = None):
+        if rows is not None:  # INSERT ... ON CONFLICT DO NOTHING
+            inserted = [row for row in rows if row["external_id"] not in self.external_ids]
+            self.external_ids.update(row["external_id"] for row in inserted)
+            self.body_bytes += sum(len((row["body"] or "").encode()) for row in inserted)
+            return _Result(inserted)
+        if "FROM sync_states" in str(statement):
+            return _Result([self.sync_state] if self.sync_state else [])
+        ids = statement.compile().params["external_ids"]
+        return _Result([external_id for external_id in ids if external_id in self.external_ids])
+
+    def add(self, obj):
+        self.sync_state = obj
+
+    async def flush(self):
+        pass
+
+    async def commit(self):
+        self.commits += 1
+
+
+class _Result:
+    def __init__(self, rows: list):
+        self.rows = rows
+
+    def scalars(self):
+        return self
+
+    def first(self):
+        return self.rows[0] if self.rows else None
+
+    def all(self):
+        return self.rows
+
+
+class FakeGmailServer:
+    """Runs the fake Gmail app on a free local port in a background thread."""
+
+    def __init__(self, app: FastAPI, port: int = 0):
+        self.app = app
+        self.server = uvicorn.Server(uvicorn.Config(app, port=port, log_level="warning"))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.servers[0].sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "FakeGmailServer":
+        self.thread.start()
+        while not self.server.started:
+            threading.Event().wait(0.01)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.should_exit = True
+        self.thread.join()
+
+
+def main(count: int = 200, latency_ms: float = 50, port: int = 8025) -> None:
+    app = create_app(make_messages(count), latency_ms / 1000)
+    uvicorn.run(app, port=port)
+
+
+if __name__ == "__main__":
+    main(*(cast(arg) for cast, arg in zip((int, float, int), sys.argv[1:])))
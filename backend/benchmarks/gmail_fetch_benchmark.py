@@ -0,0 +1,107 @@
+"""Compare wall time and HTTP requests of fetching Gmail messages serially,
+with bounded concurrent GETs and through the batch endpoint, against the
+local fake Gmail server; then time a whole GmailIntegration.sync.
+
+Usage (from backend/):
+    python -m benchmarks.gmail_fetch_benchmark [messages] [latency_ms]
+"""
+import asyncio
+import sys
+import time
+import uuid
+from collections.abc import AsyncIterator
+
+import httpx
+
+from app.config import settings
+from app.integrations import gmail
+from app.integrations.gmail_batch import fetch_messages
+from app.models.connection import Connection, Platform
+from benchmarks.fake_gmail import (
+    API_PATH,
+    BATCH_PATH,
+    FakeGmailServer,
+    MemorySession,
+    create_app,
+    make_messages,
+)
+
+PARAMS = {"format": "full"}
+CONCURRENCY = 10
+
+
+async def fetch_messages_individually(
+    client: httpx.AsyncClient,
+    api_base: str,
+    message_ids: list[str],
+    concurrency: int,
+) -> AsyncIterator[dict]:
+    """Fetch messages with one GET each, `concurrency` at a time, as they complete."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _get(message_id: str) -> dict | None:
+        async with semaphore:
+            response = await client.get(f"{api_base}/users/me/messages/{message_id}", params=PARAMS)
+            if response.status_code == 404:
+                return None
+            response.raise_for_status()
+            return response.json()
+
+    tasks = [asyncio.ensure_future(_get(message_id)) for message_id in message_ids]
+    try:
+        for next_message in asyncio.as_completed(tasks):
+            message = await next_message
+            if message is not None:
+                yield message
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def run_fetch(strategy: str, base_url: str, message_ids: list[str]) -> int:
+    api_base, batch_url = f"{base_url}{API_PATH}", f"{base_url}{BATCH_PATH}"
+    async with httpx.AsyncClient() as client:
+        if strategy == "batch":
+            messages = fetch_messages(client, {}, api_base, batch_url, message_ids, PARAMS)
+        else:
+            concurrency = 1 if strategy == "serial" else CONCURRENCY
+            messages = fetch_messages_individually(client, api_base, message_ids, concurrency)
+        return sum([1 async for _ in messages])
+
+
+async def run_sync(base_url: str) -> int:
+    gmail.GMAIL_API_BASE, gmail.GMAIL_BATCH_URL = f"{base_url}{API_PATH}", f"{base_url}{BATCH_PATH}"
+    connection = Connection(id=uuid.uuid4(), user_id=uuid.uuid4(), platform=Platform.GMAIL, access_token="fake")
+    return await gmail.GmailIntegration(connection).sync(MemorySession(), connection.user_id)
+
+
+def main(count: int = 200, latency_ms: float = 50) -> None:
+    messages = make_messages(count)
+    message_ids = list(messages)
+    app = create_app(messages, latency_ms / 1000)
+
+    with FakeGmailServer(app) as server:
+        print(f"{count} messages, {latency_ms:g} ms per round trip")
+        print(f"{'fetch':<34}{'seconds':>10}{'requests':>10}")
+        for strategy, label in (
+            ("serial", "one GET at a time (before)"),
+            ("concurrent", f"{CONCURRENCY} concurrent GETs"),
+            ("batch", f"batch of {settings.gmail_batch_size}, streamed"),
+        ):
+            app.state.requests = 0
+            start = time.perf_counter()
+            fetched = asyncio.run(run_fetch(strategy, server.base_url, message_ids))
+            elapsed = time.perf_counter() - start
+            assert fetched == count, (strategy, fetched)
+            print(f"{label:<34}{elapsed:>10.2f}{app.state.requests:>10}")
+
+        app.state.requests = 0
+        start = time.perf_counter()
+        synced = asyncio.run(run_sync(server.base_url))
+        elapsed = time.perf_counter() - start
+        print(f"GmailIntegration.sync: {synced} messages in {elapsed:.2f} s, {app.state.requests} requests")
+
+
+if __name__ == "__main__":
+    main(*(cast(arg) for cast, arg in zip((int, float), sys.argv[1:])))
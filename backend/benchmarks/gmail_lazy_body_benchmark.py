@@ -0,0 +1,74 @@
+"""Compare bandwidth and body storage of a Gmail sync that fetches full
+messages with one that fetches metadata only (GMAIL_LAZY_BODIES), against
+the local fake Gmail server. For the lazy sync, also count what hydrating
+the bodies the AI pipeline needs (non-bulk mail) costs afterwards.
+
+Usage (from backend/):
+    python -m benchmarks.gmail_lazy_body_benchmark [messages] [latency_ms]
+"""
+import asyncio
+import sys
+import time
+import uuid
+
+from app.config import settings
+from app.integrations import gmail
+from app.models.connection import Connection, Platform
+from benchmarks.fake_gmail import (
+    API_PATH,
+    BATCH_PATH,
+    FakeGmailServer,
+    MemorySession,
+    create_app,
+    make_messages,
+)
+
+
+async def run_sync(base_url: str) -> tuple[gmail.GmailIntegration, MemorySession]:
+    gmail.GMAIL_API_BASE, gmail.GMAIL_BATCH_URL = f"{base_url}{API_PATH}", f"{base_url}{BATCH_PATH}"
+    connection = Connection(id=uuid.uuid4(), user_id=uuid.uuid4(), platform=Platform.GMAIL, access_token="fake")
+    integration = gmail.GmailIntegration(connection)
+    db = MemorySession()
+    while not db.sync_state or db.sync_state.last_sync_status != "success":
+        await integration.sync(db, connection.user_id)
+    return integration, db
+
+
+def main(count: int = 2000, latency_ms: float = 20) -> None:
+    messages = make_messages(count)
+    app = create_app(messages, latency_ms / 1000)
+    # What the AI pipeline hydrates: everything but bulk mail
+    wanted = [
+        message_id for message_id, message in messages.items()
+        if not any(h["name"] == "List-Unsubscribe" for h in message["payload"]["headers"])
+    ]
+
+    with FakeGmailServer(app) as server:
+        print(f"{count} messages ({count - len(wanted)} bulk), {latency_ms:g} ms per round trip")
+        print(f"{'':<30}{'seconds':>9}{'requests':>10}{'MB sent':>9}{'MB bodies':>11}")
+        for lazy in (False, True):
+            settings.gmail_lazy_bodies = lazy
+            app.state.requests = app.state.bytes_sent = 0
+            start = time.perf_counter()
+            integration, db = asyncio.run(run_sync(server.base_url))
+            elapsed = time.perf_counter() - start
+            assert len(db.external_ids) == count
+            label = "sync, metadata only" if lazy else "sync, full messages (before)"
+            print(
+                f"{label:<30}{elapsed:>9.2f}{app.state.requests:>10}"
+                f"{app.state.bytes_sent / 1e6:>9.2f}{db.body_bytes / 1e6:>11.2f}"
+            )
+
+        app.state.requests = app.state.bytes_sent = 0
+        start = time.perf_counter()
+        bodies = asyncio.run(integration.fetch_bodies(wanted))
+        elapsed = time.perf_counter() - start
+        body_bytes = sum(len(body.encode()) for body in bodies.values())
+        print(
+            f"{'+ hydrate non-bulk for AI':<30}{elapsed:>9.2f}{app.state.requests:>10}"
+            f"{app.state.bytes_sent / 1e6:>9.2f}{body_bytes / 1e6:>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main(*(cast(arg) for cast, arg in zip((int, float), sys.argv[1:])))
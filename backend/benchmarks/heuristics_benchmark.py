@@ -0,0 +1,86 @@
+"""Measure how many LLM stage calls the local heuristics avoid, and how
+often they agree with LLM labels, on a fixture corpus.
+
+Usage (from backend/):
+    python -m benchmarks.heuristics_benchmark [path/to/labelled_items.json]
+"""
+import json
+import sys
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+from app.ai.heuristics import pre_classify
+from app.ai.sender_memo import priority_band
+from app.models.connection import Platform
+from app.models.item import Item, ItemType
+
+FIXTURE = Path(__file__).parent / "fixtures" / "labelled_items.json"
+STAGE_FIELDS = ("summary", "deadlines", "action_type", "priority_score", "category")
+
+
+def load_items(path: Path) -> list[tuple[Item, dict]]:
+    records = json.loads(path.read_text())
+    return [
+        (
+            Item(
+                id=uuid.uuid4(),
+                user_id=uuid.uuid4(),
+                platform=Platform(record["platform"]),
+                item_type=ItemType(record["item_type"]),
+                external_id=str(i),
+                subject=record["subject"],
+                body=record["body"],
+                sender_name=record["sender_name"],
+                sender_email=record["sender_email"] or None,
+                is_bulk=record["is_bulk"],
+                received_at=datetime.utcnow(),
+            ),
+            record["labels"],
+        )
+        for i, record in enumerate(records)
+    ]
+
+
+def agrees(field: str, value, labels: dict) -> bool:
+    if field == "deadlines":
+        # Heuristics only ever claim "no deadlines"
+        return not labels["has_deadlines"]
+    if field == "priority_score":
+        return priority_band(value) == priority_band(labels["priority_score"])
+    return value.value == labels[field]
+
+
+def main(path: Path = FIXTURE) -> None:
+    items = load_items(path)
+
+    start = time.perf_counter()
+    analyses = [pre_classify(item) for item, _ in items]
+    elapsed = time.perf_counter() - start
+
+    total_calls = len(items) * len(STAGE_FIELDS)
+    avoided = 0
+    per_field: dict[str, list[int]] = {field: [0, 0] for field in STAGE_FIELDS}
+
+    for (item, labels), analysis in zip(items, analyses):
+        for field in analysis.prefilled:
+            avoided += 1
+            per_field[field][1] += 1
+            if agrees(field, getattr(analysis, field), labels):
+                per_field[field][0] += 1
+
+    decided = sum(total for _, total in per_field.values())
+    correct = sum(ok for ok, _ in per_field.values())
+
+    print(f"Corpus: {path} ({len(items)} items)")
+    print(f"Heuristic time: {elapsed * 1000 / len(items):.3f} ms/item")
+    print(f"Staged LLM calls avoided: {avoided}/{total_calls} ({avoided / total_calls:.1%})")
+    print(f"Agreement with LLM labels: {correct}/{decided} ({correct / max(decided, 1):.1%})")
+    for field, (ok, total) in per_field.items():
+        if total:
+            print(f"  {field:15s} decided {total:3d}  agree {ok / total:.1%}")
+
+
+if __name__ == "__main__":
+    main(Path(sys.argv[1]) if len(sys.argv) > 1 else FIXTURE)
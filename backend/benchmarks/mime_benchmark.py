@@ -0,0 +1,78 @@
+"""Compare the MIME body extractor (app.integrations.mime) with the
+extraction GmailIntegration used before, over the payload shapes in
+benchmarks.mime_corpus: time per message, throughput over the encoded
+payload, peak Python memory of one extraction, and characters extracted.
+
+Usage (from backend/):
+    python -m benchmarks.mime_benchmark [repeats]
+"""
+import base64
+import json
+import sys
+import time
+import tracemalloc
+
+from app.integrations.mime import extract_text
+from benchmarks.mime_corpus import build_corpus
+
+
+def legacy_extract_body(payload: dict) -> str:
+    """GmailIntegration._extract_body before app.integrations.mime."""
+    body = ""
+
+    if "body" in payload and payload["body"].get("data"):
+        body = base64.urlsafe_b64decode(payload["body"]["data"]).decode("utf-8", errors="ignore")
+    elif "parts" in payload:
+        for part in payload["parts"]:
+            if part.get("mimeType") == "text/plain" and part.get("body", {}).get("data"):
+                body = base64.urlsafe_b64decode(part["body"]["data"]).decode("utf-8", errors="ignore")
+                break
+            elif part.get("mimeType") == "multipart/alternative":
+                body = legacy_extract_body(part)
+                if body:
+                    break
+
+    return body[:10000] if body else ""
+
+
+def measure(extract, payload: dict, repeats: int) -> tuple[float, int, int]:
+    """(seconds per call, peak bytes of one call, characters extracted)."""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        text = extract(payload)
+    elapsed = (time.perf_counter() - start) / repeats
+
+    tracemalloc.start()
+    extract(payload)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, len(text)
+
+
+def main(repeats: int = 20) -> None:
+    corpus = build_corpus()
+    sizes = {name: len(json.dumps(payload)) for name, payload in corpus.items()}
+    total = {"before": [0.0, 0], "after": [0.0, 0]}
+
+    print(f"{'shape':<27}{'KiB':>7}  {'ms before':>9}{'ms after':>9}  {'peak KiB':>9}{'after':>7}  {'chars':>6}{'after':>7}")
+    for name, payload in corpus.items():
+        before = measure(legacy_extract_body, payload, repeats)
+        after = measure(extract_text, payload, repeats)
+        for key, result in (("before", before), ("after", after)):
+            total[key][0] += result[0]
+            total[key][1] = max(total[key][1], result[1])
+        print(
+            f"{name:<27}{sizes[name] / 1024:>7.0f}  {before[0] * 1000:>9.2f}{after[0] * 1000:>9.2f}"
+            f"  {before[1] / 1024:>9.0f}{after[1] / 1024:>7.0f}  {before[2]:>6}{after[2]:>7}"
+        )
+
+    megabytes = sum(sizes.values()) / 2**20
+    for key, (seconds, peak) in total.items():
+        print(
+            f"{key}: {len(corpus) / seconds:.0f} messages/s, {megabytes / seconds:.0f} MiB/s of payload, "
+            f"worst peak {peak / 2**20:.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main(*(cast(arg) for cast, arg in zip((int,), sys.argv[1:])))
@@ -0,0 +1,122 @@
+"""Gmail payloads (format=full) shaped like real-world mail, for the MIME
+extraction benchmark.
+
+Each shape mirrors what a common client or sender produces; sizes are
+typical of that kind of mail.
+"""
+import base64
+
+
+def _data(content: bytes) -> str:
+    return base64.urlsafe_b64encode(content).decode()
+
+
+def _part(mime_type: str, content: bytes = b"", charset: str | None = "utf-8", filename: str = "", **extra) -> dict:
+    content_type = f"{mime_type}; charset={charset}" if charset else mime_type
+    headers = [{"name": "Content-Type", "value": content_type}]
+    if filename:
+        headers.append({"name": "Content-Disposition", "value": f'attachment; filename="{filename}"'})
+    return {
+        "mimeType": mime_type,
+        "filename": filename,
+        "headers": headers,
+        "body": {"size": len(content), "data": _data(content)} if content else {"size": 0},
+        **extra,
+    }
+
+
+def _multipart(mime_type: str, *parts: dict) -> dict:
+    return {
+        "mimeType": mime_type,
+        "filename": "",
+        "headers": [{"name": "Content-Type", "value": f'{mime_type}; boundary="b"'}],
+        "body": {"size": 0},
+        "parts": list(parts),
+    }
+
+
+def _paragraphs(count: int) -> str:
+    return "\n\n".join(
+        f"Paragraph {n}: thanks for the update on the quarterly numbers, let's go over them on Thursday."
+        for n in range(count)
+    )
+
+
+def _html(text: str, rows: int = 1) -> str:
+    style = "<style>" + "td.c{padding:8px;font-family:Arial} " * 200 + "</style>"
+    cell = "".join(f"<p>{line}</p>\n" for line in text.split("\n\n"))
+    table = "<table>" + f"<tr><td class='c' style='padding:8px'>{cell}</td></tr>\n" * rows + "</table>"
+    return f"<!DOCTYPE html><html><head>{style}</head><body>{table}</body></html>"
+
+
+def build_corpus() -> dict[str, dict]:
+    """Payloads by shape name."""
+    note = _paragraphs(4)
+    thread = _paragraphs(40)
+    pdf = bytes(range(256)) * 8192  # 2 MiB
+    png = bytes(range(256)) * 600
+
+    return {
+        # A short note from a plain-text client
+        "plain": _part("text/plain", note.encode()),
+        # Gmail/Outlook: text and HTML renderings of the same message
+        "alternative": _multipart(
+            "multipart/alternative",
+            _part("text/plain", thread.encode()),
+            _part("text/html", _html(thread).encode()),
+        ),
+        # Marketing mail: HTML only, heavy on tables and inline styles
+        "newsletter_html_only": _part("text/html", _html(_paragraphs(30), rows=12).encode()),
+        # Apple Mail with an inline image and a PDF attachment
+        "related_with_attachment": _multipart(
+            "multipart/mixed",
+            _multipart(
+                "multipart/related",
+                _multipart(
+                    "multipart/alternative",
+                    _part("text/plain", note.encode()),
+                    _part("text/html", _html(note).encode()),
+                ),
+                _part("image/png", png, charset=None, filename="logo.png"),
+            ),
+            _part("application/pdf", pdf, charset=None, filename="report.pdf"),
+        ),
+        # An HTML message with a text file attached
+        "html_with_text_attachment": _multipart(
+            "multipart/mixed",
+            _part("text/html", _html(note).encode()),
+            _part("text/plain", _paragraphs(200).encode(), filename="notes.txt"),
+        ),
+        # A forwarded message nested as message/rfc822
+        "forwarded": _multipart(
+            "multipart/mixed",
+            _part("text/plain", b"See below.\n"),
+            {
+                **_part("message/rfc822", charset=None),
+                "parts": [
+                    _multipart(
+                        "multipart/alternative",
+                        _part("text/plain", thread.encode()),
+                        _part("text/html", _html(thread).encode()),
+                    )
+                ],
+            },
+        ),
+        # A calendar invitation
+        "calendar_invite": _multipart(
+            "multipart/mixed",
+            _multipart(
+                "multipart/alternative",
+                _part("text/plain", note.encode()),
+                _part("text/html", _html(note).encode()),
+                _part("text/calendar", b"BEGIN:VCALENDAR\r\nEND:VCALENDAR\r\n" * 20),
+            ),
+            _part("application/ics", b"BEGIN:VCALENDAR\r\nEND:VCALENDAR\r\n" * 20, charset=None, filename="invite.ics"),
+        ),
+        # A legacy client writing Latin-1
+        "latin1": _part("text/plain", ("Réunion à l'hôtel, café compris. " * 300).encode("latin-1"), charset="ISO-8859-1"),
+        # Automated report: megabytes of plain text
+        "large_plain_log": _part(
+            "text/plain", "".join(f"2025-10-13 09:00:{n % 60:02d} INFO job {n} ok\n" for n in range(80_000)).encode()
+        ),
+    }
@@ -0,0 +1,72 @@
+"""Compare request count and prompt size of per-item vs packed analysis
+for the short items of a fixture corpus.
+
+Token counts are estimated at 4 characters per token.
+
+Usage (from backend/):
+    python -m benchmarks.packing_benchmark [path/to/labelled_items.json] [pack_size]
+"""
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from app.ai.item_analyzer import build_analyzer_inputs
+from app.ai.packing import format_packed_items, is_packable
+from app.ai.prompts import (
+    ACTION_CLASSIFIER_PROMPT,
+    CATEGORIZER_PROMPT,
+    ITEM_ANALYZER_PROMPT,
+    PACKED_ANALYZER_PROMPT,
+    PACKED_CLASSIFIER_PROMPT,
+)
+from benchmarks.heuristics_benchmark import FIXTURE, load_items
+
+
+def prompt_tokens(prompt, **inputs) -> int:
+    return sum(len(m.content) for m in prompt.format_messages(**inputs)) // 4
+
+
+def item_inputs(item) -> dict:
+    return {
+        "sender": item.sender_name or item.sender_email or "Unknown",
+        "subject": item.subject or "(No subject)",
+        "body": item.body or item.snippet or "",
+    }
+
+
+def main(path: Path = FIXTURE, pack_size: int = 10) -> None:
+    items = [item for item, _ in load_items(path) if is_packable(item)]
+    if not items:
+        print("No packable items in fixture")
+        return
+
+    chunks = [items[i:i + pack_size] for i in range(0, len(items), pack_size)]
+    today = datetime.utcnow().strftime("%Y-%m-%d")
+
+    fused = sum(prompt_tokens(ITEM_ANALYZER_PROMPT, **build_analyzer_inputs(i)) for i in items)
+    packed_fused = sum(
+        prompt_tokens(PACKED_ANALYZER_PROMPT, today=today, items=format_packed_items(c))
+        for c in chunks
+    )
+    staged = sum(
+        prompt_tokens(CATEGORIZER_PROMPT, **item_inputs(i))
+        + prompt_tokens(ACTION_CLASSIFIER_PROMPT, **item_inputs(i))
+        for i in items
+    )
+    packed_staged = sum(
+        prompt_tokens(PACKED_CLASSIFIER_PROMPT, items=format_packed_items(c)) for c in chunks
+    )
+
+    print(f"Packable items:       {len(items)} (pack size {pack_size})")
+    print(f"{'mode':<22}{'requests':>10}{'prompt tokens':>16}")
+    print(f"{'fused, per item':<22}{len(items):>10}{fused:>16}")
+    print(f"{'fused, packed':<22}{len(chunks):>10}{packed_fused:>16}")
+    print(f"{'staged, per item':<22}{2 * len(items):>10}{staged:>16}")
+    print(f"{'staged, packed':<22}{len(chunks):>10}{packed_staged:>16}")
+
+
+if __name__ == "__main__":
+    main(
+        Path(sys.argv[1]) if len(sys.argv) > 1 else FIXTURE,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 10,
+    )
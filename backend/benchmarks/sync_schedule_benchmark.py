@@ -0,0 +1,98 @@
+"""Compare API polls and freshness of fixed-interval vs adaptive sync
+scheduling over a simulated day.
+
+Each simulated connection receives new items as a Poisson process; a few
+are busy, most are quiet. Freshness is the mean delay between an item
+arriving and the poll that picks it up, reported for the busy
+connections and for all of them.
+
+Usage (from backend/):
+    python -m benchmarks.sync_schedule_benchmark [connections] [hours] [dispatch_seconds]
+"""
+import random
+import sys
+
+from app.models.connection import Platform
+from app.services.sync_schedule import base_interval, next_interval
+
+# Old beat schedule, seconds between polls of every connection
+FIXED_INTERVALS = {Platform.GMAIL: 300, Platform.SLACK: 120, Platform.CALENDAR: 900}
+
+# (share of connections, new items per hour)
+ACTIVITY_PROFILES = ((0.1, 20.0), (0.3, 2.0), (0.6, 0.1))
+
+
+def arrivals(rate_per_hour: float, duration: float, rng: random.Random) -> list[float]:
+    times, t = [], 0.0
+    while rate_per_hour > 0:
+        t += rng.expovariate(rate_per_hour / 3600)
+        if t >= duration:
+            return times
+        times.append(t)
+    return times
+
+
+def mean(values: list[float]) -> float:
+    return sum(values) / len(values) if values else 0.0
+
+
+def simulate(items: list[float], duration: float, interval_for, dispatch: float) -> tuple[int, list[float]]:
+    """Poll until `duration`; returns (polls, per-item delays)."""
+    polls, delays = 0, []
+    pending, i = [], 0
+    idle_streak, t = 0, 0.0
+    while t < duration:
+        polls += 1
+        while i < len(items) and items[i] <= t:
+            pending.append(items[i])
+            i += 1
+        delays.extend(t - arrived for arrived in pending)
+        idle_streak = 0 if pending else idle_streak + 1
+        pending = []
+        # The dispatcher only notices due connections on its own ticks
+        due = t + interval_for(idle_streak)
+        t = -(-due // dispatch) * dispatch
+    return polls, delays
+
+
+def main(connections: int = 1000, hours: float = 24, dispatch: float = 60) -> None:
+    rng = random.Random(0)
+    duration = hours * 3600
+    print(f"{connections} connections per platform, {hours:g} h simulated")
+    print(f"{'platform':<10}{'scheduler':<12}{'polls':>10}{'busy mean s':>13}{'mean s':>9}{'p95 s':>8}")
+
+    for platform in Platform:
+        results = {"fixed": [0, [], []], "adaptive": [0, [], []]}
+        for _ in range(connections):
+            roll, share_total = rng.random(), 0.0
+            for share, rate in ACTIVITY_PROFILES:
+                share_total += share
+                if roll < share_total:
+                    break
+            items = arrivals(rate, duration, rng)
+
+            for name, interval_for in (
+                ("fixed", lambda streak: FIXED_INTERVALS[platform]),
+                ("adaptive", lambda streak: next_interval(platform, streak)),
+            ):
+                polls, delays = simulate(items, duration, interval_for, dispatch if name == "adaptive" else 1)
+                results[name][0] += polls
+                results[name][1].extend(delays)
+                if rate == ACTIVITY_PROFILES[0][1]:
+                    results[name][2].extend(delays)
+
+        for name, (polls, delays, busy) in results.items():
+            delays.sort()
+            p95 = delays[int(len(delays) * 0.95)] if delays else 0.0
+            print(
+                f"{platform.value:<10}{name:<12}{polls:>10}"
+                f"{mean(busy):>13.0f}{mean(delays):>9.0f}{p95:>8.0f}"
+            )
+
+    print("adaptive base intervals: " + ", ".join(
+        f"{platform.value} {base_interval(platform)} s" for platform in Platform
+    ))
+
+
+if __name__ == "__main__":
+    main(*(cast(arg) for cast, arg in zip((int, float, float), sys.argv[1:])))
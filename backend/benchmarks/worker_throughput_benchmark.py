@@ -0,0 +1,85 @@
+"""Compare task throughput of prefork-style workers and the asyncio worker
+on simulated network-bound tasks (each task waits `latency` seconds, like
+an HTTP or LLM call).
+
+The prefork side runs `processes` processes handling one task at a time.
+The asyncio side runs the real AsyncioWorker against an in-memory broker.
+
+Usage (from backend/):
+    python -m benchmarks.worker_throughput_benchmark [tasks] [latency] [processes] [concurrency]
+"""
+import asyncio
+import sys
+import time
+import types
+import uuid
+from multiprocessing import Pool
+
+from kombu import Connection
+
+from app.config import settings
+from app.workers import aio_worker
+
+TASK_NAME = "benchmarks.simulated_io"
+
+
+def blocking_task(latency: float) -> None:
+    time.sleep(latency)
+
+
+def run_prefork(tasks: int, latency: float, processes: int) -> float:
+    with Pool(processes) as pool:
+        start = time.perf_counter()
+        pool.map(blocking_task, [latency] * tasks, chunksize=1)
+        return time.perf_counter() - start
+
+
+async def _run_asyncio(tasks: int, latency: float, concurrency: int) -> float:
+    async def simulated_io(latency: float) -> None:
+        await asyncio.sleep(latency)
+
+    aio_worker.ASYNC_TASKS[TASK_NAME] = simulated_io
+    aio_worker.celery_app = types.SimpleNamespace(
+        backend=types.SimpleNamespace(store_result=lambda *args: None)
+    )
+    aio_worker.make_engine = lambda **options: types.SimpleNamespace(dispose=lambda: asyncio.sleep(0))
+    aio_worker.AsyncSessionLocal = types.SimpleNamespace(configure=lambda **options: None)
+
+    worker = aio_worker.AsyncioWorker("benchmark", concurrency)
+    with Connection(settings.redis_url) as connection:
+        producer = connection.Producer()
+        for _ in range(tasks):
+            producer.publish(
+                [[latency], {}, {}],
+                exchange=worker.queue.exchange,
+                routing_key=worker.queue.routing_key,
+                declare=[worker.queue],
+                headers={"task": TASK_NAME, "id": str(uuid.uuid4())},
+                serializer="json",
+            )
+
+    start = time.perf_counter()
+    running = asyncio.create_task(worker.run())
+    while worker.processed < tasks:
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - start
+
+    worker.stopping.set()
+    await running
+    return elapsed
+
+
+def main(tasks: int = 500, latency: float = 0.2, processes: int = 4, concurrency: int = 200) -> None:
+    settings.redis_url = "memory://"
+
+    prefork = run_prefork(tasks, latency, processes)
+    aio = asyncio.run(_run_asyncio(tasks, latency, concurrency))
+
+    print(f"{tasks} tasks, {latency * 1000:.0f} ms simulated latency each")
+    print(f"{'worker':<28}{'seconds':>10}{'tasks/s':>10}")
+    print(f"{f'prefork x{processes}':<28}{prefork:>10.2f}{tasks / prefork:>10.1f}")
+    print(f"{f'asyncio, concurrency {concurrency}':<28}{aio:>10.2f}{tasks / aio:>10.1f}")
+
+
+if __name__ == "__main__":
+    main(*(cast(arg) for cast, arg in zip((int, float, int, int), sys.argv[1:])))
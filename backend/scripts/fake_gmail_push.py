@@ -0,0 +1,49 @@
+"""Send a fake Gmail watch notification to the local push endpoint, in the
+format Pub/Sub push subscriptions use, to exercise push-triggered syncs
+without Google Cloud.
+
+Usage (from backend/):
+    python -m scripts.fake_gmail_push <email> <history_id> [--url URL] [--token TOKEN]
+"""
+import argparse
+import base64
+import json
+import uuid
+from datetime import datetime, timezone
+
+import httpx
+
+from app.config import settings
+
+
+def build_envelope(email: str, history_id: int) -> dict:
+    """Wrap a Gmail notification like a Pub/Sub push request."""
+    data = json.dumps({"emailAddress": email, "historyId": history_id})
+    return {
+        "message": {
+            "data": base64.b64encode(data.encode()).decode(),
+            "messageId": str(uuid.uuid4().int)[:16],
+            "publishTime": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        },
+        "subscription": "projects/local/subscriptions/gmail-push",
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Send a fake Gmail push notification")
+    parser.add_argument("email")
+    parser.add_argument("history_id", type=int)
+    parser.add_argument("--url", default=f"{settings.backend_url}/api/v1/webhooks/gmail")
+    parser.add_argument("--token", default=settings.gmail_push_token)
+    args = parser.parse_args()
+
+    response = httpx.post(
+        args.url,
+        params={"token": args.token},
+        json=build_envelope(args.email, args.history_id),
+    )
+    print(response.status_code, response.text)
+
+
+if __name__ == "__main__":
+    main()